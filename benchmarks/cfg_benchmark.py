@@ -0,0 +1,42 @@
+import argparse
+import time
+
+from benchmarks.programs import generate_loop_program
+from lib.lexical.scanner import Scanner
+from lib.syntatic.syntatic import Syntatic
+from lib.optimizer.cfg import Dominators, build_blocks, natural_loops
+from lib.optimizer.dataflow import liveness
+
+
+def timed(function, *args):
+    """Resultado e tempo de uma chamada"""
+    begin = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - begin
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tempo de construção do CFG, dos dominadores e dos laços e da análise de vivacidade")
+    parser.add_argument("--statements", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    args = parser.parse_args()
+
+    print(f"{'comandos':>10} {'instruções':>11} {'blocos':>8} {'laços':>7} {'CFG':>8} {'domin.':>8} "
+          f"{'laços':>8} {'vivas':>8} {'µs/instr':>9}")
+
+    for statements in args.statements:
+        instructions = Syntatic(Scanner(generate_loop_program(statements)).tokenize()).start()
+
+        blocks, blocks_time = timed(build_blocks, instructions)
+        dominators, dominators_time = timed(Dominators, blocks)
+        loops, loops_time = timed(natural_loops, blocks, dominators)
+        _, liveness_time = timed(liveness, instructions, blocks)
+
+        total = blocks_time + dominators_time + loops_time + liveness_time
+
+        print(f"{statements:>10} {len(instructions):>11} {len(blocks):>8} {len(loops):>7} {blocks_time:7.3f}s "
+              f"{dominators_time:7.3f}s {loops_time:7.3f}s {liveness_time:7.3f}s "
+              f"{total / len(instructions) * 1e6:9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import argparse
+
+from benchmarks.execution import executed, run_times
+from benchmarks.programs import arithmetic_program, common_program, loop_program, nested_loop_program, summing_program
+from lib.lexical.scanner import Scanner
+from lib.syntatic.syntatic import Syntatic
+from lib.optimizer.cse import eliminate_subexpressions
+from lib.optimizer.fold import fold_constants
+from lib.optimizer.licm import hoist_invariants
+from lib.optimizer.peephole import peephole
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Instruções executadas e tempo antes e depois da eliminação de subexpressões comuns")
+    parser.add_argument("--iterations", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    programs = [
+        ("laço", loop_program(args.iterations)),
+        ("aritmética", arithmetic_program(args.iterations)),
+        ("aninhado", nested_loop_program(args.iterations // 1_000 or 1, 1_000)),
+        ("soma", summing_program(args.iterations)),
+        ("repetidas", common_program(args.iterations)),
+    ]
+
+    print(f"{'programa':>10} {'executadas':>24} {'redução':>8} {'antes':>9} {'depois':>9}")
+
+    for name, text in programs:
+        syntatic = Syntatic(Scanner(text).tokenize())
+        # Os passos anteriores do optimize, para medir só este
+        instructions = peephole(hoist_invariants(fold_constants(syntatic.start())))
+        eliminated = eliminate_subexpressions(instructions)
+        slots = syntatic.slots()
+
+        count_before, output_before = executed(instructions, slots)
+        count_after, output_after = executed(eliminated, slots)
+        assert output_before == output_after
+
+        time_before, time_after = run_times([instructions, eliminated], slots, args.repeat)
+
+        print(f"{name:>10} {count_before:>12} -> {count_after:<9} {1 - count_after / count_before:7.1%} "
+              f"{time_before:8.4f}s {time_after:8.4f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+import contextlib
+import io
+import time
+
+from lib.interpreter.interpreter import Interpreter
+
+
+class CountingInterpreter(Interpreter):
+    """Interpreter que conta as instruções executadas"""
+
+    executed = 0
+
+    def _execute_instruction(self, instruction):
+        self.executed += 1
+        super()._execute_instruction(instruction)
+
+
+def executed(instructions: list[tuple], slots: dict) -> tuple[int, str]:
+    """Instruções executadas e saída do programa"""
+    output = io.StringIO()
+    interpreter = CountingInterpreter(instructions, slots)
+
+    with contextlib.redirect_stdout(output):
+        interpreter.run()
+
+    return interpreter.executed, output.getvalue()
+
+
+def run_times(programs: list[list[tuple]], slots: dict, repeat: int) -> list[float]:
+    """Melhor tempo de execução de cada programa em repeat rodadas, alternando entre eles para dividir o ruído"""
+    best = [float("inf")] * len(programs)
+
+    for _ in range(repeat):
+        for i, instructions in enumerate(programs):
+            with contextlib.redirect_stdout(io.StringIO()):
+                begin = time.perf_counter()
+                Interpreter(instructions, slots).run()
+                best[i] = min(best[i], time.perf_counter() - begin)
+
+    return best
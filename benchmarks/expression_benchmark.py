@@ -0,0 +1,35 @@
+import argparse
+import time
+
+from lib.lexical.scanner import Scanner
+from lib.syntatic.syntatic import Syntatic
+
+
+def expression_program(terms: int, statements: int) -> str:
+    """Programa com atribuições de expressões longas, alternando operadores aditivos e multiplicativos"""
+    operators = ["+", "*", "-", "div"]
+    expression = "a" + "".join(f" {operators[i % 4]} {i % 9 + 1}" for i in range(terms - 1))
+    body = "".join(f"  b := {expression};\n" for _ in range(statements))
+    return f"program Expr;\nvar a, b: integer;\nbegin\n{body}end.\n"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tempo de análise de expressões com milhares de termos")
+    parser.add_argument("--terms", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--statements", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"{'termos':>10} {'instruções':>12} {'análise':>10} {'µs/termo':>10}")
+
+    for terms in args.terms:
+        tokens = Scanner(expression_program(terms, args.statements)).tokenize()
+
+        begin = time.perf_counter()
+        instructions = Syntatic(tokens).start()
+        elapsed = time.perf_counter() - begin
+
+        print(f"{terms:>10} {len(instructions):>12} {elapsed:9.3f}s {elapsed / (terms * args.statements) * 1e6:10.2f}")
+
+
+if __name__ == "__main__":
+    main()
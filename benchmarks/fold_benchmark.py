@@ -0,0 +1,34 @@
+import argparse
+
+from benchmarks.execution import executed, run_times
+from benchmarks.programs import arithmetic_program
+from lib.lexical.scanner import Scanner
+from lib.syntatic.syntatic import Syntatic
+from lib.optimizer.fold import fold_constants
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Instruções e tempo de execução antes e depois da propagação de constantes")
+    parser.add_argument("--iterations", type=int, default=5_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    syntatic = Syntatic(Scanner(arithmetic_program(args.iterations)).tokenize())
+    instructions = syntatic.start()
+    slots = syntatic.slots()
+    folded = fold_constants(instructions)
+
+    count_before, output_before = executed(instructions, slots)
+    count_after, output_after = executed(folded, slots)
+    assert output_before == output_after
+
+    time_before, time_after = run_times([instructions, folded], slots, args.repeat)
+
+    print(f"saída: {output_after.strip()}")
+    print(f"instruções:  {len(instructions):>10} -> {len(folded)}")
+    print(f"executadas:  {count_before:>10} -> {count_after} ({count_before / count_after:.2f}x)")
+    print(f"execução:    {time_before:>9.3f}s -> {time_after:.3f}s ({time_before / time_after:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
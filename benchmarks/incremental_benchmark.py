@@ -0,0 +1,44 @@
+import argparse
+import random
+import time
+
+from benchmarks.programs import generate_program
+from lib.syntatic.incremental import Document
+
+
+EDITS = ["  v1 := v2 + 3;\n", "  { comentario }\n", "  if v1 > 2 then begin v3 := 1; end;\n", "  v4 := v4 * 2; // fim\n"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latência de uma edição com recompilação completa e incremental")
+    parser.add_argument("--statements", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--edits", type=int, default=50)
+    args = parser.parse_args()
+
+    rnd = random.Random(0)
+
+    for statements in args.statements:
+        document = Document(generate_program(statements))
+
+        begin = time.perf_counter()
+        document.compile()
+        full = time.perf_counter() - begin
+
+        elapsed = 0.0
+        for _ in range(args.edits):
+            line = rnd.randint(6, len(document.lines) - 2)
+
+            # Não separa um comando do ';' que fica na linha seguinte
+            while document.lines[line].strip().startswith(";"):
+                line += 1
+
+            begin = time.perf_counter()
+            document.edit(line, line, rnd.choice(EDITS))
+            elapsed += time.perf_counter() - begin
+
+        incremental = elapsed / args.edits
+        print(f"  {len(document.lines):>8} linhas  completa {full * 1000:10.2f} ms  incremental {incremental * 1000:8.3f} ms  ({full / incremental:,.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+import argparse
+
+from benchmarks.execution import executed, run_times
+from benchmarks.programs import nested_loop_program, summing_program
+from lib.lexical.scanner import Scanner
+from lib.syntatic.syntatic import Syntatic
+from lib.optimizer.fold import fold_constants
+from lib.optimizer.induction import reduce_induction
+from lib.optimizer.licm import hoist_invariants
+from lib.optimizer.peephole import peephole
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Instruções executadas e tempo antes e depois das otimizações com variáveis de indução")
+    parser.add_argument("--iterations", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'programa':>10} {'voltas':>10} {'executadas':>24} {'antes':>9} {'depois':>9}")
+
+    for iterations in args.iterations:
+        programs = [
+            ("soma", summing_program(iterations)),
+            ("aninhado", nested_loop_program(iterations // 1_000 or 1, 1_000)),
+        ]
+
+        for name, text in programs:
+            syntatic = Syntatic(Scanner(text).tokenize())
+            # Os passos anteriores do optimize, para medir só este
+            instructions = peephole(hoist_invariants(fold_constants(syntatic.start())))
+            reduced = reduce_induction(instructions, syntatic.symbol_table)
+            slots = syntatic.slots()
+
+            count_before, output_before = executed(instructions, slots)
+            count_after, output_after = executed(reduced, slots)
+            assert output_before == output_after
+
+            time_before, time_after = run_times([instructions, reduced], slots, args.repeat)
+
+            print(f"{name:>10} {iterations:>10} {count_before:>12} -> {count_after:<8} "
+                  f"{time_before:8.4f}s {time_after:8.4f}s")
+
+
+if __name__ == "__main__":
+    main()
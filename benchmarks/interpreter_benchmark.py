@@ -0,0 +1,44 @@
+import argparse
+import contextlib
+import io
+import time
+
+from benchmarks.programs import loop_program
+from lib.lexical.scanner import Scanner
+from lib.syntatic.syntatic import Syntatic
+from lib.interpreter.interpreter import Interpreter
+
+
+def run(instructions: list[tuple], slots: dict) -> tuple[float, str]:
+    """Tempo de execução e saída do programa"""
+    output = io.StringIO()
+
+    with contextlib.redirect_stdout(output):
+        begin = time.perf_counter()
+        Interpreter(instructions, slots).run()
+        elapsed = time.perf_counter() - begin
+
+    return elapsed, output.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tempo de execução de um programa com laços no Interpreter")
+    parser.add_argument("--iterations", type=int, default=5_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    syntatic = Syntatic(Scanner(loop_program(args.iterations)).tokenize())
+    instructions = syntatic.start()
+
+    best = float("inf")
+
+    for _ in range(args.repeat):
+        elapsed, output = run(instructions, syntatic.slots())
+        best = min(best, elapsed)
+
+    print(f"instruções: {len(instructions)}  slots: {len(syntatic.slots())}  saída: {output.strip()}")
+    print(f"execução: {best:.3f}s ({best / args.iterations * 1e6:.1f} µs/iteração)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.programs import generate_program_of_size
+from lib.lexical.lexical import Lexical
+from lib.lexical.token_type import TokenType
+
+
+def legacy_tokenize(lexical: Lexical) -> list:
+    """Laço original baseado em nextToken"""
+    tokens = []
+
+    while True:
+        token = lexical.nextToken()
+
+        if token is None:
+            continue
+
+        if token.token_type == TokenType.EOF:
+            break
+
+        tokens.append(token)
+
+    return tokens
+
+
+def measure(name: str, tokenize, filename: str, repeat: int, memory_map: bool = False) -> float:
+    best = float("inf")
+    count = 0
+
+    for _ in range(repeat):
+        begin = time.perf_counter()
+        count = len(tokenize(Lexical(filename, memory_map=memory_map)))
+        best = min(best, time.perf_counter() - begin)
+
+    print(f"{name:<10} {count:>10} tokens  {best:8.3f} s  {count / best:12,.0f} tokens/s")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara o Lexical original com o Scanner dirigido por tabela")
+    parser.add_argument("--size-mb", type=float, default=4.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    source = generate_program_of_size(int(args.size_mb * 1024 * 1024))
+
+    with tempfile.NamedTemporaryFile("w", suffix=".pas", delete=False) as handle:
+        handle.write(source)
+        filename = handle.name
+
+    try:
+        print(f"Fonte: {len(source) / (1024 * 1024):.1f} MB")
+        legacy = measure("nextToken", legacy_tokenize, filename, args.repeat)
+        scanner = measure("Scanner", Lexical.tokenize, filename, args.repeat)
+        mapped = measure("mmap", Lexical.tokenize, filename, args.repeat, memory_map=True)
+        print(f"Ganho: {legacy / scanner:.2f}x (str), {legacy / mapped:.2f}x (mmap)")
+    finally:
+        os.remove(filename)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+import argparse
+
+from benchmarks.execution import executed, run_times
+from benchmarks.programs import nested_loop_program
+from lib.lexical.scanner import Scanner
+from lib.syntatic.syntatic import Syntatic
+from lib.optimizer.licm import hoist_invariants
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Instruções executadas e tempo antes e depois de tirar as expressões invariantes dos laços")
+    parser.add_argument("--outer", type=int, default=1_000)
+    parser.add_argument("--inner", type=int, default=1_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    syntatic = Syntatic(Scanner(nested_loop_program(args.outer, args.inner)).tokenize())
+    instructions = syntatic.start()
+    slots = syntatic.slots()
+    hoisted = hoist_invariants(instructions)
+
+    count_before, output_before = executed(instructions, slots)
+    count_after, output_after = executed(hoisted, slots)
+    assert output_before == output_after
+
+    time_before, time_after = run_times([instructions, hoisted], slots, args.repeat)
+    iterations = args.outer * args.inner
+
+    print(f"saída: {output_after.strip()}")
+    print(f"instruções:  {len(instructions):>10} -> {len(hoisted)}")
+    print(f"executadas:  {count_before:>10} -> {count_after} "
+          f"({count_before / iterations:.1f} -> {count_after / iterations:.1f} por iteração do laço interno)")
+    print(f"execução:    {time_before:>9.3f}s -> {time_after:.3f}s ({time_before / time_after:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import argparse
+import os
+import time
+
+from benchmarks.programs import generate_program_of_size
+from lib.lexical.parallel import find_cut_points, tokenize_parallel
+from lib.lexical.token_stream import TokenStream
+
+
+def measure(name: str, build, repeat: int) -> float:
+    best = float("inf")
+
+    for _ in range(repeat):
+        begin = time.perf_counter()
+        stream = build()
+        best = min(best, time.perf_counter() - begin)
+
+    print(f"  {name:<14} {len(stream):>10} tokens  {best:8.2f} s  {len(stream) / best:>12,.0f} tokens/s")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tokenização serial e em paralelo com processos")
+    parser.add_argument("--size-mb", type=float, default=8.0)
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, 4, os.cpu_count() or 1])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    source = generate_program_of_size(int(args.size_mb * 1024 * 1024))
+    print(f"Fonte: {len(source) / (1024 * 1024):.1f} MB, {os.cpu_count()} CPUs")
+
+    begin = time.perf_counter()
+    find_cut_points(source, max(args.workers))
+    print(f"  pré-varredura  {time.perf_counter() - begin:8.3f} s")
+
+    serial = measure("serial", lambda: TokenStream.from_text(source), args.repeat)
+
+    for workers in sorted(set(args.workers)):
+        elapsed = measure(f"{workers} processos", lambda: tokenize_parallel(source, workers, min_chunk_size=1), args.repeat)
+        print(f"  {'':<14} speedup {serial / elapsed:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import argparse
+import time
+
+from benchmarks.programs import generate_program
+from lib.lexical.scanner import Scanner
+from lib.lexical.token import Token
+from lib.syntatic.syntatic import Syntatic
+
+
+# Tokens por comando nos programas de benchmarks.programs
+TOKENS_PER_STATEMENT = 12.4
+
+
+class PopSyntatic(Syntatic):
+    """Syntatic com o avanço antigo, list.pop(0)"""
+
+    def advance(self):
+        if self.tokens:
+            self.current_token = self.tokens.pop(0)
+
+
+def walk(syntatic: Syntatic, count: int) -> float:
+    """Tempo para avançar por todos os tokens, sem análise"""
+    begin = time.perf_counter()
+
+    for _ in range(count):
+        syntatic.advance()
+
+    return time.perf_counter() - begin
+
+
+def program_tokens(count: int) -> list[Token]:
+    statements = max(1, int(count / TOKENS_PER_STATEMENT))
+    return Scanner(generate_program(statements)).tokenize()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tempo de avanço pelos tokens (list.pop(0) e TokenCursor) e de análise sintática")
+    parser.add_argument("--tokens", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--pop-limit", type=int, default=200_000, help="maior entrada medida com list.pop(0), que é quadrático")
+    args = parser.parse_args()
+
+    print(f"{'tokens':>10} {'pop(0)':>10} {'cursor':>10} {'análise':>10} {'µs/token':>10}")
+
+    for count in args.tokens:
+        tokens = program_tokens(count)
+
+        pop = walk(PopSyntatic(list(tokens)), len(tokens)) if len(tokens) <= args.pop_limit else None
+        cursor = walk(Syntatic(tokens), len(tokens))
+
+        begin = time.perf_counter()
+        Syntatic(tokens).start()
+        parse = time.perf_counter() - begin
+
+        pop_column = f"{pop:9.3f}s" if pop is not None else f"{'-':>10}"
+        print(f"{len(tokens):>10} {pop_column} {cursor:9.3f}s {parse:9.3f}s {parse / len(tokens) * 1e6:10.2f}")
+
+
+if __name__ == "__main__":
+    main()
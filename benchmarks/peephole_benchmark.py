@@ -0,0 +1,35 @@
+import argparse
+
+from benchmarks.execution import executed, run_times
+from benchmarks.programs import loop_program
+from lib.lexical.scanner import Scanner
+from lib.syntatic.syntatic import Syntatic
+from lib.optimizer.peephole import peephole
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Instruções executadas por iteração e tempo antes e depois do peephole")
+    parser.add_argument("--iterations", type=int, default=5_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    syntatic = Syntatic(Scanner(loop_program(args.iterations)).tokenize())
+    instructions = syntatic.start()
+    slots = syntatic.slots()
+    optimized = peephole(instructions)
+
+    count_before, output_before = executed(instructions, slots)
+    count_after, output_after = executed(optimized, slots)
+    assert output_before == output_after
+
+    time_before, time_after = run_times([instructions, optimized], slots, args.repeat)
+
+    print(f"saída: {output_after.strip()}")
+    print(f"instruções:  {len(instructions):>10} -> {len(optimized)}")
+    print(f"executadas:  {count_before:>10} -> {count_after} "
+          f"({count_before / args.iterations:.1f} -> {count_after / args.iterations:.1f} por iteração)")
+    print(f"execução:    {time_before:>9.3f}s -> {time_after:.3f}s ({time_before / time_after:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
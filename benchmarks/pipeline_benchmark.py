@@ -0,0 +1,76 @@
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.programs import generate_program, generate_program_of_size
+from lib.compiler import compile_file
+from lib.lexical.lexical import Lexical
+from lib.syntatic.syntatic import Syntatic
+
+
+def write_program(text: str) -> str:
+    with tempfile.NamedTemporaryFile("w", suffix=".pas", delete=False) as handle:
+        handle.write(text)
+        return handle.name
+
+
+def sequential(filename: str) -> list[tuple]:
+    """Como o main.py: tokeniza o arquivo inteiro e depois analisa a lista"""
+    lexical = Lexical(filename)
+    return Syntatic(lexical.tokenize(), lexical.symbols).start()
+
+
+def consume_pipeline(filename: str) -> int:
+    with Lexical(filename).token_pipeline() as tokens:
+        return sum(1 for _ in tokens)
+
+
+def measure_tokens(name: str, consume, filename: str):
+    tracemalloc.start()
+    begin = time.perf_counter()
+    count = consume(filename)
+    elapsed = time.perf_counter() - begin
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"  {name:<12} {count:>10} tokens  {elapsed:8.2f} s  pico {peak / (1024 * 1024):8.2f} MB")
+
+
+def measure_compile(name: str, compile_function, filename: str) -> list[tuple]:
+    begin = time.perf_counter()
+    instructions = compile_function(filename)
+    elapsed = time.perf_counter() - begin
+
+    print(f"  {name:<12} {len(instructions):>10} instruções  {elapsed:8.2f} s")
+    return instructions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memória dos tokens e tempo de compilação, sequencial e em pipeline (léxico em uma thread)")
+    parser.add_argument("--size-mb", type=float, default=4)
+    parser.add_argument("--statements", type=int, default=2000)
+    args = parser.parse_args()
+
+    filename = write_program(generate_program_of_size(int(args.size_mb * 1024 * 1024)))
+
+    try:
+        print(f"Tokens de um fonte de {args.size_mb:g} MB")
+        measure_tokens("tokenize", lambda name: len(Lexical(name).tokenize()), filename)
+        measure_tokens("pipeline", consume_pipeline, filename)
+    finally:
+        os.remove(filename)
+
+    filename = write_program(generate_program(args.statements))
+
+    try:
+        print(f"Compilação de um programa com {args.statements} comandos")
+        expected = measure_compile("sequencial", sequential, filename)
+        assert measure_compile("pipeline", compile_file, filename) == expected
+    finally:
+        os.remove(filename)
+
+
+if __name__ == "__main__":
+    main()
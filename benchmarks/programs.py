@@ -0,0 +1,179 @@
+import random
+
+
+def generate_statements(count: int, variables: list[str], rnd: random.Random) -> list[str]:
+    """Gera comandos variados: atribuições, if, escrita e comentários"""
+    numbers = ["1", "42", "07", "0x1F", "0", "123"]
+    statements = []
+
+    for i in range(count):
+        a = rnd.choice(variables)
+        b = rnd.choice(variables)
+        n = rnd.choice(numbers)
+        kind = i % 6
+
+        if kind == 0:
+            statements.append(f"  {a} := {b} + {n} * ({a} - {rnd.choice(numbers)});")
+        elif kind == 1:
+            statements.append(f"  if {a} >= {n} and {b} <> {a} then {a} := {b} div 2; {{ comentario }}")
+        elif kind == 2:
+            statements.append(f'  writeln("valor de {a}:\\t", {a});')
+        elif kind == 3:
+            statements.append(f"  {b} := {a} mod {rnd.choice(numbers[1:3])} // resto")
+            statements.append(f"  ;")
+        elif kind == 4:
+            statements.append(f"  total := total / 2.5 + {a};")
+        else:
+            statements.append(f"  if not ({a} < {b}) or {a} == {n} then begin {a} := -{a}; end else {b} := {b} + 1;")
+
+    return statements
+
+
+def generate_program(statements: int, variables: int = 50, seed: int = 0, prefix: str = "v") -> str:
+    """Gera um programa válido com o número de comandos pedido"""
+    rnd = random.Random(seed)
+    names = [f"{prefix}{i}" for i in range(variables)]
+
+    lines = ["program Bench;", "var", f"  {', '.join(names)}: integer;", "  total: real;", "begin"]
+    lines.extend(generate_statements(statements, names, rnd))
+    lines.append("end.")
+
+    return "\n".join(lines) + "\n"
+
+
+def generate_program_of_size(size_bytes: int, seed: int = 0) -> str:
+    """Gera um programa com aproximadamente size_bytes bytes"""
+    sample = generate_program(1000, seed=seed)
+    statements = max(1, int(1000 * size_bytes / len(sample)))
+    return generate_program(statements, seed=seed)
+
+
+def loop_program(iterations: int) -> str:
+    """Programa que passa a maior parte do tempo em laços com aritmética inteira, para medir a execução"""
+    return f"""program Loop;
+var i, j, t, soma: integer;
+begin
+  soma := 0;
+  for i := 1 to {iterations} do
+  begin
+    t := i * 2 + 1;
+    if t mod 3 == 0 then soma := soma + t; else soma := soma - 1;
+    j := 0;
+    while j < 3 do
+    begin
+      j := j + 1;
+      soma := soma + j * 2;
+    end
+  end
+  writeln("soma=", soma);
+end.
+"""
+
+
+def arithmetic_program(iterations: int) -> str:
+    """Programa no estilo de examples/aritmetic.pas, com literais e variáveis de valor conhecido, repetido num laço"""
+    return f"""program Alu;
+var a, b, c, x, y, i, soma: integer;
+    r: real;
+begin
+  soma := 0;
+  for i := 1 to {iterations} do
+  begin
+    a := 1;
+    b := 2;
+    c := 3;
+    x := 2 * 3 + 4;
+    y := (a + b) * c - 0x10 div 07;
+    r := 2.5 * 4 + 1.5;
+    if a == 2 and c == 3 then soma := soma + x; else soma := soma + y;
+  end
+  writeln("soma=", soma, " r=", r);
+end.
+"""
+
+
+def generate_loop_program(statements: int, variables: int = 50, seed: int = 0) -> str:
+    """Gera um programa como generate_program, com os comandos em grupos de 10 dentro de um for com um while aninhado"""
+    rnd = random.Random(seed)
+    names = [f"v{i}" for i in range(variables)]
+
+    lines = ["program Bench;", "var", f"  {', '.join(names)}, i, j: integer;", "  total: real;", "begin"]
+
+    for start in range(0, statements, 10):
+        count = min(10, statements - start)
+        lines.append("  for i := 1 to 3 do begin")
+        lines.extend(generate_statements(count // 2, names, rnd))
+        lines.append("  j := 0;")
+        lines.append("  while j < 2 do begin j := j + 1;")
+        lines.extend(generate_statements(count - count // 2, names, rnd))
+        lines.append("  end")
+        lines.append("  end")
+
+    lines.append("end.")
+
+    return "\n".join(lines) + "\n"
+
+
+def nested_loop_program(outer: int, inner: int) -> str:
+    """
+    Programa no estilo de examples/TestComplete.pas (for com while aninhado),
+    sem o continue e sem escrita no laço, com expressões que não mudam dentro
+    dos laços
+    """
+    return f"""program Nested;
+var i, j, n, limite, soma: integer;
+begin
+  soma := 0;
+  n := 7;
+  limite := {inner};
+  for i := 1 to {outer} do
+  begin
+    j := 1;
+    while j <= limite do
+    begin
+      soma := soma + i * 3 + n * 2 - j;
+      j := j + 1;
+    end
+  end
+  writeln("Soma final: ", soma);
+end.
+"""
+
+
+def summing_program(iterations: int) -> str:
+    """Programa com um laço puro de contagem e soma, que vira uma conta fixa"""
+    return f"""program Sum;
+var i, n, soma, impares, passos: integer;
+begin
+  soma := 0;
+  impares := 0;
+  passos := 0;
+  n := {iterations};
+  for i := 1 to n do
+  begin
+    soma := soma + i;
+    impares := impares + 2 * i - 1;
+    passos := passos + 1;
+  end
+  writeln("soma=", soma, " impares=", impares, " passos=", passos);
+end.
+"""
+
+
+def common_program(iterations: int) -> str:
+    """Programa com contas repetidas num mesmo comando e a mesma condição em ifs seguidos"""
+    return f"""program Common;
+var i, n, x, y, soma: integer;
+begin
+  soma := 0;
+  n := 5;
+  for i := 1 to {iterations} do
+  begin
+    x := (i + n) * (i + n);
+    y := (i + n) * 2 + x mod 7;
+    if (x > y) and (i mod 3 == 0) then soma := soma + 1;
+    if (x > y) and (i mod 3 == 0) then soma := soma - y; else soma := soma + x mod 7;
+  end
+  writeln("soma=", soma);
+end.
+"""
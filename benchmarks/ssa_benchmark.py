@@ -0,0 +1,61 @@
+import argparse
+import time
+
+from benchmarks.execution import executed
+from benchmarks.programs import (arithmetic_program, common_program, generate_loop_program, generate_program,
+                                 loop_program, nested_loop_program)
+from lib.lexical.scanner import Scanner
+from lib.syntatic.syntatic import Syntatic
+from lib.optimizer.dse import eliminate_dead_stores
+from lib.optimizer.fold import fold_constants
+from lib.optimizer.sccp import propagate_constants
+from lib.optimizer.ssa import from_ssa, to_ssa
+
+
+def through_ssa(text: str) -> tuple:
+    """Instruções depois de fold_constants (o passo anterior do optimize), depois dos passos sobre SSA, e o tempo deles"""
+    syntatic = Syntatic(Scanner(text).tokenize())
+    instructions = fold_constants(syntatic.start())
+
+    begin = time.perf_counter()
+    cleaned = from_ssa(eliminate_dead_stores(propagate_constants(to_ssa(instructions))))
+    return syntatic, instructions, cleaned, time.perf_counter() - begin
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Instruções antes e depois dos passos sobre SSA (propagação de constantes e escritas mortas)")
+    parser.add_argument("--iterations", type=int, default=10_000)
+    parser.add_argument("--statements", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    args = parser.parse_args()
+
+    print(f"{'programa':>12} {'instruções':>16} {'executadas':>24}")
+
+    for name, text in [
+        ("laço", loop_program(args.iterations)),
+        ("aritmética", arithmetic_program(args.iterations)),
+        ("aninhado", nested_loop_program(args.iterations // 1_000 or 1, 1_000)),
+        ("repetidas", common_program(args.iterations)),
+    ]:
+        syntatic, instructions, cleaned, _ = through_ssa(text)
+        slots = syntatic.slots()
+
+        count_before, output_before = executed(instructions, slots)
+        count_after, output_after = executed(cleaned, slots)
+        assert output_before == output_after
+
+        print(f"{name:>12} {len(instructions):>6} -> {len(cleaned):<6} {count_before:>11} -> {count_after:<9}")
+
+    # Os gerados param com erro em execução: só o tamanho e o tempo dos passos
+    print()
+    print(f"{'programa':>12} {'comandos':>9} {'instruções':>20} {'SSA':>8} {'µs/instr':>9}")
+
+    for statements in args.statements:
+        for name, text in [("gerado", generate_program(statements)), ("gerado+laços", generate_loop_program(statements))]:
+            _, instructions, cleaned, elapsed = through_ssa(text)
+
+            print(f"{name:>12} {statements:>9} {len(instructions):>9} -> {len(cleaned):<7} {elapsed:7.3f}s "
+                  f"{elapsed / len(instructions) * 1e6:9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.programs import generate_program_of_size
+from lib.lexical.lexical import Lexical
+
+
+def write_program(size_bytes: int) -> str:
+    with tempfile.NamedTemporaryFile("w", suffix=".pas", delete=False) as handle:
+        handle.write(generate_program_of_size(size_bytes))
+        return handle.name
+
+
+def measure(name: str, consume, filename: str):
+    tracemalloc.start()
+    begin = time.perf_counter()
+    count = consume(Lexical(filename))
+    elapsed = time.perf_counter() - begin
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"  {name:<12} {count:>10} tokens  {elapsed:8.2f} s  pico {peak / (1024 * 1024):8.2f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memória de pico de tokenize() e iter_tokens() para fontes de tamanhos diferentes")
+    parser.add_argument("--sizes-mb", type=float, nargs="+", default=[1, 4])
+    args = parser.parse_args()
+
+    for size in args.sizes_mb:
+        filename = write_program(int(size * 1024 * 1024))
+
+        try:
+            print(f"Fonte de {size:g} MB")
+            measure("tokenize", lambda lexical: len(lexical.tokenize()), filename)
+            measure("iter_tokens", lambda lexical: sum(1 for _ in lexical.iter_tokens()), filename)
+        finally:
+            os.remove(filename)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import argparse
+import time
+import tracemalloc
+
+from benchmarks.programs import generate_program
+from lib.lexical.scanner import Scanner
+from lib.lexical.symbols import SymbolTable
+from lib.lexical.token import Token
+from lib.lexical.token_type import TokenType
+from lib.syntatic.syntatic import Syntatic
+
+
+class CountingDict(dict):
+    """Dicionário que conta as consultas por nome"""
+
+    lookups = 0
+
+    def get(self, key, default=None):
+        CountingDict.lookups += 1
+        return super().get(key, default)
+
+
+def plain_tokens(source: str) -> list[Token]:
+    """Tokens como antes da internação: um str novo por ocorrência"""
+    return [Token(token_type, buffer[start:end], line, column) for token_type, buffer, start, end, line, column, _ in Scanner(source).spans()]
+
+
+def measure_memory(name: str, build, source: str) -> list[Token]:
+    tracemalloc.start()
+    tokens = build(source)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    identifiers = [token.lexeme for token in tokens if token.token_type == TokenType.VARIABLE]
+    distinct = len({id(lexeme) for lexeme in identifiers})
+    print(f"  {name:<12} retido {current / (1024 * 1024):8.2f} MB  {len(identifiers):>8} identificadores em {distinct:>8} objetos str")
+    return tokens
+
+
+def measure_parse(name: str, tokens: list[Token], symbols: SymbolTable, repeat: int):
+    symbols.ids = CountingDict(symbols.ids)
+    CountingDict.lookups = 0
+    elapsed = 0.0
+
+    for _ in range(repeat):
+        remaining = list(tokens)
+        begin = time.perf_counter()
+        Syntatic(remaining, symbols).start()
+        elapsed += time.perf_counter() - begin
+
+    print(f"  {name:<12} {elapsed / repeat:8.4f} s  {CountingDict.lookups // repeat:>8} consultas por nome na tabela de símbolos")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Custo de hashing e memória dos identificadores com e sem internação")
+    parser.add_argument("--statements", type=int, default=5000)
+    parser.add_argument("--parse-statements", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--variables", type=int, default=500)
+    parser.add_argument("--prefix", default="contadorAuxiliar")
+    args = parser.parse_args()
+
+    source = generate_program(args.statements, variables=args.variables, prefix=args.prefix)
+    print(f"Fonte: {len(source) / 1024:.0f} KB, {args.variables} variáveis")
+
+    print("Memória dos tokens:")
+    plain = measure_memory("str", plain_tokens, source)
+    symbols = SymbolTable()
+    interned = measure_memory("Symbol", lambda text: Scanner(text, symbols=symbols).tokenize(), source)
+
+    # A lista de comandos ainda é analisada recursivamente, então a análise
+    # sintática usa um programa menor repetido várias vezes
+    source = generate_program(args.parse_statements, variables=args.variables, prefix=args.prefix)
+    symbols = SymbolTable()
+
+    print("Análise sintática:")
+    measure_parse("str", plain_tokens(source), SymbolTable(), args.repeat)
+    measure_parse("Symbol", Scanner(source, symbols=symbols).tokenize(), symbols, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+import argparse
+import time
+
+from benchmarks.programs import generate_program
+from benchmarks.expression_benchmark import expression_program
+from lib.lexical.scanner import Scanner
+from lib.syntatic.syntatic import Syntatic
+from lib.syntatic.table_parser import TableSyntatic
+
+
+def best_times(tokens, repeat: int) -> tuple[float, float]:
+    """Melhor tempo de cada analisador, alternando as execuções"""
+    best = [float("inf"), float("inf")]
+
+    for _ in range(repeat):
+        for i, parser_class in enumerate((Syntatic, TableSyntatic)):
+            begin = time.perf_counter()
+            parser_class(tokens).start()
+            best[i] = min(best[i], time.perf_counter() - begin)
+
+    return best[0], best[1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tempo de análise do Syntatic e do TableSyntatic (tabela LL(1))")
+    parser.add_argument("--statements", type=int, default=20_000)
+    parser.add_argument("--terms", type=int, default=2_000, help="termos por expressão no programa de expressões")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    programs = {
+        "comandos": generate_program(args.statements),
+        "expressões": expression_program(args.terms, 20),
+    }
+
+    print(f"{'programa':>12} {'tokens':>10} {'Syntatic':>10} {'tabela':>10} {'razão':>8}")
+
+    for name, text in programs.items():
+        tokens = Scanner(text).tokenize()
+
+        if Syntatic(tokens).start() != TableSyntatic(tokens).start():
+            raise AssertionError(f"Different instructions for '{name}'")
+
+        hand_written, table = best_times(tokens, args.repeat)
+        print(f"{name:>12} {len(tokens):>10} {hand_written:9.3f}s {table:9.3f}s {table / hand_written:8.2f}")
+
+
+if __name__ == "__main__":
+    main()
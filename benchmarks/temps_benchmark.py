@@ -0,0 +1,48 @@
+import argparse
+import time
+import tracemalloc
+
+from benchmarks.programs import generate_program
+from lib.lexical.scanner import Scanner
+from lib.syntatic.syntatic import Syntatic
+from lib.interpreter.interpreter import Interpreter
+from lib.optimizer.temps import reuse_temps
+
+
+def load_memory(instructions: list[tuple], slots: dict) -> int:
+    """Bytes alocados pelo Interpreter para o frame e as instruções carregadas"""
+    tracemalloc.start()
+    interpreter = Interpreter(instructions, slots)
+    interpreter._load()
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return memory
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Temporárias, slots e memória antes e depois do reaproveitamento de temporárias")
+    parser.add_argument("--statements", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    args = parser.parse_args()
+
+    print(f"{'comandos':>10} {'instruções':>11} {'símbolos':>18} {'memória (KiB)':>18} {'passo':>8}")
+
+    for statements in args.statements:
+        syntatic = Syntatic(Scanner(generate_program(statements)).tokenize())
+        instructions = syntatic.start()
+
+        symbols_before = len(syntatic.symbol_table)
+        memory_before = load_memory(instructions, syntatic.slots())
+
+        begin = time.perf_counter()
+        optimized = reuse_temps(instructions, syntatic.symbol_table)
+        elapsed = time.perf_counter() - begin
+
+        symbols_after = len(syntatic.symbol_table)
+        memory_after = load_memory(optimized, syntatic.slots())
+
+        print(f"{statements:>10} {len(instructions):>11} {symbols_before:>8} -> {symbols_after:<6} "
+              f"{memory_before / 1024:>8.0f} -> {memory_after / 1024:<6.0f} {elapsed:7.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+import argparse
+import time
+import tracemalloc
+
+from benchmarks.programs import generate_program_of_size
+from lib.lexical.scanner import Scanner
+from lib.lexical.token_stream import TokenStream
+
+
+def measure(name: str, build, source: str):
+    tracemalloc.start()
+    begin = time.perf_counter()
+    result = build(source)
+    elapsed = time.perf_counter() - begin
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"  {name:<12} {len(result):>10} tokens  {elapsed:8.2f} s  retido {current / (1024 * 1024):8.2f} MB")
+    return current
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memória retida por list[Token] e por TokenStream")
+    parser.add_argument("--size-mb", type=float, default=4.0)
+    args = parser.parse_args()
+
+    source = generate_program_of_size(int(args.size_mb * 1024 * 1024))
+    print(f"Fonte: {len(source) / (1024 * 1024):.1f} MB (não contado)")
+
+    tokens = measure("list[Token]", lambda text: Scanner(text).tokenize(), source)
+    stream = measure("TokenStream", TokenStream.from_text, source)
+    print(f"Redução: {tokens / stream:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+from lib.lexical.lexical import Lexical
+from lib.syntatic.syntatic import Syntatic
+
+
+def compile_source(source: str | bytes) -> list[tuple]:
+    """Análise léxica e sintática de um fonte em memória, sem passar pelo sistema de arquivos"""
+    if isinstance(source, str):
+        lexical = Lexical.from_string(source)
+    else:
+        lexical = Lexical.from_bytes(source)
+
+    return Syntatic(lexical.tokenize(), lexical.symbols).start()
+
+
+def compile_file(filename: str) -> list[tuple]:
+    """Análise sintática em paralelo com a léxica, sem montar a lista completa de tokens"""
+    lexical = Lexical(filename)
+
+    with lexical.token_pipeline() as tokens:
+        try:
+            return Syntatic(tokens, lexical.symbols).start()
+        except Exception:
+            # Como na análise sequencial, um erro léxico em qualquer ponto do fonte tem precedência
+            for _ in tokens:
+                pass
+            raise
@@ -1,24 +1,83 @@
+import operator
+
+from lib.lexical.symbols import Symbol
+from lib.syntatic.operands import Constant, literal_value, to_number
+
+
+# Comandos cujos campos 1 a 3 são variáveis escritas ou operandos lidos
+OPERAND_COMMANDS = {
+    'ATT', 'ADD', 'SUB', 'MULT', 'IDIV', 'DIV', 'MOD',
+    'EQ', 'NEQ', 'LEQ', 'GEQ', 'GRET', 'LESS', 'OR', 'AND', 'NOT',
+}
+
+# Desvios condicionais (gerados pelo peephole): comparação de OP1 com OP2
+BRANCH_COMMANDS = {
+    'IF_EQ': operator.eq,
+    'IF_NEQ': operator.ne,
+    'IF_LEQ': operator.le,
+    'IF_GEQ': operator.ge,
+    'IF_GRET': operator.gt,
+    'IF_LESS': operator.lt,
+}
+
+
+def stored(value):
+    """
+    Valor como fica guardado numa variável. Os valores lidos de variáveis
+    sempre passaram de novo por to_number; fazer isso uma vez, na escrita,
+    dá o mesmo resultado e deixa cada leitura ser só um acesso ao frame.
+    """
+    return value if type(value) is int else to_number(value)
+
+
+def is_literal_text(operand: str) -> bool:
+    """Operando em texto (sem Constant) que é um literal da IR: entre aspas ou '\\n'"""
+    return (operand.startswith("'") and operand.endswith("'")) or \
+        (operand.startswith('"') and operand.endswith('"')) or operand == '\\n'
+
+
 class Interpreter:
-    def __init__(self, instructions):
+    def __init__(self, instructions, slots: dict[str, int] | None = None):
         self.instructions = instructions
-        self.variables = {}  # Armazena as variáveis do programa
+        # Slot de cada variável e temporária (Syntatic.slots); sem ele, as
+        # variáveis recebem slots na ordem em que aparecem nas instruções
+        self.slots = dict(slots) if slots is not None else {}
+        # Valores das variáveis e, depois delas, dos literais, indexados por slot
+        self.frame = [None] * len(self.slots)
+        self.constants = {}  # Slot de cada literal, pelo texto
+        self.code = []  # Instruções com os operandos trocados pelos slots
+        self.advance = []  # Se o pc avança depois de cada instrução
         self.pc = 0  # Program counter - índice da instrução atual
         self.labels = {}  # Mapeia labels para posições no código
         self.loop_stack = []  # Pilha de blocos de loop (início e fim)
 
+        for name, slot in self.slots.items():
+            # Uma variável nunca atribuída vale o próprio nome, convertido
+            self.frame[slot] = to_number(name)
+
+    @property
+    def variables(self) -> dict:
+        """Valores das variáveis pelo nome; só para depuração"""
+        return {name: self.frame[slot] for name, slot in self.slots.items()}
+
     def run(self):
         """Executa o programa intermediário"""
         # identificar as labels
         self._map_labels()
+        # resolver os operandos para slots
+        if not self.code:
+            self._load()
 
         # executar as instruções
+        code = self.code
+        advance = self.advance
         self.pc = 0
-        while self.pc < len(self.instructions):
-            instruction = self.instructions[self.pc]
-            self._execute_instruction(instruction)
+        while self.pc < len(code):
+            pc = self.pc
+            self._execute_instruction(code[pc])
 
             # Não incrementamos o pc se a instrução era um jump ou if pois esses comandos já ajustam o pc diretamente
-            if instruction[2] not in ['JUMP', 'IF', 'BREAK', 'CONTINUE']:
+            if advance[pc]:
                 self.pc += 1
 
     def _map_labels(self):
@@ -27,57 +86,51 @@ class Interpreter:
             if instruction[0] == 'LABEL':
                 self.labels[instruction[1]] = i
 
-    def _try_convert_to_number(self, value: str):
+    def _load(self):
+        """Troca variáveis e literais das instruções por slots do frame"""
+        slot = self._slot
 
-        value = str(value)
+        for instruction in self.instructions:
+            cmd = instruction[0]
 
-        if len(value) > 2 and value[:2] == '0x':
-            # Verifica se é um número hexadecimal
-            try:
-                return int(value, 16)
-            except ValueError:
-                return value
-        elif len(value) > 0 and value[0] == '0':
-            # Verifica se é um número octal
-            try:
-                return int(value, 8)
-            except ValueError:
-                return value
+            if cmd in OPERAND_COMMANDS:
+                instruction = (cmd, slot(instruction[1]), slot(instruction[2]), slot(instruction[3]))
+            elif cmd == 'IF':
+                instruction = (cmd, slot(instruction[1]), instruction[2], instruction[3])
+            elif cmd in BRANCH_COMMANDS:
+                instruction = (cmd, slot(instruction[1]), slot(instruction[2]), instruction[3])
+            elif cmd == 'CALL':
+                instruction = (cmd, instruction[1], slot(instruction[2]), instruction[3])
 
-        if "." in str(value):
-            try:
-                return float(value)
-            except ValueError:
-                return value
+            self.code.append(instruction)
 
-        try:
-            return int(value)
-        except ValueError:
-            return value
+        self.advance = [instruction[2] not in ['JUMP', 'IF', 'BREAK', 'CONTINUE'] for instruction in self.instructions]
 
-    def _get_value(self, operand):
-        """Obtém o valor de um operando (variável ou literal)"""
+    def _slot(self, operand):
+        """Slot de um operando; o de um literal guarda o valor já convertido"""
         if operand is None:
             return None
 
-        # Se é uma string que representa um número
-        if isinstance(operand, str) and operand.startswith("'") and operand.endswith("'"):
-            return self._try_convert_to_number(operand[1:-1])
+        if isinstance(operand, Constant):
+            value = operand.value
+        elif not isinstance(operand, Symbol) and is_literal_text(operand):
+            value = literal_value(operand)
+        else:
+            slot = self.slots.get(operand)
+
+            if slot is None:
+                slot = self.slots[operand] = len(self.frame)
+                self.frame.append(to_number(operand))
 
-        # Se é uma string literal com aspas duplas
-        elif isinstance(operand, str) and operand.startswith('"') and operand.endswith('"'):
-            return operand[1:-1]  # Remove as aspas
+            return slot
 
-        # Se está nas variáveis, pega o valor
-        elif isinstance(operand, str) and operand in self.variables:
-            return self._try_convert_to_number(self.variables[operand])
+        slot = self.constants.get(operand)
 
-        # Para caracteres especiais como '\n'
-        elif operand == '\\n':
-            return '\n'
+        if slot is None:
+            slot = self.constants[operand] = len(self.frame)
+            self.frame.append(value)
 
-        # Caso contrário, retorna o operando como está
-        return self._try_convert_to_number(operand)
+        return slot
 
     def _execute_instruction(self, instruction):
         """Executa uma instrução individual"""
@@ -92,6 +145,8 @@ class Interpreter:
                 self._execute_sub(instruction)
             elif cmd == 'IF':
                 self._execute_if(instruction)
+            elif cmd in BRANCH_COMMANDS:
+                self._execute_branch(instruction)
             elif cmd == 'JUMP':
                 self._execute_jump(instruction)
             elif cmd == 'LABEL':
@@ -128,136 +183,118 @@ class Interpreter:
             else:
                 print(f"Comando desconhecido: {cmd}")
         except Exception as e:
-            print(f"Erro ao executar {instruction}: {e}")
+            # A mensagem mostra a instrução original, com os nomes
+            print(f"Erro ao executar {self.instructions[self.pc]}: {e}")
             raise
 
+    # As instruções abaixo já têm slots no lugar de SALVO, OP1 e OP2
+
     def _execute_att(self, instruction):
         """Atribuição: ('ATT', SALVO, VALOR, NONE)"""
-        variable = instruction[1]
-        value = self._get_value(instruction[2])
-        self.variables[variable] = value
+        frame = self.frame
+        frame[instruction[1]] = stored(frame[instruction[2]])
 
     def _execute_add(self, instruction):
         """Adição: ('ADD', SALVO, OP1, OP2)"""
-        result_var = instruction[1]
-        op1 = self._get_value(instruction[2])
-        op2 = self._get_value(instruction[3])
-        self.variables[result_var] = op1 + op2
+        frame = self.frame
+        frame[instruction[1]] = stored(frame[instruction[2]] + frame[instruction[3]])
 
     def _execute_sub(self, instruction):
         """Subtração: ('SUB', SALVO, OP1, OP2)"""
-        result_var = instruction[1]
-        op1 = self._get_value(instruction[2])
-        op2 = self._get_value(instruction[3])
-        self.variables[result_var] = op1 - op2
+        frame = self.frame
+        frame[instruction[1]] = stored(frame[instruction[2]] - frame[instruction[3]])
 
     def _execute_if(self, instruction):
         """Condicional: ('IF', COND, LABEL_TRUE, LABEL_FALSE)"""
-        condition = self._get_value(instruction[1])
+        condition = self.frame[instruction[1]]
         if condition:
             self.pc = self.labels[instruction[2]]
         else:
             self.pc = self.labels[instruction[3]]
 
+    def _execute_branch(self, instruction):
+        """Desvio condicional: ('IF_LESS', OP1, OP2, LABEL_FALSE); segue para a próxima instrução se a comparação é verdadeira"""
+        frame = self.frame
+        if not BRANCH_COMMANDS[instruction[0]](frame[instruction[1]], frame[instruction[2]]):
+            self.pc = self.labels[instruction[3]]
+
     def _execute_jump(self, instruction):
         """Salto: ('JUMP', LABEL, NONE, NONE)"""
         self.pc = self.labels[instruction[1]]
 
     def _execute_eq(self, instruction):
         """Igualdade: ('EQ', SALVO, OP1, OP2)"""
-        result_var = instruction[1]
-        op1 = self._get_value(instruction[2])
-        op2 = self._get_value(instruction[3])
-        self.variables[result_var] = 1 if op1 == op2 else 0
+        frame = self.frame
+        frame[instruction[1]] = 1 if frame[instruction[2]] == frame[instruction[3]] else 0
 
     def _execute_neq(self, instruction):
         """Desigualdade: ('NEQ', SALVO, OP1, OP2)"""
-        result_var = instruction[1]
-        op1 = self._get_value(instruction[2])
-        op2 = self._get_value(instruction[3])
-        self.variables[result_var] = 1 if op1 != op2 else 0
+        frame = self.frame
+        frame[instruction[1]] = 1 if frame[instruction[2]] != frame[instruction[3]] else 0
 
     def _execute_leq(self, instruction):
         """Menor ou igual: ('LEQ', SALVO, OP1, OP2)"""
-        result_var = instruction[1]
-        op1 = self._get_value(instruction[2])
-        op2 = self._get_value(instruction[3])
-        self.variables[result_var] = 1 if op1 <= op2 else 0
+        frame = self.frame
+        frame[instruction[1]] = 1 if frame[instruction[2]] <= frame[instruction[3]] else 0
 
     def _execute_geq(self, instruction):
         """Maior ou igual: ('GEQ', SALVO, OP1, OP2)"""
-        result_var = instruction[1]
-        op1 = self._get_value(instruction[2])
-        op2 = self._get_value(instruction[3])
-        self.variables[result_var] = 1 if op1 >= op2 else 0
+        frame = self.frame
+        frame[instruction[1]] = 1 if frame[instruction[2]] >= frame[instruction[3]] else 0
 
     def _execute_gret(self, instruction):
         """Maior que: ('GRET', SALVO, OP1, OP2)"""
-        result_var = instruction[1]
-        op1 = self._get_value(instruction[2])
-        op2 = self._get_value(instruction[3])
-        self.variables[result_var] = 1 if op1 > op2 else 0
+        frame = self.frame
+        frame[instruction[1]] = 1 if frame[instruction[2]] > frame[instruction[3]] else 0
 
     def _execute_less(self, instruction):
         """Menor que: ('LESS', SALVO, OP1, OP2)"""
-        result_var = instruction[1]
-        op1 = self._get_value(instruction[2])
-        op2 = self._get_value(instruction[3])
-        self.variables[result_var] = 1 if op1 < op2 else 0
+        frame = self.frame
+        frame[instruction[1]] = 1 if frame[instruction[2]] < frame[instruction[3]] else 0
 
     def _execute_mult(self, instruction):
         """Multiplicação: ('MULT', SALVO, OP1, OP2)"""
-        result_var = instruction[1]
-        op1 = self._get_value(instruction[2])
-        op2 = self._get_value(instruction[3])
-        self.variables[result_var] = op1 * op2
+        frame = self.frame
+        frame[instruction[1]] = stored(frame[instruction[2]] * frame[instruction[3]])
 
     def _execute_idiv(self, instruction):
         """Divisão inteira: ('IDIV', SALVO, OP1, OP2)"""
-        result_var = instruction[1]
-        op1 = self._get_value(instruction[2])
-        op2 = self._get_value(instruction[3])
+        frame = self.frame
+        op2 = frame[instruction[3]]
         if op2 == 0:
             raise ZeroDivisionError("Divisão por zero")
-        self.variables[result_var] = op1 // op2
+        frame[instruction[1]] = stored(frame[instruction[2]] // op2)
 
     def _execute_div(self, instruction):
         """Divisão: ('DIV', SALVO, OP1, OP2)"""
-        result_var = instruction[1]
-        op1 = self._get_value(instruction[2])
-        op2 = self._get_value(instruction[3])
+        frame = self.frame
+        op2 = frame[instruction[3]]
         if op2 == 0:
             raise ZeroDivisionError("Divisão por zero")
-        self.variables[result_var] = op1 / op2
+        frame[instruction[1]] = stored(frame[instruction[2]] / op2)
 
     def _execute_mod(self, instruction):
         """Módulo: ('MOD', SALVO, OP1, OP2)"""
-        result_var = instruction[1]
-        op1 = self._get_value(instruction[2])
-        op2 = self._get_value(instruction[3])
+        frame = self.frame
+        op2 = frame[instruction[3]]
         if op2 == 0:
             raise ZeroDivisionError("Módulo por zero")
-        self.variables[result_var] = op1 % op2
+        frame[instruction[1]] = stored(frame[instruction[2]] % op2)
 
     def _execute_or(self, instruction):
         """Operação OR: ('OR', SALVO, OP1, OP2)"""
-        result_var = instruction[1]
-        op1 = self._get_value(instruction[2])
-        op2 = self._get_value(instruction[3])
-        self.variables[result_var] = 1 if (op1 or op2) else 0
+        frame = self.frame
+        frame[instruction[1]] = 1 if (frame[instruction[2]] or frame[instruction[3]]) else 0
 
     def _execute_and(self, instruction):
         """Operação AND: ('AND', SALVO, OP1, OP2)"""
-        result_var = instruction[1]
-        op1 = self._get_value(instruction[2])
-        op2 = self._get_value(instruction[3])
-        self.variables[result_var] = 1 if (op1 and op2) else 0
+        frame = self.frame
+        frame[instruction[1]] = 1 if (frame[instruction[2]] and frame[instruction[3]]) else 0
 
     def _execute_not(self, instruction):
         """Operação NOT: ('NOT', SALVO, OP1, NONE)"""
-        result_var = instruction[1]
-        op1 = self._get_value(instruction[2])
-        self.variables[result_var] = 1 if not op1 else 0
+        frame = self.frame
+        frame[instruction[1]] = 1 if not frame[instruction[2]] else 0
 
     def _execute_call(self, instruction):
         """Chamada de função: ('CALL', 'read'/'write', SALVO/ESCRITO, NONE)"""
@@ -275,7 +312,7 @@ class Interpreter:
                         value = float(value)
                     except ValueError:
                         pass  # Deixa como string se não for número
-                self.variables[var] = value
+                self.frame[var] = stored(value)
             except Exception as e:
                 print(f"Erro na leitura: {e}")
 
@@ -291,12 +328,12 @@ class Interpreter:
                         value = float(value)
                     except ValueError:
                         pass  # Deixa como string se não for número
-                self.variables[var] = value
+                self.frame[var] = stored(value)
             except Exception as e:
                 print(f"Erro na leitura: {e}")
 
         elif function == 'write':
-            value = self._get_value(instruction[2])
+            value = self.frame[instruction[2]]
             print(value, end="")
 
     def _start_loop(self, start_label, end_label):
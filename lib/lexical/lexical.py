@@ -1,17 +1,71 @@
+import io
+from typing import IO, Iterator
+
 from lib.lexical.token_type import TokenType
 from lib.lexical.token import Token
 from lib.lexical.errors import StringError, InvalidNumberError
 from lib.lexical.token_map import token_map
+from lib.lexical.scanner import Scanner
+from lib.lexical.token_stream import TokenStream
+from lib.lexical.parallel import tokenize_parallel
+from lib.lexical.pipeline import TokenPipeline, BATCH_SIZE, MAX_BATCHES
+from lib.lexical.source import map_file
+from lib.lexical.symbols import SymbolTable
+
+
+# Tamanho, em caracteres, de cada leitura feita por iter_tokens
+CHUNK_SIZE = 64 * 1024
 
 
 class Lexical:
-    def __init__(self, filename: str):
+    def __init__(self, filename: str, memory_map: bool = False):
         try:
-            with open(filename, "r") as file_handle:
-                self.input = list(file_handle)
+            open(filename, "r").close()
         except FileNotFoundError:
             raise Exception(f"Error: The file {filename} does not exist.")
 
+        self._setup(filename, memory_map)
+
+    @classmethod
+    def from_string(cls, text: str) -> "Lexical":
+        """Fonte em memória; as quebras de linha são normalizadas como no modo texto de open"""
+        lexical = cls.__new__(cls)
+        lexical._setup(None, False)
+        lexical._text = text.replace("\r\n", "\n").replace("\r", "\n")
+        return lexical
+
+    @classmethod
+    def from_bytes(cls, data: bytes, encoding: str = "utf-8") -> "Lexical":
+        """Fonte em memória codificado; em UTF-8 o Scanner lê os bytes sem decodificar"""
+        if encoding.replace("-", "").lower() != "utf8":
+            return cls.from_string(bytes(data).decode(encoding))
+
+        lexical = cls.__new__(cls)
+        lexical._setup(None, False)
+        lexical._text = bytes(data)
+        return lexical
+
+    @classmethod
+    def from_file(cls, file: IO, encoding: str = "utf-8") -> "Lexical":
+        """Fonte lido de um objeto de arquivo já aberto (texto ou binário), como um socket.makefile()"""
+        if isinstance(file.read(0), bytes):
+            file = io.TextIOWrapper(file, encoding=encoding)
+
+        lexical = cls.__new__(cls)
+        lexical._setup(None, False)
+        lexical._file = file
+        return lexical
+
+    def _setup(self, filename: str | None, memory_map: bool):
+        self.filename = filename
+        self.memory_map = memory_map
+        self._input: list[str] | None = None
+        # Fonte em memória (str ou bytes UTF-8) ou objeto de arquivo, quando não há filename
+        self._text: str | bytes | None = None
+        self._file: IO[str] | None = None
+        # Identificadores internados pelo Scanner; repassada ao Syntatic
+        self.symbols = SymbolTable()
+
         self.line = 0
         self.column = 0
 
@@ -25,6 +79,23 @@ class Lexical:
 
         self.brace_delimiters = {"\n", " ", "\t"}
 
+    @property
+    def input(self) -> list[str]:
+        """Linhas do arquivo, carregadas apenas quando nextToken precisa delas"""
+        if self._input is None:
+            if self.filename is None:
+                text = self.source()
+
+                if isinstance(text, bytes):
+                    text = text.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+
+                self._input = text.splitlines(keepends=True)
+            else:
+                with open(self.filename, "r") as file_handle:
+                    self._input = list(file_handle)
+
+        return self._input
+
     def get_char(self) -> str:
         try:
 
@@ -349,18 +420,56 @@ class Lexical:
     def print_token(self, token: Token):
         print(f"({token.token_type}, {token.lexeme}, {token.line}, {token.column})")
 
-    def tokenize(self) -> list[Token]:
-        tokens = []
+    def source(self):
+        """Fonte completo: str, bytes (de from_bytes) ou um mmap somente leitura com memory_map=True"""
+        if self._input is not None:
+            return "".join(self._input)
 
-        while True:
-            token = self.nextToken()
+        if self._file is not None:
+            self._text = self._file.read()
+            self._file = None
 
-            if token is None:
-                continue
+        if self._text is not None:
+            return self._text
 
-            if token.token_type == TokenType.EOF:
-                break
+        if self.memory_map:
+            return map_file(self.filename)
 
-            tokens.append(token)
+        with open(self.filename, "r") as file_handle:
+            return file_handle.read()
+
+    def tokenize(self) -> list[Token]:
+        """Tokeniza o fonte inteiro usando o Scanner gerado a partir de token_spec"""
+        source = self.source()
+        tokens = Scanner(source, symbols=self.symbols).tokenize()
+
+        if self.memory_map and hasattr(source, "close"):
+            source.close()
 
         return tokens
+
+    def token_stream(self, workers: int = 1) -> TokenStream:
+        """Tokeniza o fonte inteiro em um TokenStream compacto; workers > 1 divide o fonte entre processos"""
+        if workers > 1:
+            return tokenize_parallel(self.source(), workers, self.symbols)
+
+        return TokenStream.from_text(self.source(), self.symbols)
+
+    def token_pipeline(self, batch_size: int = BATCH_SIZE, max_batches: int = MAX_BATCHES) -> TokenPipeline:
+        """Tokens de iter_tokens produzidos em uma thread e entregues por uma fila limitada"""
+        return TokenPipeline(self.iter_tokens(), batch_size, max_batches)
+
+    def iter_tokens(self, chunk_size: int = CHUNK_SIZE) -> Iterator[Token]:
+        """Gera os tokens lendo o arquivo em pedaços, sem carregar o fonte inteiro"""
+        if self._file is not None:
+            chunks = iter(lambda: self._file.read(chunk_size), "")
+            yield from Scanner.from_chunks(chunks, symbols=self.symbols).tokens()
+            return
+
+        if self.filename is None:
+            yield from Scanner(self.source(), symbols=self.symbols).tokens()
+            return
+
+        with open(self.filename, "r") as file_handle:
+            chunks = iter(lambda: file_handle.read(chunk_size), "")
+            yield from Scanner.from_chunks(chunks, symbols=self.symbols).tokens()
@@ -0,0 +1,130 @@
+import os
+import re
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+
+from lib.lexical.symbols import SymbolTable
+from lib.lexical.token_stream import TokenStream
+
+
+# Abaixo deste tamanho por processo não compensa dividir o fonte
+MIN_CHUNK_SIZE = 256 * 1024
+
+# Trechos que podem conter '{' sem abrir comentário (strings e comentários de
+# linha) e os comentários de bloco. Strings não atravessam linhas e '\"'
+# fecha a string, como no autômato de token_spec.
+TEXT_PATTERN = re.compile(r'"(?:[^"\\\n]|\\[^"\n])*(?:\\?")?|//[^\n]*|\{[^}]*\}?')
+# No modo bytes '\r' também é quebra de linha
+BYTES_PATTERN = re.compile(rb'"(?:[^"\\\r\n]|\\[^"\r\n])*(?:\\?")?|//[^\r\n]*|\{[^}]*\}?')
+
+
+def block_comments(text) -> tuple[list[int], list[int]]:
+    """Início e fim de cada comentário de bloco do fonte"""
+    pattern = TEXT_PATTERN if isinstance(text, str) else BYTES_PATTERN
+    brace = "{" if isinstance(text, str) else ord("{")
+    starts = []
+    ends = []
+
+    for match in pattern.finditer(text):
+        if text[match.start()] == brace:
+            starts.append(match.start())
+            ends.append(match.end())
+
+    return starts, ends
+
+
+def find_cut_points(text, parts: int) -> list[int]:
+    """
+    Offsets que dividem o fonte em até parts trechos. Todo corte fica logo
+    após uma quebra de linha fora de comentários de bloco, onde o autômato
+    está sempre no estado inicial.
+    """
+    newline = "\n" if isinstance(text, str) else b"\n"
+    starts, ends = block_comments(text)
+    cuts = [0]
+
+    for part in range(1, parts):
+        target = max(len(text) * part // parts, cuts[-1])
+
+        while True:
+            cut = text.find(newline, target) + 1
+
+            if cut == 0:
+                break
+
+            # Comentário de bloco que começa antes do corte e termina depois dele
+            comment = bisect_right(starts, cut - 1) - 1
+
+            if comment < 0 or ends[comment] <= cut - 1:
+                break
+
+            target = ends[comment]
+
+        if cut == 0 or cut >= len(text):
+            break
+
+        if cut > cuts[-1]:
+            cuts.append(cut)
+
+    cuts.append(len(text))
+    return cuts
+
+
+def count_lines(text) -> int:
+    """Quebras de linha do trecho, contadas como o Scanner conta"""
+    if isinstance(text, str):
+        return text.count("\n")
+
+    return text.count(b"\n") + text.count(b"\r") - text.count(b"\r\n")
+
+
+def scan_chunk(task: tuple) -> tuple:
+    """Executado nos processos: analisa um trecho e devolve as colunas do TokenStream"""
+    text, offset, first_line = task
+
+    stream = TokenStream(text)
+    stream.scan(text, offset, first_line)
+
+    return stream.types, stream.offsets, stream.lengths, stream.lines, stream.columns, stream.symbol_ids, [str(name) for name in stream.symbols.names]
+
+
+def tokenize_parallel(text, workers: int | None = None, symbols: SymbolTable | None = None, min_chunk_size: int = MIN_CHUNK_SIZE) -> TokenStream:
+    """
+    Tokeniza o fonte dividindo-o entre processos. O resultado é o mesmo
+    TokenStream de TokenStream.from_text, com linhas e offsets absolutos; em
+    caso de erro léxico é levantado o primeiro erro na ordem do fonte.
+    """
+    workers = workers or os.cpu_count() or 1
+    parts = min(workers, len(text) // max(min_chunk_size, 1))
+    stream = TokenStream(text, symbols)
+
+    cuts = find_cut_points(text, parts) if parts > 1 else [0, len(text)]
+
+    if len(cuts) <= 2:
+        stream.scan(text)
+        return stream
+
+    tasks = []
+    line = 0
+
+    for start, end in zip(cuts, cuts[1:]):
+        chunk = text[start:end]
+        tasks.append((chunk, start, line))
+        line += count_lines(chunk)
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+        # map devolve na ordem dos trechos, então o primeiro erro é o do início do fonte
+        for types, offsets, lengths, lines, columns, symbol_ids, names in executor.map(scan_chunk, tasks):
+            # Os ids de cada processo são locais; -1 (sem símbolo) continua -1
+            remap = [stream.symbols.intern(name).id for name in names]
+            remap.append(-1)
+
+            stream.types.extend(types)
+            stream.offsets.extend(offsets)
+            stream.lengths.extend(lengths)
+            stream.lines.extend(lines)
+            stream.columns.extend(columns)
+            stream.symbol_ids.extend(array("i", map(remap.__getitem__, symbol_ids)))
+
+    return stream
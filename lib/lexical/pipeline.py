@@ -0,0 +1,89 @@
+import queue
+import threading
+from typing import Iterable, Iterator
+
+from lib.lexical.token import Token
+
+
+# Tokens por lote e lotes em espera na fila: no máximo
+# BATCH_SIZE * (MAX_BATCHES + 2) tokens existem ao mesmo tempo
+BATCH_SIZE = 1024
+MAX_BATCHES = 16
+
+# Intervalo em que o léxico bloqueado na fila cheia verifica se foi fechado
+PUT_TIMEOUT = 0.1
+
+
+class TokenPipeline:
+    """
+    Executa o léxico em uma thread e entrega os tokens em lotes por uma fila
+    limitada, para que o sintático consuma enquanto o fonte ainda é analisado.
+    Um erro léxico é levantado no consumidor depois dos tokens que o precedem.
+    """
+
+    def __init__(self, tokens: Iterable[Token], batch_size: int = BATCH_SIZE, max_batches: int = MAX_BATCHES):
+        self.queue: queue.Queue = queue.Queue(max_batches)
+        self.batch_size = batch_size
+        self.closed = False
+        # Fim dos tokens já lido da fila, e o erro léxico que o causou
+        self.done = False
+        self.error: Exception | None = None
+        self.thread = threading.Thread(target=self.produce, args=(tokens,), daemon=True)
+        self.thread.start()
+
+    def __enter__(self) -> "TokenPipeline":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def put(self, item) -> bool:
+        """Coloca um item na fila; False se o consumidor desistiu"""
+        while not self.closed:
+            try:
+                self.queue.put(item, timeout=PUT_TIMEOUT)
+                return True
+            except queue.Full:
+                pass
+
+        return False
+
+    def produce(self, tokens: Iterable[Token]):
+        """Executado na thread do léxico"""
+        batch = []
+
+        try:
+            for token in tokens:
+                batch.append(token)
+
+                if len(batch) >= self.batch_size:
+                    if not self.put(batch):
+                        return
+                    batch = []
+        except Exception as e:
+            if self.put(batch):
+                self.put(e)
+            return
+
+        if self.put(batch):
+            self.put(None)
+
+    def __iter__(self) -> Iterator[Token]:
+        while not self.done:
+            batch = self.queue.get()
+
+            if batch is None:
+                self.done = True
+            elif isinstance(batch, Exception):
+                self.done = True
+                self.error = batch
+            else:
+                yield from batch
+
+        if self.error is not None:
+            raise self.error
+
+    def close(self):
+        """Interrompe o léxico, se ainda estiver executando"""
+        self.closed = True
+        self.thread.join()
@@ -0,0 +1,305 @@
+import re
+from typing import Iterable, Iterator
+
+from lib.lexical.token import Token
+from lib.lexical.token_type import TokenType
+from lib.lexical.symbols import SymbolTable
+from lib.lexical import token_spec
+
+
+# Códigos das ações na tabela. Códigos >= 0 significam "consome o caractere e
+# vai para o estado de mesmo número"; as demais ações são guardadas em uma
+# lista e referenciadas por códigos negativos.
+BEGIN = 0
+EMIT = 1
+EMIT_WITH = 2
+EMIT_CHAR = 3
+NEWLINE = 4
+CLOSE_COMMENT = 5
+STOP = 6
+ERROR = 7
+# Só aparece nas linhas de bytes: caractere UTF-8 de mais de um byte ou '\r'
+WIDE = 8
+
+ACTION_KINDS = {
+    "begin": BEGIN,
+    "emit": EMIT,
+    "emit_with": EMIT_WITH,
+    "emit_char": EMIT_CHAR,
+    "newline": NEWLINE,
+    "close_comment": CLOSE_COMMENT,
+    "stop": STOP,
+    "error": ERROR,
+}
+
+ESCAPE_PATTERN = re.compile(r"\\(.)", re.DOTALL)
+
+
+class TransitionRow(dict):
+    """Linha da tabela de transições: caractere -> código da ação"""
+
+    def __init__(self, class_codes: dict[str, int]):
+        super().__init__()
+        self.class_codes = class_codes
+
+        for class_name, chars in token_spec.CHARACTER_CLASSES.items():
+            for c in chars:
+                self[c] = class_codes[class_name]
+
+    def __missing__(self, c: str) -> int:
+        code = self.class_codes[token_spec.classify_char(c)]
+        self[c] = code
+        return code
+
+
+class ScannerTable:
+    """Tabela de transições gerada a partir de lib.lexical.token_spec"""
+
+    def __init__(self, rules: dict[str, dict[str, tuple]] = token_spec.RULES):
+        self.states = list(rules)
+        self.state_index = {name: i for i, name in enumerate(self.states)}
+        self.actions: list[tuple] = []
+        self.rows: list[TransitionRow] = []
+        self.eof: list[int] = []
+
+        class_names = list(token_spec.CHARACTER_CLASSES) + ["letter", "unicode_digit", "other"]
+
+        for state in self.states:
+            state_rules = rules[state]
+            default = state_rules[token_spec.OTHER]
+            class_codes = {name: self.encode(default) for name in class_names}
+
+            for key, action in state_rules.items():
+                if key in (token_spec.OTHER, token_spec.EOF):
+                    continue
+
+                for class_name in key.split():
+                    if class_name not in class_codes:
+                        raise ValueError(f"Unknown character class '{class_name}' in state '{state}'")
+                    class_codes[class_name] = self.encode(action)
+
+            self.rows.append(TransitionRow(class_codes))
+            self.eof.append(self.encode(state_rules[token_spec.EOF]))
+
+        self.ignored = {self.state_index[name] for name in token_spec.IGNORED_STATES if name in self.state_index}
+
+        # Linhas indexadas por byte, usadas quando o fonte é bytes ou mmap.
+        # Bytes ASCII seguem a linha de texto; o resto é decodificado na hora.
+        self.actions.append((WIDE,))
+        wide = ~(len(self.actions) - 1)
+        self.byte_rows = [[row[chr(b)] if b < 128 and b != 13 else wide for b in range(256)] for row in self.rows]
+        self.byte_keywords = {name.encode(): token_type for name, token_type in token_spec.KEYWORDS.items()}
+
+    def encode(self, action: tuple) -> int:
+        kind = action[0]
+
+        if kind == "shift":
+            return self.state_index[action[1]]
+
+        if kind == "skip":
+            return self.state_index[token_spec.START]
+
+        if kind in ("begin", "newline"):
+            encoded = (ACTION_KINDS[kind], self.state_index[action[1]])
+        else:
+            encoded = (ACTION_KINDS[kind],) + tuple(action[1:])
+
+        if encoded not in self.actions:
+            self.actions.append(encoded)
+
+        return ~self.actions.index(encoded)
+
+
+DEFAULT_TABLE = ScannerTable()
+
+
+def unescape(raw: str) -> str:
+    return ESCAPE_PATTERN.sub(lambda match: token_spec.ESCAPES.get(match.group(1), match.group(1)), raw)
+
+
+def make_lexeme(token_type: TokenType, raw: str) -> str:
+    """Converte o trecho do fonte no lexema do token"""
+    if token_type == TokenType.STRING:
+        if "\\" in raw:
+            return unescape(raw)
+    elif token_type == TokenType.FLOAT:
+        if raw[-1] == ".":
+            return raw + "0"
+
+    return raw
+
+
+def decode_char(buffer, pos: int) -> tuple[str, int]:
+    """Caractere que começa em buffer[pos] e quantos bytes ele ocupa"""
+    lead = buffer[pos]
+
+    # Como no modo texto do open, '\r\n' e '\r' isolado valem uma quebra de linha
+    if lead == 13:
+        return "\n", 2 if buffer[pos + 1:pos + 2] == b"\n" else 1
+
+    width = 2 if lead < 0xE0 else 3 if lead < 0xF0 else 4
+    return str(buffer[pos:pos + width], "utf-8"), width
+
+
+class Scanner:
+    """
+    Executa a tabela de transições sobre o fonte. O fonte pode ser str ou um
+    objeto de bytes UTF-8 (bytes, mmap, memoryview somente leitura); nesse
+    caso as posições de spans() são offsets em bytes. Os identificadores são
+    internados em symbols. first_line é a linha em que o texto começa, para
+    analisar trechos de um fonte maior.
+    """
+
+    def __init__(self, text, table: ScannerTable = DEFAULT_TABLE, symbols: SymbolTable | None = None, first_line: int = 0):
+        self.chunks: Iterable = (text,)
+        self.binary = not isinstance(text, str)
+        self.table = table
+        self.symbols = symbols if symbols is not None else SymbolTable()
+        self.first_line = first_line
+
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[str], table: ScannerTable = DEFAULT_TABLE, symbols: SymbolTable | None = None) -> "Scanner":
+        """Scanner que lê o fonte (str) em pedaços, guardando apenas o token em andamento"""
+        scanner = cls("", table, symbols)
+        scanner.chunks = chunks
+        return scanner
+
+    def spans(self) -> Iterator[tuple]:
+        """
+        Gera (tipo, buffer, início, fim, linha, coluna, símbolo) de cada token do
+        fonte. símbolo é o Symbol internado dos identificadores e None nos demais.
+        """
+        binary = self.binary
+        rows = self.table.byte_rows if binary else self.table.rows
+        text_rows = self.table.rows
+        eof = self.table.eof
+        actions = self.table.actions
+        ignored = self.table.ignored
+        keywords = self.table.byte_keywords if binary else token_spec.KEYWORDS
+        intern = self.symbols.intern
+        variable = TokenType.VARIABLE
+
+        # Palavra do fonte -> (tipo, símbolo). Uma única consulta por
+        # identificador resolve tanto as palavras reservadas quanto o símbolo.
+        words = {word: (token_type, None) for word, token_type in keywords.items()}
+
+        chunks = iter(self.chunks)
+        final = False
+        buffer = b"" if binary else ""
+
+        pos = 0
+        start = 0
+        column = 0
+        state = 0
+        line = self.first_line
+        line_start = 0
+        # O analisador original não conta o '}' que fecha um comentário de
+        # bloco na coluna, então as colunas seguintes na linha ficam deslocadas.
+        # No modo bytes, shift também desconta os bytes extras de cada caractere.
+        shift = 0
+
+        while True:
+            try:
+                code = rows[state][buffer[pos]]
+            except IndexError:
+                if not final:
+                    chunk = next(chunks, None)
+
+                    if chunk is None:
+                        final = True
+                    elif not len(buffer):
+                        buffer = chunk
+                    else:
+                        # Descarta o que já foi consumido, mantendo só o token em andamento
+                        keep = pos if state == 0 or state in ignored else start
+                        buffer = buffer[keep:] + chunk
+                        pos -= keep
+                        start -= keep
+                        line_start -= keep
+
+                    continue
+
+                code = eof[state]
+
+            if code >= 0:
+                state = code
+                pos += 1
+                continue
+
+            action = actions[~code]
+            kind = action[0]
+            width = 1
+
+            if kind == WIDE:
+                char, width = decode_char(buffer, pos)
+                code = text_rows[state][char]
+
+                if code >= 0:
+                    state = code
+                    pos += width
+                    shift += width - 1
+                    continue
+
+                action = actions[~code]
+                kind = action[0]
+
+            if kind == BEGIN:
+                column = pos - line_start - shift
+                start = pos
+                state = action[1]
+                pos += width
+                shift += width - 1
+            elif kind == EMIT:
+                token_type = action[1]
+                if token_type is variable:
+                    word = buffer[start:pos]
+                    found = words.get(word)
+                    if found is None:
+                        found = words[word] = (variable, intern(str(word, "utf-8") if binary else word))
+                    yield found[0], buffer, start, pos, line, column, found[1]
+                else:
+                    yield token_type, buffer, start, pos, line, column, None
+                state = 0
+            elif kind == EMIT_WITH:
+                pos += 1
+                yield action[1], buffer, start, pos, line, column, None
+                state = 0
+            elif kind == EMIT_CHAR:
+                yield action[1], buffer, pos, pos + 1, line, pos - line_start - shift, None
+                pos += 1
+            elif kind == NEWLINE:
+                pos += width
+                line += 1
+                line_start = pos
+                shift = 0
+                state = action[1]
+            elif kind == CLOSE_COMMENT:
+                pos += 1
+                shift += 1
+                state = 0
+            elif kind == STOP:
+                return
+            else:
+                _, error_class, message, base, offset = action
+                error_column = (column if base == "token" else pos - line_start - shift) + offset
+                raise error_class(message.format(line=line, column=error_column))
+
+    def tokens(self) -> Iterator[Token]:
+        binary = self.binary
+        string = TokenType.STRING
+        float_type = TokenType.FLOAT
+
+        for token_type, buffer, start, end, line, column, symbol in self.spans():
+            if symbol is not None:
+                yield Token(token_type, symbol, line, column)
+                continue
+
+            lexeme = buffer[start:end]
+            if binary:
+                lexeme = str(lexeme, "utf-8")
+            if token_type is string or token_type is float_type:
+                lexeme = make_lexeme(token_type, lexeme)
+            yield Token(token_type, lexeme, line, column)
+
+    def tokenize(self) -> list[Token]:
+        return list(self.tokens())
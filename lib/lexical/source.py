@@ -0,0 +1,11 @@
+import mmap
+import os
+
+
+def map_file(filename: str):
+    """Mapeia o arquivo em memória somente leitura (arquivos vazios viram b"")"""
+    with open(filename, "rb") as file_handle:
+        if os.fstat(file_handle.fileno()).st_size == 0:
+            return b""
+
+        return mmap.mmap(file_handle.fileno(), 0, access=mmap.ACCESS_READ)
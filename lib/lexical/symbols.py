@@ -0,0 +1,53 @@
+import threading
+
+
+class Symbol(str):
+    """Identificador internado: um str comum que carrega um id inteiro denso"""
+
+    # Marcado pelo Syntatic nas variáveis temporárias que ele gera
+    temp = False
+
+    def __new__(cls, name: str, symbol_id: int):
+        symbol = super().__new__(cls, name)
+        symbol.id = symbol_id
+        return symbol
+
+    def __reduce__(self):
+        # Fora da tabela que o criou o id não significa nada
+        return (str, (str(self),))
+
+
+class SymbolTable:
+    """Tabela de identificadores compartilhada pelo léxico, sintático e interpretador"""
+
+    def __init__(self):
+        self.names: list[Symbol] = []
+        self.ids: dict[str, Symbol] = {}
+        # Só a criação de símbolos novos é protegida: no pipeline o léxico e o
+        # sintático (temporárias) internam nomes em threads diferentes
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def intern(self, name: str) -> Symbol:
+        """Retorna o Symbol único do nome, criando um id novo se necessário"""
+        if self.owns(name):
+            return name
+
+        symbol = self.ids.get(name)
+
+        if symbol is None:
+            with self.lock:
+                symbol = self.ids.get(name)
+
+                if symbol is None:
+                    symbol = Symbol(name, len(self.names))
+                    self.names.append(symbol)
+                    self.ids[symbol] = symbol
+
+        return symbol
+
+    def owns(self, name: str) -> bool:
+        """Verifica, sem calcular hash, se name é um Symbol desta tabela"""
+        return type(name) is Symbol and name.id < len(self.names) and self.names[name.id] is name
@@ -2,8 +2,19 @@ from lib.lexical.token_type import TokenType
 
 
 class Token:
+    __slots__ = ("token_type", "lexeme", "line", "column")
+
     def __init__(self, token_type: TokenType, lexeme: str, line: int, column: int):
         self.token_type = token_type
         self.lexeme = lexeme
         self.line = line
         self.column = column
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Token):
+            return NotImplemented
+
+        return self.token_type == other.token_type and self.lexeme == other.lexeme and self.line == other.line and self.column == other.column
+
+    def __repr__(self) -> str:
+        return f"Token({self.token_type}, {self.lexeme!r}, {self.line}, {self.column})"
@@ -0,0 +1,203 @@
+from lib.lexical.token_type import TokenType
+from lib.lexical.errors import StringError, InvalidNumberError
+from lib.lexical.token_map import token_map
+
+
+# Descrição declarativa do analisador léxico. O Scanner gera a tabela de
+# transições a partir daqui; nada do comportamento do autômato fica no código.
+
+KEYWORDS: dict[str, TokenType] = token_map
+
+# Sequências de escape dentro de strings. Qualquer outro caractere após a
+# barra é mantido sem a barra.
+ESCAPES: dict[str, str] = {"n": "\n", "r": "\r", "t": "\t", "0": "\0"}
+
+# Classes de caracteres. Caracteres que não aparecem aqui são classificados
+# por classify_char.
+CHARACTER_CLASSES: dict[str, str] = {
+    "zero": "0",
+    "octal": "1234567",
+    "digit": "89",
+    "hex_letter": "abcdefABCDEF",
+    "x": "x",
+    "dot": ".",
+    "quote": '"',
+    "apostrophe": "'",
+    "backslash": "\\",
+    "newline": "\n",
+    "blank": " \t",
+    "lbrace": "{",
+    "rbrace": "}",
+    "lparen": "(",
+    "rparen": ")",
+    "plus": "+",
+    "minus": "-",
+    "star": "*",
+    "slash": "/",
+    "equal": "=",
+    "less": "<",
+    "greater": ">",
+    "colon": ":",
+    "semicolon": ";",
+    "comma": ",",
+}
+
+
+def classify_char(c: str) -> str:
+    if c.isalpha():
+        return "letter"
+    if c.isdigit():
+        return "unicode_digit"
+    return "other"
+
+
+# Grupos usados nas regras abaixo
+LETTERS = "letter hex_letter x"
+DIGITS = "zero octal digit unicode_digit"
+HEX_DIGITS = "zero octal digit hex_letter"
+NUMBER_DELIMITERS = "blank newline lparen rparen lbrace rbrace comma semicolon colon plus minus star slash equal less greater quote apostrophe backslash"
+
+# Chaves especiais nas regras de cada estado
+OTHER = "*"
+EOF = "$"
+
+# Ações:
+#   ("begin", estado)      inicia um token com o caractere atual
+#   ("shift", estado)      consome o caractere atual
+#   ("emit", tipo)         emite o token sem consumir o caractere atual
+#   ("emit_with", tipo)    consome o caractere atual e emite o token
+#   ("emit_char", tipo)    emite um token de um único caractere
+#   ("skip",)              ignora o caractere atual
+#   ("newline", estado)    consome a quebra de linha
+#   ("close_comment",)     consome o '}' que fecha um comentário de bloco
+#   ("stop",)              fim da entrada
+#   ("error", classe, mensagem, base, deslocamento)
+#       base "token" usa a coluna do início do token e "char" a do caractere atual
+START = "start"
+
+RULES: dict[str, dict[str, tuple]] = {
+    START: {
+        LETTERS: ("begin", "identifier"),
+        "zero": ("begin", "zero"),
+        "octal digit unicode_digit": ("begin", "decimal"),
+        "quote": ("begin", "string"),
+        "plus": ("emit_char", TokenType.OPERATOR_PLUS),
+        "minus": ("emit_char", TokenType.OPERATOR_MINUS),
+        "star": ("emit_char", TokenType.OPERATOR_MULTIPLY),
+        "semicolon": ("emit_char", TokenType.SEMICOLON),
+        "comma": ("emit_char", TokenType.COMMA),
+        "dot": ("emit_char", TokenType.DOT),
+        "lparen": ("emit_char", TokenType.OPEN_PARENTHESES),
+        "rparen": ("emit_char", TokenType.CLOSE_PARENTHESES),
+        "slash": ("begin", "slash"),
+        "equal": ("begin", "equal"),
+        "less": ("begin", "less"),
+        "greater": ("begin", "greater"),
+        "colon": ("begin", "colon"),
+        "lbrace": ("shift", "block_comment"),
+        "rbrace": ("error", Exception, "Error: Unmatched closing brace at line {line} column {column}", "char", 1),
+        "blank": ("skip",),
+        "newline": ("newline", START),
+        OTHER: ("error", Exception, "Error: Invalid character at line {line} column {column}.", "char", 0),
+        EOF: ("stop",),
+    },
+    "identifier": {
+        f"{LETTERS} {DIGITS}": ("shift", "identifier"),
+        OTHER: ("emit", TokenType.VARIABLE),
+        EOF: ("emit", TokenType.VARIABLE),
+    },
+    "zero": {
+        "zero octal": ("shift", "octal"),
+        "x": ("shift", "hex_prefix"),
+        "dot": ("shift", "float"),
+        NUMBER_DELIMITERS: ("emit", TokenType.OCTAL),
+        OTHER: ("error", InvalidNumberError, "Error: Invalid digit at line {line} column {column}.", "char", 1),
+        EOF: ("emit", TokenType.OCTAL),
+    },
+    "octal": {
+        "zero octal": ("shift", "octal"),
+        "dot": ("shift", "float"),
+        NUMBER_DELIMITERS: ("emit", TokenType.OCTAL),
+        OTHER: ("error", InvalidNumberError, "Error: Invalid octal digit at line {line} column {column}.", "char", 1),
+        EOF: ("emit", TokenType.OCTAL),
+    },
+    "hex_prefix": {
+        HEX_DIGITS: ("shift", "hexadecimal"),
+        NUMBER_DELIMITERS: ("error", InvalidNumberError, "Error: Incomplete hexadecimal number at line {line} column {column}.", "token", 0),
+        OTHER: ("error", InvalidNumberError, "Error: Invalid hexadecimal digit at line {line} column {column}.", "char", 1),
+        EOF: ("stop",),
+    },
+    "hexadecimal": {
+        HEX_DIGITS: ("shift", "hexadecimal"),
+        NUMBER_DELIMITERS: ("emit", TokenType.HEXADECIMAL),
+        OTHER: ("error", InvalidNumberError, "Error: Invalid hexadecimal digit at line {line} column {column}.", "char", 1),
+        EOF: ("emit", TokenType.HEXADECIMAL),
+    },
+    "decimal": {
+        DIGITS: ("shift", "decimal"),
+        "dot": ("shift", "float"),
+        NUMBER_DELIMITERS: ("emit", TokenType.DECIMAL),
+        OTHER: ("error", InvalidNumberError, "Error: Invalid digit at line {line} column {column}.", "char", 1),
+        EOF: ("emit", TokenType.DECIMAL),
+    },
+    "float": {
+        DIGITS: ("shift", "float"),
+        NUMBER_DELIMITERS: ("emit", TokenType.FLOAT),
+        OTHER: ("error", InvalidNumberError, "Error: Invalid float number at line {line} column {column}.", "char", 1),
+        EOF: ("emit", TokenType.FLOAT),
+    },
+    "string": {
+        "backslash": ("shift", "string_escape"),
+        "quote": ("emit_with", TokenType.STRING),
+        "newline": ("error", StringError, "Invalid string at: {line}, {column}", "char", 1),
+        OTHER: ("shift", "string"),
+        EOF: ("error", StringError, "Invalid string at: {line}, {column}", "char", 1),
+    },
+    "string_escape": {
+        "quote": ("emit_with", TokenType.STRING),
+        "newline": ("error", StringError, "Invalid string at: {line}, {column}", "char", 2),
+        OTHER: ("shift", "string"),
+        EOF: ("stop",),
+    },
+    "equal": {
+        "equal": ("emit_with", TokenType.OPERATOR_EQUAL),
+        OTHER: ("emit", TokenType.OPERATOR_EQUAL),
+        EOF: ("emit", TokenType.OPERATOR_EQUAL),
+    },
+    "less": {
+        "greater": ("emit_with", TokenType.OPERATOR_NOT_EQUAL),
+        "equal": ("emit_with", TokenType.OPERATOR_LESS_EQUAL),
+        OTHER: ("emit", TokenType.OPERATOR_LESS),
+        EOF: ("emit", TokenType.OPERATOR_LESS),
+    },
+    "greater": {
+        "equal": ("emit_with", TokenType.OPERATOR_GREATER_EQUAL),
+        OTHER: ("emit", TokenType.OPERATOR_GREATER),
+        EOF: ("emit", TokenType.OPERATOR_GREATER),
+    },
+    "colon": {
+        "equal": ("emit_with", TokenType.OPERATOR_ASSIGN),
+        OTHER: ("emit", TokenType.COLON),
+        EOF: ("emit", TokenType.COLON),
+    },
+    "slash": {
+        "slash": ("shift", "line_comment"),
+        OTHER: ("emit", TokenType.OPERATOR_DIVIDE),
+        EOF: ("emit", TokenType.OPERATOR_DIVIDE),
+    },
+    "line_comment": {
+        "newline": ("newline", START),
+        OTHER: ("shift", "line_comment"),
+        EOF: ("stop",),
+    },
+    "block_comment": {
+        "rbrace": ("close_comment",),
+        "newline": ("newline", "block_comment"),
+        OTHER: ("shift", "block_comment"),
+        EOF: ("error", Exception, "Error: Unclosed block comment starting at line {line} column {column}.", "char", 0),
+    },
+}
+
+# Estados cujo texto nunca faz parte de um token (comentários). Ao ler o
+# fonte em pedaços, o Scanner descarta o que foi consumido nesses estados.
+IGNORED_STATES = ("line_comment", "block_comment")
@@ -0,0 +1,87 @@
+from array import array
+from typing import Iterator
+
+from lib.lexical.token import Token
+from lib.lexical.token_type import TokenType
+from lib.lexical.scanner import Scanner, make_lexeme
+from lib.lexical.symbols import SymbolTable
+
+
+# TokenType indexado pelo código guardado na coluna de tipos
+TOKEN_TYPES: list[TokenType | None] = [None] * (max(t.value for t in TokenType) + 1)
+
+for _token_type in TokenType:
+    TOKEN_TYPES[_token_type.value] = _token_type
+
+
+class TokenStream:
+    """
+    Sequência de tokens guardada em colunas paralelas (array), sem um objeto
+    por token. Os lexemas são fatias do fonte, criadas apenas quando pedidas.
+    O fonte pode ser str ou bytes/mmap (offsets em bytes). Identificadores
+    guardam o id do seu Symbol (-1 nos demais tokens).
+    """
+
+    def __init__(self, text, symbols: SymbolTable | None = None):
+        self.text = text
+        self.symbols = symbols if symbols is not None else SymbolTable()
+        self.symbol_ids = array("i")
+        self.types = array("B")
+        self.offsets = array("Q")
+        self.lengths = array("I")
+        self.lines = array("I")
+        self.columns = array("I")
+
+    @classmethod
+    def from_text(cls, text, symbols: SymbolTable | None = None) -> "TokenStream":
+        stream = cls(text, symbols)
+        stream.scan(text)
+        return stream
+
+    def scan(self, text, offset: int = 0, first_line: int = 0):
+        """Acrescenta os tokens de text, trecho do fonte que começa em offset e na linha first_line"""
+        append_type = self.types.append
+        append_offset = self.offsets.append
+        append_length = self.lengths.append
+        append_line = self.lines.append
+        append_column = self.columns.append
+        append_symbol = self.symbol_ids.append
+
+        for token_type, _, start, end, line, column, symbol in Scanner(text, symbols=self.symbols, first_line=first_line).spans():
+            append_symbol(-1 if symbol is None else symbol.id)
+            append_type(token_type.value)
+            append_offset(start + offset)
+            append_length(end - start)
+            append_line(line)
+            append_column(column)
+
+    def __len__(self) -> int:
+        return len(self.types)
+
+    def token_type(self, index: int) -> TokenType:
+        return TOKEN_TYPES[self.types[index]]
+
+    def lexeme(self, index: int) -> str:
+        symbol_id = self.symbol_ids[index]
+
+        if symbol_id >= 0:
+            return self.symbols.names[symbol_id]
+
+        start = self.offsets[index]
+        raw = self.text[start:start + self.lengths[index]]
+
+        if not isinstance(raw, str):
+            raw = str(raw, "utf-8")
+
+        return make_lexeme(TOKEN_TYPES[self.types[index]], raw)
+
+    def __getitem__(self, index: int) -> Token:
+        """Materializa o token da posição index"""
+        if index < 0:
+            index += len(self.types)
+
+        return Token(self.token_type(index), self.lexeme(index), self.lines[index], self.columns[index])
+
+    def __iter__(self) -> Iterator[Token]:
+        for index in range(len(self.types)):
+            yield self[index]
@@ -1,6 +1,10 @@
 from enum import Enum, auto
 
 class TokenType(Enum):
+    # Hash por identidade, em C: o Enum.__hash__ padrão é uma função Python
+    # chamada em toda consulta a dicionários e conjuntos indexados por tipo
+    __hash__ = object.__hash__
+
     VARIABLE = auto()
     RESERVED_WORD_PROGRAM = auto()
     RESERVED_WORD_BEGIN = auto()
@@ -0,0 +1,240 @@
+from lib.optimizer.ir import label_fields
+
+
+class BasicBlock:
+    """Instruções instructions[start:end]: só a primeira recebe saltos e só a última salta"""
+
+    __slots__ = ("index", "start", "end", "successors", "predecessors")
+
+    def __init__(self, index: int, start: int, end: int):
+        self.index = index
+        self.start = start
+        self.end = end
+        self.successors: list[BasicBlock] = []
+        self.predecessors: list[BasicBlock] = []
+
+    def __repr__(self):
+        return f"BasicBlock({self.index}, {self.start}, {self.end})"
+
+
+def label_positions(instructions: list[tuple]) -> dict:
+    """Posição de cada label; com labels repetidos vale o último, como no Interpreter"""
+    return {instruction[1]: i for i, instruction in enumerate(instructions) if instruction[0] == 'LABEL'}
+
+
+def build_blocks(instructions: list[tuple]) -> list[BasicBlock]:
+    """
+    Divide as instruções em blocos básicos, na ordem do código, e liga cada
+    bloco aos que podem executar depois dele. Saltos para labels que não
+    existem não têm sucessor (o Interpreter para com erro).
+    """
+    count = len(instructions)
+    labels = label_positions(instructions)
+
+    # Líderes: a primeira instrução, os labels e as instruções depois de saltos
+    leader = [False] * (count + 1)
+    leader[0] = True
+
+    for i, instruction in enumerate(instructions):
+        if instruction[0] == 'LABEL':
+            leader[i] = True
+        elif label_fields(instruction):
+            leader[i + 1] = True
+
+    blocks = []
+    block_at = [None] * count
+    start = 0
+
+    for i in range(1, count + 1):
+        if i == count or leader[i]:
+            block = BasicBlock(len(blocks), start, i)
+            blocks.append(block)
+            block_at[start] = block
+            start = i
+
+    for block in blocks:
+        last = instructions[block.end - 1]
+
+        targets = [labels.get(last[field]) for field in label_fields(last)]
+
+        # Só o JUMP e o IF não seguem para a próxima instrução
+        if last[0] != 'JUMP' and last[0] != 'IF':
+            targets.append(block.end if block.end < count else None)
+
+        for target in targets:
+            if target is not None and block_at[target] not in block.successors:
+                successor = block_at[target]
+                block.successors.append(successor)
+                successor.predecessors.append(block)
+
+    return blocks
+
+
+class Loop:
+    """Laço natural: o cabeçalho domina todos os blocos, e os latches saltam de volta para ele"""
+
+    __slots__ = ("header", "latches", "blocks")
+
+    def __init__(self, header: BasicBlock):
+        self.header = header
+        self.latches: list[BasicBlock] = []
+        self.blocks: set[int] = {header.index}  # Índices dos blocos do laço
+
+    def __repr__(self):
+        return f"Loop({self.header.index}, {sorted(self.blocks)})"
+
+
+def reverse_postorder(blocks: list[BasicBlock]) -> list[BasicBlock]:
+    """
+    Blocos alcançáveis a partir do primeiro, em pós-ordem reversa (sem
+    recursão). Os sucessores são visitados do último para o primeiro no
+    código, para que o corpo de um laço venha logo depois do cabeçalho, e
+    não depois de todo o código que segue o laço.
+    """
+    if not blocks:
+        return []
+
+    def later_first(block):
+        return iter(sorted(block.successors, key=lambda successor: successor.index, reverse=True))
+
+    visited = [False] * len(blocks)
+    visited[0] = True
+    order = []
+    stack = [(blocks[0], later_first(blocks[0]))]
+
+    while stack:
+        block, successors = stack[-1]
+
+        for successor in successors:
+            if not visited[successor.index]:
+                visited[successor.index] = True
+                stack.append((successor, later_first(successor)))
+                break
+        else:
+            stack.pop()
+            order.append(block)
+
+    order.reverse()
+    return order
+
+
+def immediate_dominators(blocks: list[BasicBlock]) -> list[BasicBlock | None]:
+    """
+    Dominador imediato de cada bloco, pelo algoritmo de Cooper, Harvey e
+    Kennedy sobre a pós-ordem reversa. O primeiro bloco é o seu próprio
+    dominador, e os blocos que não são alcançados ficam com None.
+    """
+    order = reverse_postorder(blocks)
+    position = [None] * len(blocks)
+
+    for i, block in enumerate(order):
+        position[block.index] = i
+
+    idom: list[BasicBlock | None] = [None] * len(blocks)
+
+    if not order:
+        return idom
+
+    idom[0] = blocks[0]
+
+    def intersect(a: BasicBlock, b: BasicBlock) -> BasicBlock:
+        while a is not b:
+            while position[a.index] > position[b.index]:
+                a = idom[a.index]
+            while position[b.index] > position[a.index]:
+                b = idom[b.index]
+        return a
+
+    changed = True
+
+    while changed:
+        changed = False
+
+        for block in order[1:]:
+            new_idom = None
+
+            for predecessor in block.predecessors:
+                if idom[predecessor.index] is not None:
+                    new_idom = predecessor if new_idom is None else intersect(predecessor, new_idom)
+
+            if idom[block.index] is not new_idom:
+                idom[block.index] = new_idom
+                changed = True
+
+    return idom
+
+
+class Dominators:
+    """Árvore de dominadores; a numeração em pré e pós-ordem responde dominates em tempo constante"""
+
+    __slots__ = ("idom", "pre", "post")
+
+    def __init__(self, blocks: list[BasicBlock]):
+        self.idom = immediate_dominators(blocks)
+        self.pre: list[int | None] = [None] * len(blocks)
+        self.post: list[int | None] = [None] * len(blocks)
+
+        if not blocks:
+            return
+
+        children: list[list[BasicBlock]] = [[] for _ in blocks]
+
+        for block in blocks[1:]:
+            parent = self.idom[block.index]
+            if parent is not None:
+                children[parent.index].append(block)
+
+        counter = 0
+        self.pre[0] = counter
+        stack = [(blocks[0], iter(children[0]))]
+
+        while stack:
+            block, pending = stack[-1]
+            child = next(pending, None)
+            counter += 1
+
+            if child is None:
+                stack.pop()
+                self.post[block.index] = counter
+            else:
+                self.pre[child.index] = counter
+                stack.append((child, iter(children[child.index])))
+
+    def dominates(self, a: BasicBlock, b: BasicBlock) -> bool:
+        """Se a domina b (todo caminho do início até b passa por a)"""
+        if self.pre[a.index] is None or self.pre[b.index] is None:
+            return False
+
+        return self.pre[a.index] <= self.pre[b.index] and self.post[b.index] <= self.post[a.index]
+
+
+def natural_loops(blocks: list[BasicBlock], dominators: Dominators) -> list[Loop]:
+    """
+    Laços naturais, um por cabeçalho, na ordem do código. Cada aresta de
+    volta (de um bloco para um que o domina) acrescenta ao laço do seu
+    destino os blocos que chegam à origem sem passar pelo cabeçalho.
+    """
+    loops: dict[int, Loop] = {}
+    idom = dominators.idom
+
+    for block in blocks:
+        for successor in block.successors:
+            if not dominators.dominates(successor, block):
+                continue
+
+            loop = loops.get(successor.index)
+            if loop is None:
+                loop = loops[successor.index] = Loop(successor)
+
+            loop.latches.append(block)
+            stack = [block]
+
+            while stack:
+                member = stack.pop()
+
+                # Blocos que não são alcançados não fazem parte de laços
+                if member.index not in loop.blocks and idom[member.index] is not None:
+                    loop.blocks.add(member.index)
+                    stack.extend(member.predecessors)
+
+    return [loops[index] for index in sorted(loops)]
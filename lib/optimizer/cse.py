@@ -0,0 +1,204 @@
+from collections import defaultdict
+
+from lib.interpreter.interpreter import OPERAND_COMMANDS
+from lib.optimizer.cfg import Dominators, build_blocks, reverse_postorder
+from lib.optimizer.dataflow import solve
+from lib.optimizer.ir import written_field, read_fields, is_temp, is_variable
+from lib.optimizer.peephole import stores_once
+
+
+# Dão o mesmo resultado (ou a mesma exceção) com os operandos trocados; ADD não, por causa das strings
+COMMUTATIVE = {'MULT', 'EQ', 'NEQ', 'AND', 'OR'}
+
+
+def expression(instruction: tuple) -> tuple | None:
+    """
+    Conta calculada pela instrução, com os operandos em ordem fixa nas
+    comutativas, ou None se ela só copia um valor
+    """
+    cmd = instruction[0]
+
+    if cmd not in OPERAND_COMMANDS or cmd == 'ATT':
+        return None
+
+    operands = tuple(instruction[field] for field in read_fields(instruction))
+
+    if cmd in COMMUTATIVE:
+        operands = tuple(sorted(operands))
+
+    return (cmd, *operands)
+
+
+def fact(instruction: tuple) -> tuple | None:
+    """
+    (conta, destino) quando o destino guarda a conta depois da instrução. As
+    contas sobre temporárias ficam de fora: cada temporária é lida num único
+    comando, e a conta não se repete em outro bloco.
+    """
+    key = expression(instruction)
+
+    if key is None or instruction[1] in key[1:] or any(is_temp(operand) for operand in key[1:]):
+        return None
+
+    return key, instruction[1]
+
+
+def mentions(fact: tuple) -> tuple:
+    """Variáveis cuja escrita invalida o fato: os operandos e o destino"""
+    key, holder = fact
+    return (*key[1:], holder)
+
+
+def available_facts(instructions: list[tuple], blocks: list) -> list[frozenset]:
+    """
+    Fatos (conta, destino) que valem no início de cada bloco: a conta foi
+    calculada no destino em todos os caminhos até ali, e nem ele nem os
+    operandos foram escritos depois (por ATT, por outra conta ou por read)
+    """
+    found_at = [fact(instruction) for instruction in instructions]
+    every = frozenset(found for found in found_at if found is not None)
+
+    def transfer(block, value):
+        generated = {}
+        by_name = defaultdict(set)
+        written = set()
+
+        for i in range(block.start, block.end):
+            instruction = instructions[i]
+            field = written_field(instruction)
+            if field is None:
+                continue
+
+            target = instruction[field]
+            written.add(target)
+
+            for killed in by_name.pop(target, ()):
+                generated.pop(killed, None)
+
+            found = found_at[i]
+            if found is not None:
+                generated[found] = True
+                for name in mentions(found):
+                    by_name[name].add(found)
+
+        kept = [(key, holder) for key, holder in value if holder not in written and written.isdisjoint(key[1:])]
+        return frozenset(kept).union(generated)
+
+    before, _ = solve(blocks, transfer, meet=lambda values: frozenset.intersection(*values), initial=every)
+    return before
+
+
+def eliminate_subexpressions(instructions: list[tuple]) -> list[tuple]:
+    """
+    Numeração de valores: uma conta já calculada, cujos operandos não foram
+    escritos desde então, não é refeita. Dentro de cada bloco básico as contas
+    são lembradas na ordem do código, e entre blocos valem as que estão
+    disponíveis em todos os caminhos (available_facts), como a mesma
+    comparação em dois ifs seguidos; as contas sobre temporárias que não
+    mudam valem em todos os blocos dominados pelo que as calculou. Uma temporária recalculada some e suas
+    leituras passam para a temporária que já tem o valor; nos demais
+    destinos, a conta vira uma cópia quando isso não converte o valor de novo
+    (stores_once). Qualquer escrita, inclusive por read, invalida as contas
+    que leem a variável ou estão guardadas nela. Roda depois do peephole:
+    antes dele, uma temporária lida duas vezes deixaria de ser fundida com o
+    ATT ou o IF seguinte, e a conta reaproveitada custaria mais instruções.
+    """
+    blocks = build_blocks(instructions)
+    dominators = Dominators(blocks)
+    facts = available_facts(instructions, blocks)
+
+    writes = defaultdict(int)
+    for instruction in instructions:
+        field = written_field(instruction)
+        if field is not None:
+            writes[instruction[field]] += 1
+
+    def stable(operand):
+        """Temporária escrita uma única vez: depois da escrita, guarda o valor até o fim"""
+        return is_temp(operand) and writes[operand] == 1
+
+    def fixed(key, holder):
+        """Se a conta guardada em holder nunca é invalidada"""
+        return stable(holder) and all(not is_variable(operand) or stable(operand) for operand in key[1:])
+
+    rename = {}
+    lasting = {}  # Conta que nunca é invalidada -> (temporária que a guarda, bloco da escrita)
+    replaced = {}  # Posição -> instrução nova, ou None se ela some
+
+    def renamed(instruction):
+        fields = [field for field in read_fields(instruction) if instruction[field] in rename]
+        if not fields:
+            return instruction
+
+        instruction = list(instruction)
+        for field in fields:
+            instruction[field] = rename[instruction[field]]
+        return tuple(instruction)
+
+    for block in reverse_postorder(blocks):
+        values = {}
+        by_name = defaultdict(set)
+
+        def remember(key, holder):
+            values[key] = holder
+            for name in (*key[1:], holder):
+                by_name[name].add(key)
+
+        # Só importam as contas que o bloco calcula; entre vários destinos
+        # para a mesma conta, prefere os que não mudam
+        computed = {expression(instruction) for instruction in instructions[block.start:block.end]}
+        entering = [(key, holder) for key, holder in facts[block.index] if key in computed]
+
+        for key, holder in sorted(entering, key=lambda found: (not stable(found[1]), found[1])):
+            if key not in values:
+                remember(key, rename.get(holder, holder))
+
+        for i in range(block.start, block.end):
+            instruction = renamed(instructions[i])
+            field = written_field(instruction)
+            key = expression(instruction)
+
+            if key is not None:
+                target = instruction[1]
+                holder = values.get(key)
+
+                if holder is None and key in lasting:
+                    holder, index = lasting[key]
+                    if not dominators.dominates(blocks[index], block):
+                        holder = None
+
+                if holder is not None and holder != target:
+                    if stable(target) and stable(holder):
+                        rename[target] = holder
+                        replaced[i] = None
+                        continue
+
+                    if stores_once(instruction):
+                        instruction = ('ATT', target, holder, None)
+
+            if instruction is not instructions[i]:
+                replaced[i] = instruction
+
+            if field is None:
+                continue
+
+            target = instruction[field]
+
+            for killed in by_name.pop(target, ()):
+                if values.get(killed) is not None and (values[killed] == target or target in killed[1:]):
+                    del values[killed]
+
+            if key is not None and target not in key[1:] and key not in values:
+                remember(key, target)
+                if fixed(key, target) and key not in lasting:
+                    lasting[key] = (target, block.index)
+
+    result = []
+
+    for i, instruction in enumerate(instructions):
+        instruction = replaced.get(i, instruction)
+
+        if instruction is not None:
+            result.append(renamed(instruction))
+
+    return result
@@ -0,0 +1,132 @@
+import heapq
+from typing import Callable
+
+from lib.optimizer.cfg import BasicBlock, reverse_postorder
+from lib.optimizer.ir import written_field, read_fields, is_variable
+
+
+def union(values: list) -> frozenset:
+    """Meet dos problemas em que basta um caminho (vivacidade, definições que chegam)"""
+    return frozenset().union(*values)
+
+
+def gen_kill(gen: list, kill: list) -> Callable:
+    """Função de transferência gen | (valor - kill), com os conjuntos de cada bloco"""
+    return lambda block, value: gen[block.index] | (value - kill[block.index])
+
+
+def solve(blocks: list[BasicBlock], transfer: Callable, forward: bool = True, meet: Callable = union,
+          boundary: frozenset = frozenset(), initial: frozenset = frozenset()) -> tuple[list, list]:
+    """
+    Resolve um problema de fluxo de dados por worklist. transfer(block, valor)
+    leva o valor de um lado do bloco ao outro, no sentido do problema; meet
+    junta os valores que chegam de vários blocos, e boundary é o valor na
+    entrada do programa (para frente) ou nas saídas (para trás). Os valores
+    começam em initial. Retorna os valores no início e no fim de cada bloco,
+    na ordem do código, qualquer que seja o sentido.
+    """
+    order = reverse_postorder(blocks)
+    reached = {block.index for block in order}
+    order += [block for block in blocks if block.index not in reached]
+
+    if not forward:
+        order.reverse()
+
+    before = [initial] * len(blocks)
+    after = [initial] * len(blocks)
+    # Para trás, o valor calculado fica no início e o que chega, no fim
+    inputs, outputs = (before, after) if forward else (after, before)
+
+    # A worklist sai na ordem do sentido do problema: cada laço se estabiliza
+    # antes que os blocos depois dele sejam recalculados
+    position = [0] * len(blocks)
+    for i, block in enumerate(order):
+        position[block.index] = i
+
+    worklist = list(range(len(order)))
+    pending = [True] * len(blocks)
+
+    while worklist:
+        block = order[heapq.heappop(worklist)]
+        pending[block.index] = False
+
+        sources = block.predecessors if forward else block.successors
+        values = [outputs[source.index] for source in sources]
+
+        if (block.index == 0) if forward else not block.successors:
+            values.append(boundary)
+
+        inputs[block.index] = meet(values) if values else boundary
+        value = transfer(block, inputs[block.index])
+
+        if value != outputs[block.index]:
+            outputs[block.index] = value
+
+            for target in (block.successors if forward else block.predecessors):
+                if not pending[target.index]:
+                    pending[target.index] = True
+                    heapq.heappush(worklist, position[target.index])
+
+    return before, after
+
+
+def liveness(instructions: list[tuple], blocks: list[BasicBlock], tracked: set | None = None) -> tuple[list, list]:
+    """
+    Variáveis vivas no início e no fim de cada bloco: as que ainda podem ser
+    lidas antes de serem escritas de novo. tracked restringe a análise a
+    algumas variáveis (por exemplo, às temporárias).
+    """
+    uses = []
+    defs = []
+
+    for block in blocks:
+        used = set()
+        defined = set()
+
+        for instruction in instructions[block.start:block.end]:
+            for field in read_fields(instruction):
+                operand = instruction[field]
+                if (operand in tracked if tracked is not None else is_variable(operand)) and operand not in defined:
+                    used.add(operand)
+
+            field = written_field(instruction)
+            if field is not None and (tracked is None or instruction[field] in tracked):
+                defined.add(instruction[field])
+
+        uses.append(frozenset(used))
+        defs.append(frozenset(defined))
+
+    return solve(blocks, gen_kill(uses, defs), forward=False)
+
+
+def reaching_definitions(instructions: list[tuple], blocks: list[BasicBlock], tracked: set | None = None) -> tuple[list, list]:
+    """
+    Definições que chegam ao início e ao fim de cada bloco, como posições
+    das instruções que escrevem variáveis: as escritas que ainda não foram
+    substituídas por outra escrita da mesma variável em algum caminho.
+    tracked restringe a análise a algumas variáveis; as temporárias, escritas
+    uma vez e nunca substituídas, chegam a todo o resto do programa.
+    """
+    variable_at = {}
+    gen = []
+    defined = []
+
+    for block in blocks:
+        last = {}
+
+        for i in range(block.start, block.end):
+            field = written_field(instructions[i])
+            if field is not None and (tracked is None or instructions[i][field] in tracked):
+                variable_at[i] = instructions[i][field]
+                last[instructions[i][field]] = i
+
+        gen.append(frozenset(last.values()))
+        defined.append(frozenset(last))
+
+    # Uma escrita no bloco mata as outras definições da mesma variável; sem
+    # montar esses conjuntos, que cresceriam com o número de definições
+    def transfer(block, value):
+        written_here = defined[block.index]
+        return gen[block.index] | frozenset(i for i in value if variable_at[i] not in written_here)
+
+    return solve(blocks, transfer)
@@ -0,0 +1,108 @@
+from collections import defaultdict
+
+from lib.interpreter.interpreter import OPERAND_COMMANDS
+from lib.optimizer.ir import written_field, read_fields
+from lib.optimizer.licm import cannot_raise, integer_constant, integer_result
+from lib.optimizer.ssa import SSAForm
+
+
+def integer_versions(form: SSAForm) -> set:
+    """
+    Versões que guardam com certeza um int: as escritas por contas de
+    resultado int sobre ints e as phis de ints. Começa supondo que todas
+    guardam e tira as que dependem de um read, de um real ou string, de uma
+    variável lida antes de ser escrita ou de uma versão já tirada; assim os
+    laços, em que a phi lê a própria versão escrita na volta, continuam int.
+    """
+    definitions = {}
+    users = defaultdict(list)
+
+    for block in form.blocks:
+        for target, arguments in form.phis[block.index].items():
+            definitions[target] = arguments
+            for argument in arguments.values():
+                users[argument].append(target)
+
+        for instruction in form.code[block.index]:
+            field = written_field(instruction)
+            if field is not None:
+                definitions[instruction[field]] = instruction
+                for read_field in read_fields(instruction):
+                    users[instruction[read_field]].append(instruction[field])
+
+    integers = set(definitions)
+
+    def is_int(operand):
+        return integer_constant(operand) or operand in integers
+
+    def holds(version):
+        definition = definitions[version]
+
+        if isinstance(definition, dict):
+            return all(is_int(argument) for argument in definition.values())
+
+        return definition[0] in OPERAND_COMMANDS and integer_result(definition, is_int)
+
+    pending = list(definitions)
+
+    while pending:
+        version = pending.pop()
+
+        if version in integers and not holds(version):
+            integers.discard(version)
+            pending.extend(users[version])
+
+    return integers
+
+
+def eliminate_dead_stores(form: SSAForm) -> SSAForm:
+    """
+    Retira as escritas de versões cujo valor nunca chega a uma instrução que
+    precisa ficar (saltos, escritas, read e contas que podem levantar
+    exceção): as atribuições iniciais sobrescritas antes de qualquer
+    leitura, as temporárias cujas leituras viraram literais, as phis sem uso
+    e os ciclos de versões que só leem umas às outras em laços. Só saem as
+    instruções que não podem levantar exceção, pelo que integer_versions
+    sabe dos operandos.
+    """
+    integers = integer_versions(form)
+    origin = form.origin
+
+    def is_int(operand):
+        return integer_constant(operand) or operand in integers
+
+    # Versão -> operandos lidos pela instrução ou phi que pode sair
+    removable = {}
+    needed = []
+
+    for block in form.blocks:
+        for target, arguments in form.phis[block.index].items():
+            removable[target] = list(arguments.values())
+
+        for instruction in form.code[block.index]:
+            operands = [instruction[field] for field in read_fields(instruction)]
+
+            if instruction[0] in OPERAND_COMMANDS and cannot_raise(instruction, is_int):
+                removable[instruction[1]] = operands
+            else:
+                needed.extend(operands)
+
+    live = set()
+
+    while needed:
+        operand = needed.pop()
+
+        if operand in origin and operand not in live:
+            live.add(operand)
+            needed.extend(removable.get(operand, ()))
+
+    for block in form.blocks:
+        form.phis[block.index] = {
+            target: arguments for target, arguments in form.phis[block.index].items() if target in live
+        }
+        form.code[block.index] = [
+            instruction for instruction in form.code[block.index]
+            if instruction[1] in live or not (instruction[0] in OPERAND_COMMANDS and instruction[1] in removable)
+        ]
+
+    return form
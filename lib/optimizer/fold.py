@@ -0,0 +1,124 @@
+import operator
+
+from lib.syntatic.operands import Constant, constant_for
+from lib.interpreter.interpreter import stored
+from lib.optimizer.cfg import build_blocks
+from lib.optimizer.ir import written_field, read_fields, is_temp
+
+
+# Operações das instruções sobre os valores já lidos, como o Interpreter as
+# executa; divisões por zero e tipos que não combinam levantam exceções
+OPERATIONS = {
+    'ATT': lambda op1, op2: op1,
+    'ADD': operator.add,
+    'SUB': operator.sub,
+    'MULT': operator.mul,
+    'IDIV': operator.floordiv,
+    'DIV': operator.truediv,
+    'MOD': operator.mod,
+    'EQ': lambda op1, op2: 1 if op1 == op2 else 0,
+    'NEQ': lambda op1, op2: 1 if op1 != op2 else 0,
+    'LEQ': lambda op1, op2: 1 if op1 <= op2 else 0,
+    'GEQ': lambda op1, op2: 1 if op1 >= op2 else 0,
+    'GRET': lambda op1, op2: 1 if op1 > op2 else 0,
+    'LESS': lambda op1, op2: 1 if op1 < op2 else 0,
+    'OR': lambda op1, op2: 1 if (op1 or op2) else 0,
+    'AND': lambda op1, op2: 1 if (op1 and op2) else 0,
+    'NOT': lambda op1, op2: 1 if not op1 else 0,
+}
+
+# Resultados inteiros maiores que isso (em bits) não são calculados na compilação
+MAX_BITS = 4096
+
+
+def evaluate(cmd: str, operands: list[Constant]) -> Constant | None:
+    """
+    Literal com o valor que a variável escrita pela instrução passa a ter,
+    ou None se a operação levanta uma exceção em execução (que então fica
+    para o Interpreter) ou se o resultado não tem um literal.
+    """
+    values = [operand.value for operand in operands]
+
+    if len(values) == 1:
+        values.append(None)
+
+    try:
+        result = OPERATIONS[cmd](*values)
+    except Exception:
+        return None
+
+    if type(result) is int and result.bit_length() > MAX_BITS:
+        return None
+
+    return constant_for(stored(result))
+
+
+def fold_constants(instructions: list[tuple]) -> list[tuple]:
+    """
+    Calcula na compilação as instruções cujos operandos são literais ou
+    variáveis de valor conhecido. Os valores são propagados dentro de cada
+    bloco básico: valem desde a atribuição até a variável ser escrita de novo
+    ou o bloco terminar. Um IF de condição conhecida vira JUMP, e as
+    instruções calculadas que escreviam temporárias que ninguém mais lê são
+    retiradas. Os valores são os do Interpreter, inclusive as conversões de
+    int/real/string ao guardar um valor numa variável.
+    """
+    result = list(instructions)
+    folded = []
+
+    for block in build_blocks(instructions):
+        # Literal com o valor atual de cada variável conhecida
+        known = {}
+
+        for i in range(block.start, block.end):
+            instruction = instructions[i]
+            cmd = instruction[0]
+            fields = read_fields(instruction)
+            operands = [instruction[field] for field in fields]
+            constants = [operand if isinstance(operand, Constant) else known.get(operand) for operand in operands]
+            target_field = written_field(instruction)
+            target = None if target_field is None else instruction[target_field]
+
+            if cmd in OPERATIONS and None not in constants:
+                constant = evaluate(cmd, constants)
+
+                if constant is not None:
+                    known[target] = constant
+                    folded.append(i)
+
+                    # Uma atribuição do literal guarda o mesmo valor quando
+                    # a conversão ao guardar não o altera; um ATT de literal
+                    # já é essa atribuição
+                    if (cmd != 'ATT' or constants != operands) and repr(stored(constant.value)) == repr(constant.value):
+                        result[i] = ('ATT', target, constant, None)
+
+                    continue
+
+            if cmd == 'IF' and constants[0] is not None:
+                result[i] = ('JUMP', instruction[2] if constants[0].value else instruction[3], None, None)
+                continue
+
+            # Leituras de temporárias conhecidas usam o literal, para que a
+            # instrução que escreve a temporária possa ser retirada
+            if any(is_temp(operand) and constant is not None for operand, constant in zip(operands, constants)):
+                changed = list(instruction)
+
+                for field, operand, constant in zip(fields, operands, constants):
+                    if is_temp(operand) and constant is not None:
+                        changed[field] = constant
+
+                result[i] = tuple(changed)
+
+            if target is not None:
+                known.pop(target, None)
+
+    # Temporárias ainda lidas em algum lugar
+    read_temps = {
+        instruction[field]
+        for instruction in result
+        for field in read_fields(instruction)
+        if is_temp(instruction[field])
+    }
+    dead = {i for i in folded if is_temp(result[i][1]) and result[i][1] not in read_temps}
+
+    return [instruction for i, instruction in enumerate(result) if i not in dead]
@@ -0,0 +1,543 @@
+from collections import defaultdict
+
+from lib.syntatic.operands import constant_for
+from lib.optimizer.cfg import Dominators, build_blocks, label_positions, natural_loops
+from lib.optimizer.ir import TempFactory, written_field, read_fields, label_fields, is_temp
+from lib.optimizer.licm import has_preheader, integer_constant, integer_facts
+from lib.optimizer.peephole import label_run_end
+
+
+# Formas afins: coeficiente inteiro de cada valor na entrada do laço, do
+# termo constante (CONSTANT) e do número da volta (ITERATION, 0 na primeira)
+CONSTANT = None
+ITERATION = object()
+
+# Comandos que dão uma forma afim quando os operandos têm uma
+AFFINE_COMMANDS = {'ATT', 'ADD', 'SUB', 'MULT'}
+
+# Desvio equivalente com os operandos trocados
+MIRRORED = {'IF_LEQ': 'IF_GEQ', 'IF_GEQ': 'IF_LEQ', 'IF_LESS': 'IF_GRET', 'IF_GRET': 'IF_LESS'}
+
+
+def combine(a: dict, b: dict, factor: int = 1) -> dict:
+    """Forma afim a + factor * b"""
+    result = dict(a)
+
+    for key, coefficient in b.items():
+        value = result.get(key, 0) + factor * coefficient
+        if value:
+            result[key] = value
+        else:
+            result.pop(key, None)
+
+    return result
+
+
+def affine_form(instruction: tuple, values: dict, invariant) -> dict | None:
+    """Forma afim do valor escrito pela instrução, ou None se ela não tem uma"""
+    if instruction[0] not in AFFINE_COMMANDS:
+        return None
+
+    forms = []
+
+    for field in read_fields(instruction):
+        operand = instruction[field]
+
+        if integer_constant(operand):
+            forms.append({CONSTANT: operand.value} if operand.value else {})
+        elif operand in values:
+            forms.append(values[operand])
+        elif invariant(operand):
+            forms.append({operand: 1})
+        else:
+            return None
+
+    cmd = instruction[0]
+
+    if cmd == 'ATT':
+        return forms[0]
+    if cmd == 'ADD':
+        return combine(forms[0], forms[1])
+    if cmd == 'SUB':
+        return combine(forms[0], forms[1], -1)
+
+    # Na multiplicação, um dos lados tem que ser constante
+    for constant, other in (forms, reversed(forms)):
+        if constant.keys() <= {CONSTANT}:
+            return combine({}, other, constant.get(CONSTANT, 0))
+
+    return None
+
+
+def affine_forms(instructions: list[tuple], start: int, end: int, values: dict, invariant) -> dict:
+    """
+    Executa instructions[start:end] sobre formas afins: values tem a forma de
+    cada variável no início e fica com a do fim. Retorna a forma do valor
+    escrito em cada posição (None quando não é afim).
+    """
+    forms = {}
+
+    for i in range(start, end):
+        instruction = instructions[i]
+        field = written_field(instruction)
+
+        if field is None:
+            continue
+
+        form = affine_form(instruction, values, invariant)
+        forms[i] = form
+
+        if form is None:
+            values.pop(instruction[field], None)
+        else:
+            values[instruction[field]] = form
+
+    return forms
+
+
+def counter_step(instruction: tuple) -> int | None:
+    """Passo de um contador, na forma ('ADD', v, v, c), ('ADD', v, c, v) ou ('SUB', v, v, c) com c literal int"""
+    cmd, target, op1, op2 = instruction
+
+    if cmd == 'ADD' and op1 == target and integer_constant(op2) and op2.value:
+        return op2.value
+    if cmd == 'ADD' and op2 == target and integer_constant(op1) and op1.value:
+        return op1.value
+    if cmd == 'SUB' and op1 == target and integer_constant(op2) and op2.value:
+        return -op2.value
+
+    return None
+
+
+def trip_count(branch: tuple, steps: dict, invariant) -> tuple | None:
+    """
+    Contador, limite e comparação (com o contador à esquerda) de um teste de
+    laço que termina: o contador sobe até um limite com IF_LEQ ou IF_LESS, ou
+    desce com IF_GEQ ou IF_GRET
+    """
+    cmd, op1, op2, _ = branch
+
+    if cmd not in MIRRORED:
+        return None
+
+    if op2 in steps and op1 not in steps:
+        cmd, op1, op2 = MIRRORED[cmd], op2, op1
+
+    if op1 not in steps or not (integer_constant(op2) or invariant(op2)):
+        return None
+
+    if (steps[op1] > 0) != (cmd in ('IF_LEQ', 'IF_LESS')):
+        return None
+
+    return op1, op2, cmd
+
+
+def entry_integers(instructions: list[tuple], blocks, dominators: Dominators):
+    """Função que diz se um operando guarda com certeza um int na entrada de um bloco"""
+    known, temps = integer_facts(instructions, blocks, dominators)
+
+    def is_int(operand, block) -> bool:
+        if operand in known[block.index]:
+            return True
+        return operand in temps and dominators.dominates(blocks[temps[operand]], block)
+
+    return is_int
+
+
+def literal(value: int):
+    """Literal int da IR"""
+    return constant_for(value)
+
+
+def closed_form(instructions: list[tuple], blocks, loop, is_int, uses, new_temp) -> list[tuple] | None:
+    """
+    Código que dá o resultado de um laço puro de contagem e soma sem
+    executá-lo, ou None se o laço não é um. O laço tem que ser só o teste do
+    cabeçalho (LABEL e um desvio que compara um contador com um limite que
+    não muda) e um corpo sem saltos, escrita ou leitura, só com ATT, ADD, SUB
+    e MULT sobre ints (is_int vem de entry_integers). Cada variável escrita no corpo é um contador (soma um
+    literal uma vez por volta) ou um acumulador (soma uma forma afim dos
+    contadores, do número da volta e de valores que não mudam). uses vem de
+    operand_uses.
+    """
+    reads, targets, positions = uses
+    header = loop.header
+
+    if len(loop.blocks) != 2 or header.end - header.start != 2 or header.index + 1 not in loop.blocks:
+        return None
+
+    label, branch = instructions[header.start:header.end]
+    body = blocks[header.index + 1]
+
+    if label[0] != 'LABEL' or instructions[body.end - 1] != ('JUMP', label[1], None, None):
+        return None
+
+    code = instructions[body.start:body.end - 1]
+
+    if any(instruction[0] not in AFFINE_COMMANDS for instruction in code):
+        return None
+
+    written = {instruction[1] for instruction in code}
+
+    def invariant(operand):
+        return operand not in written and is_int(operand, header)
+
+    variables = [target for target in dict.fromkeys(instruction[1] for instruction in code) if not is_temp(target)]
+
+    if not all(is_int(variable, header) for variable in variables):
+        return None
+
+    steps = {}
+
+    for variable in variables:
+        writes = [instruction for instruction in code if instruction[1] == variable]
+        step = counter_step(writes[0]) if len(writes) == 1 else None
+
+        if step is not None:
+            steps[variable] = step
+
+    test = trip_count(branch, steps, invariant)
+
+    if test is None:
+        return None
+
+    start = {
+        variable: {variable: 1, ITERATION: steps[variable]} if variable in steps else {variable: 1}
+        for variable in variables
+    }
+    values = dict(start)
+    forms = affine_forms(instructions, body.start, body.end - 1, values, invariant)
+
+    if any(form is None for form in forms.values()):
+        return None
+
+    # O que cada acumulador soma por volta não pode depender de acumuladores
+    increments = {}
+
+    for variable in variables:
+        if variable in steps:
+            continue
+
+        increment = combine(values[variable], start[variable], -1)
+
+        if any(key in start and key not in steps for key in increment):
+            return None
+
+        increments[variable] = increment
+
+    # As temporárias do corpo não são lidas fora dele
+    for temp in written.difference(variables):
+        if any(not body.start <= read < body.end for read in reads[temp]):
+            return None
+
+    counter, bound, cmd = test
+    step = steps[counter]
+
+    # O desvio do cabeçalho continua como guarda: daqui em diante o laço dá
+    # n >= 1 voltas, n = (limite - contador) // passo + 1, com um a menos
+    # na distância quando a comparação é estrita
+    n = new_temp()
+    result = []
+
+    # O label só fica se algum salto além do latch vai para ele
+    if targets[label[1]] > 1:
+        result.append(label)
+
+    result.append(branch)
+    result.append(('SUB', n, bound, counter) if step > 0 else ('SUB', n, counter, bound))
+
+    if cmd in ('IF_LESS', 'IF_GRET'):
+        result.append(('SUB', n, n, literal(1)))
+    if abs(step) != 1:
+        result.append(('IDIV', n, n, literal(abs(step))))
+
+    result.append(('ADD', n, n, literal(1)))
+
+    scratch = None
+    triangle = None  # n * (n - 1) // 2, a soma dos números das voltas
+
+    def add_times(target, operand, coefficient):
+        """target += coefficient * operand"""
+        nonlocal scratch
+
+        if coefficient in (1, -1):
+            result.append(('ADD' if coefficient == 1 else 'SUB', target, target, operand))
+            return
+
+        scratch = scratch or new_temp()
+        result.append(('MULT', scratch, operand, literal(coefficient)))
+        result.append(('ADD', target, target, scratch))
+
+    for variable, increment in increments.items():
+        for key, coefficient in increment.items():
+            if key is CONSTANT:
+                add_times(variable, n, coefficient)
+            elif key is ITERATION:
+                if triangle is None:
+                    triangle = new_temp()
+                    result.append(('SUB', triangle, n, literal(1)))
+                    result.append(('MULT', triangle, triangle, n))
+                    result.append(('IDIV', triangle, triangle, literal(2)))
+                add_times(variable, triangle, coefficient)
+            else:
+                scratch = scratch or new_temp()
+                result.append(('MULT', scratch, key, n))
+                add_times(variable, scratch, coefficient)
+
+    # Os contadores por último: os acumuladores usam os valores de entrada
+    for variable, step in steps.items():
+        add_times(variable, n, step)
+
+    exit_label = branch[3]
+
+    if not body.end <= positions.get(exit_label, -1) < label_run_end(instructions, body.end):
+        result.append(('JUMP', exit_label, None, None))
+
+    return result
+
+
+def operand_uses(instructions: list[tuple]) -> tuple:
+    """Posições em que cada operando é lido, quantos saltos vão para cada label e a posição de cada label"""
+    reads = defaultdict(list)
+    targets = defaultdict(int)
+
+    for i, instruction in enumerate(instructions):
+        for field in read_fields(instruction):
+            reads[instruction[field]].append(i)
+
+        for field in label_fields(instruction):
+            targets[instruction[field]] += 1
+
+    return reads, targets, label_positions(instructions)
+
+
+def evaluate_loops(instructions: list[tuple], new_temp) -> list[tuple]:
+    """Troca os laços puros de contagem e soma pelo seu resultado (closed_form)"""
+    blocks = build_blocks(instructions)
+    dominators = Dominators(blocks)
+    loops = natural_loops(blocks, dominators)
+
+    if not loops:
+        return list(instructions)
+
+    is_int = entry_integers(instructions, blocks, dominators)
+    uses = operand_uses(instructions)
+    replaced = {}
+
+    for loop in loops:
+        code = closed_form(instructions, blocks, loop, is_int, uses, new_temp)
+
+        if code is not None:
+            header = loop.header
+            replaced[header.start] = (blocks[header.index + 1].end, code)
+
+    result = []
+    i = 0
+
+    while i < len(instructions):
+        if i in replaced:
+            end, code = replaced[i]
+            result.extend(code)
+            i = end
+        else:
+            result.append(instructions[i])
+            i += 1
+
+    return result
+
+
+def affine_code(target, form: dict, new_temp) -> list[tuple]:
+    """Instruções que guardam em target o valor de uma forma afim sem o termo da volta"""
+    code = []
+    scratch = None
+
+    for key, coefficient in form.items():
+        if key is CONSTANT:
+            continue
+
+        if not code:
+            code.append(('ATT', target, key, None) if coefficient == 1 else ('MULT', target, key, literal(coefficient)))
+        elif coefficient in (1, -1):
+            code.append(('ADD' if coefficient == 1 else 'SUB', target, target, key))
+        else:
+            scratch = scratch or new_temp()
+            code.append(('MULT', scratch, key, literal(coefficient)))
+            code.append(('ADD', target, target, scratch))
+
+    constant = form.get(CONSTANT, 0)
+
+    if not code:
+        code.append(('ATT', target, literal(constant), None))
+    elif constant:
+        code.append(('ADD', target, target, literal(constant)))
+
+    return code
+
+
+def reduce_strength(instructions: list[tuple], new_temp) -> list[tuple]:
+    """
+    Redução de força das variáveis de indução derivadas. Num laço com
+    preheader, um contador é uma variável escrita uma única vez no laço, por
+    ('ADD', v, v, c), num bloco que roda uma vez por volta (domina os latches
+    e não está num laço interno). Uma temporária derivada vale uma forma afim
+    dos contadores e de ints que não mudam, calculada por uma cadeia de
+    instruções de um desses blocos; ela passa a ser mantida por uma única
+    soma por volta, começando no preheader. Só se faz isso quando instruções
+    da cadeia deixam de ser executadas.
+    """
+    blocks = build_blocks(instructions)
+    dominators = Dominators(blocks)
+    loops = natural_loops(blocks, dominators)
+
+    if not loops:
+        return list(instructions)
+
+    is_int = entry_integers(instructions, blocks, dominators)
+
+    # Laço mais interno de cada bloco
+    innermost = {}
+
+    for loop in sorted(loops, key=lambda loop: len(loop.blocks), reverse=True):
+        for index in loop.blocks:
+            innermost[index] = loop
+
+    reads = operand_uses(instructions)[0]
+    writes = defaultdict(int)
+    loop_writes = defaultdict(list)  # Cabeçalho -> posições escritas no laço
+
+    for instruction in instructions:
+        field = written_field(instruction)
+        if field is not None:
+            writes[instruction[field]] += 1
+
+    for loop in loops:
+        for index in loop.blocks:
+            for i in range(blocks[index].start, blocks[index].end):
+                if written_field(instructions[i]) is not None:
+                    loop_writes[loop.header.index].append(i)
+
+    block_of = {}
+
+    for block in blocks:
+        for i in range(block.start, block.end):
+            block_of[i] = block
+
+    preheaders = defaultdict(list)
+    replaced = {}
+    removed = set()
+
+    for loop in loops:
+        header = loop.header
+
+        if not has_preheader(loop, blocks, instructions):
+            continue
+
+        def once_per_iteration(block):
+            return innermost.get(block.index) is loop and all(dominators.dominates(block, latch) for latch in loop.latches)
+
+        written = defaultdict(list)
+
+        for i in loop_writes[header.index]:
+            written[instructions[i][written_field(instructions[i])]].append(i)
+
+        counters = {}
+
+        for variable, positions in written.items():
+            if len(positions) != 1 or is_temp(variable) or not is_int(variable, header):
+                continue
+
+            step = counter_step(instructions[positions[0]])
+
+            if step is not None and once_per_iteration(block_of[positions[0]]):
+                counters[variable] = (step, block_of[positions[0]])
+
+        if not counters:
+            continue
+
+        def invariant(operand):
+            return operand not in written and is_int(operand, header)
+
+        for index in sorted(loop.blocks):
+            block = blocks[index]
+
+            if not once_per_iteration(block):
+                continue
+
+            # Contadores já somados nesta volta quando o bloco começa
+            values = {}
+
+            for variable, (step, increment_block) in counters.items():
+                form = {variable: 1, ITERATION: step}
+                if increment_block is not block and dominators.dominates(increment_block, block):
+                    form[CONSTANT] = step
+                values[variable] = form
+
+            forms = affine_forms(instructions, block.start, block.end, values, invariant)
+
+            # Temporárias da cadeia: escritas uma vez, com forma afim, lidas só adiante no bloco
+            chain = {
+                i: instructions[i][1]
+                for i, form in forms.items()
+                if form is not None and is_temp(instructions[i][1]) and writes[instructions[i][1]] == 1
+                and all(i < read < block.end for read in reads[instructions[i][1]])
+            }
+            members = set(chain.values())
+
+            def derived(i):
+                return forms[i].get(ITERATION, 0) != 0 and any(
+                    instructions[i][field] in members for field in read_fields(instructions[i]))
+
+            # Raízes: derivadas lidas por alguma instrução fora da cadeia e calculadas a partir da cadeia
+            roots = {
+                i for i, temp in chain.items()
+                if derived(i) and any(read not in chain for read in reads[temp])
+            }
+
+            # Sai da cadeia o que só é lido por raízes ou por instruções que saíram
+            dropped = set()
+
+            for i in sorted(chain, reverse=True):
+                if i not in roots and all(read in roots or read in dropped for read in reads[chain[i]]):
+                    dropped.add(i)
+
+            if not dropped:
+                continue
+
+            for i in sorted(roots):
+                target = chain[i]
+                form = forms[i]
+                step = form[ITERATION]
+
+                # Antes da primeira volta, o valor menos um passo
+                start = combine({key: coefficient for key, coefficient in form.items() if key is not ITERATION},
+                                {CONSTANT: -step})
+                preheaders[header.start].extend(affine_code(target, start, new_temp))
+                replaced[i] = ('ADD', target, target, literal(step))
+
+            removed |= dropped
+
+    if not replaced:
+        return list(instructions)
+
+    result = []
+
+    for i, instruction in enumerate(instructions):
+        result.extend(preheaders.get(i, ()))
+
+        if i in removed:
+            continue
+
+        result.append(replaced.get(i, instruction))
+
+    return result
+
+
+def reduce_induction(instructions: list[tuple], symbol_table: dict) -> list[tuple]:
+    """
+    Otimizações com variáveis de indução: troca os laços puros de contagem
+    e soma pelo resultado, e reduz a força das derivadas dos demais laços.
+    As temporárias novas entram em symbol_table.
+    """
+    new_temp = TempFactory(instructions, symbol_table)
+    instructions = evaluate_loops(instructions, new_temp)
+    return reduce_strength(instructions, new_temp)
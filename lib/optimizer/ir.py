@@ -0,0 +1,103 @@
+from lib.lexical.symbols import Symbol
+from lib.syntatic.operands import Constant
+from lib.interpreter.interpreter import OPERAND_COMMANDS, BRANCH_COMMANDS, is_literal_text
+
+
+# Funções de CALL que escrevem a variável do campo 2
+READ_FUNCTIONS = {'read', 'readln'}
+
+
+def written_field(instruction: tuple) -> int | None:
+    """Campo com a variável escrita pela instrução, ou None"""
+    cmd = instruction[0]
+
+    if cmd in OPERAND_COMMANDS:
+        return 1
+
+    if cmd == 'CALL' and instruction[1] in READ_FUNCTIONS:
+        return 2
+
+    return None
+
+
+def read_fields(instruction: tuple) -> tuple:
+    """Campos com os operandos lidos pela instrução, variáveis ou literais"""
+    cmd = instruction[0]
+
+    if cmd in OPERAND_COMMANDS:
+        return (2,) if instruction[3] is None else (2, 3)
+
+    if cmd == 'IF':
+        return (1,)
+
+    if cmd in BRANCH_COMMANDS:
+        return (1, 2)
+
+    if cmd == 'CALL' and instruction[1] == 'write':
+        return (2,)
+
+    return ()
+
+
+def label_fields(instruction: tuple) -> tuple:
+    """Campos com os labels para onde a instrução pode saltar"""
+    cmd = instruction[0]
+
+    if cmd == 'JUMP':
+        return (1,)
+
+    if cmd == 'IF':
+        return (2, 3)
+
+    if cmd in BRANCH_COMMANDS:
+        return (3,)
+
+    return ()
+
+
+def written(instruction: tuple):
+    """Variável escrita pela instrução, ou None"""
+    field = written_field(instruction)
+    return None if field is None else instruction[field]
+
+
+def read(instruction: tuple) -> tuple:
+    """Operandos lidos pela instrução"""
+    return tuple(instruction[field] for field in read_fields(instruction))
+
+
+def is_variable(operand) -> bool:
+    """Variável ou temporária, e não literal"""
+    return operand is not None and not isinstance(operand, Constant) and not is_literal_text(operand)
+
+
+def is_temp(operand) -> bool:
+    """Temporária gerada pelo Syntatic (os Symbols nunca são subclasses)"""
+    return type(operand) is Symbol and operand.temp
+
+
+def temps_in(instructions: list[tuple]) -> set:
+    """Temporárias que aparecem nas instruções"""
+    return {operand for instruction in instructions for operand in instruction[1:] if is_temp(operand)}
+
+
+class TempFactory:
+    """
+    Temporárias novas para os passos de otimização, numeradas depois das que
+    já existem. Ficam fora da SymbolTable do Syntatic, mas entram em
+    symbol_table, de onde saem os slots do Interpreter.
+    """
+
+    def __init__(self, instructions: list[tuple], symbol_table: dict):
+        self.symbol_table = symbol_table
+        self.counter = max(
+            (int(name[5:]) for name in temps_in(instructions) | set(filter(is_temp, symbol_table))),
+            default=0,
+        )
+
+    def __call__(self, var_type: str = 'integer') -> Symbol:
+        self.counter += 1
+        symbol = Symbol(f"temp_{self.counter}", -1)
+        symbol.temp = True
+        self.symbol_table[symbol] = var_type
+        return symbol
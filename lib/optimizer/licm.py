@@ -0,0 +1,287 @@
+from collections import defaultdict
+
+from lib.syntatic.operands import Constant
+from lib.interpreter.interpreter import OPERAND_COMMANDS
+from lib.optimizer.cfg import BasicBlock, Dominators, Loop, build_blocks, natural_loops
+from lib.optimizer.dataflow import solve
+from lib.optimizer.ir import written_field, read_fields, label_fields, is_temp
+
+
+# Dão 0 ou 1 e nunca levantam exceção, quaisquer que sejam os operandos
+BOOLEAN_OPERATIONS = {'EQ', 'NEQ', 'OR', 'AND', 'NOT'}
+# Dão 0 ou 1 e só levantam exceção com operandos que não são comparáveis
+COMPARISONS = {'LEQ', 'GEQ', 'GRET', 'LESS'}
+# Sobre inteiros, dão um inteiro e nunca levantam exceção
+INTEGER_OPERATIONS = {'ADD', 'SUB', 'MULT'}
+
+
+def integer_constant(operand) -> bool:
+    """Literal com valor int"""
+    return isinstance(operand, Constant) and type(operand.value) is int
+
+
+def cannot_raise(instruction: tuple, is_int) -> bool:
+    """Se a instrução nunca levanta exceção, sabendo quais operandos são int por is_int"""
+    cmd = instruction[0]
+    operands = [instruction[field] for field in read_fields(instruction)]
+
+    if cmd == 'ATT' or cmd in BOOLEAN_OPERATIONS:
+        return True
+
+    if cmd in INTEGER_OPERATIONS or cmd in COMPARISONS:
+        return all(is_int(operand) for operand in operands)
+
+    # Divisão inteira e resto só por um literal diferente de zero
+    if cmd == 'IDIV' or cmd == 'MOD':
+        return is_int(operands[0]) and integer_constant(operands[1]) and operands[1].value != 0
+
+    return False
+
+
+def integer_result(instruction: tuple, is_int) -> bool:
+    """Se a instrução, quando não levanta exceção, guarda um int no destino"""
+    cmd = instruction[0]
+
+    if cmd in BOOLEAN_OPERATIONS or cmd in COMPARISONS:
+        return True
+
+    if cmd == 'ATT' or cmd in INTEGER_OPERATIONS or cmd == 'IDIV' or cmd == 'MOD':
+        return all(is_int(instruction[field]) for field in read_fields(instruction))
+
+    return False
+
+
+def known_integers(instructions: list[tuple], blocks: list[BasicBlock], dominators: Dominators | None = None,
+                   stable: dict | None = None) -> list[frozenset]:
+    """
+    Variáveis (não temporárias) que guardam com certeza um int no início de
+    cada bloco. As temporárias só valem dentro do bloco, menos as de stable
+    (integer_temps), nos blocos dominados pelo que as escreveu.
+    """
+    variables = frozenset(
+        instruction[field]
+        for instruction in instructions
+        if (field := written_field(instruction)) is not None and not is_temp(instruction[field])
+    )
+    stable = stable or {}
+
+    def transfer(block, value):
+        known = set(value)
+        temps = set()
+
+        def is_int(operand):
+            if integer_constant(operand) or operand in known or operand in temps:
+                return True
+            return operand in stable and dominators.dominates(blocks[stable[operand]], block)
+
+        for instruction in instructions[block.start:block.end]:
+            field = written_field(instruction)
+            if field is None:
+                continue
+
+            target = instruction[field]
+            into = temps if is_temp(target) else known
+
+            if instruction[0] in OPERAND_COMMANDS and integer_result(instruction, is_int):
+                into.add(target)
+            else:
+                into.discard(target)
+
+        return frozenset(known)
+
+    before, _ = solve(blocks, transfer, meet=lambda values: frozenset.intersection(*values), initial=variables)
+    return before
+
+
+def integer_temps(instructions: list[tuple], blocks: list[BasicBlock], dominators: Dominators,
+                  known: list[frozenset]) -> dict:
+    """
+    Temporárias escritas uma única vez, com um int, e o bloco da escrita: nos
+    blocos que ele domina, elas guardam esse int (como as tiradas dos laços)
+    """
+    writes = defaultdict(int)
+
+    for instruction in instructions:
+        field = written_field(instruction)
+        if field is not None and is_temp(instruction[field]):
+            writes[instruction[field]] += 1
+
+    result = {}
+
+    for block in blocks:
+        # Como em known_integers, dentro do bloco
+        integers = set(known[block.index])
+
+        def is_int(operand):
+            if integer_constant(operand) or operand in integers:
+                return True
+            return operand in result and dominators.dominates(blocks[result[operand]], block)
+
+        for instruction in instructions[block.start:block.end]:
+            field = written_field(instruction)
+            if field is None:
+                continue
+
+            target = instruction[field]
+
+            if instruction[0] in OPERAND_COMMANDS and integer_result(instruction, is_int):
+                integers.add(target)
+                if is_temp(target) and writes[target] == 1:
+                    result[target] = block.index
+            else:
+                integers.discard(target)
+
+    return result
+
+
+def integer_facts(instructions: list[tuple], blocks: list[BasicBlock], dominators: Dominators) -> tuple:
+    """
+    known_integers e integer_temps, uma usando a outra até não mudarem: uma
+    variável somada com uma temporária tirada do laço só é int na entrada
+    dele sabendo que a temporária é
+    """
+    temps = {}
+
+    while True:
+        known = known_integers(instructions, blocks, dominators, temps)
+        found = integer_temps(instructions, blocks, dominators, known)
+
+        if found.keys() == temps.keys():
+            return known, temps
+
+        temps = found
+
+
+def has_preheader(loop: Loop, blocks: list[BasicBlock], instructions: list[tuple]) -> bool:
+    """
+    Se o laço só é alcançado de fora seguindo do bloco anterior para o label
+    do cabeçalho, sem salto: as instruções postas antes desse label rodam uma
+    vez a cada entrada no laço, e não a cada volta.
+    """
+    header = loop.header
+    start = header.start
+
+    if start == 0 or instructions[start][0] != 'LABEL' or label_fields(instructions[start - 1]):
+        return False
+
+    outside = [predecessor for predecessor in header.predecessors if predecessor.index not in loop.blocks]
+
+    if outside != [blocks[header.index - 1]]:
+        return False
+
+    # Os demais blocos só são alcançados de dentro do laço
+    return all(
+        predecessor.index in loop.blocks
+        for index in loop.blocks if index != header.index
+        for predecessor in blocks[index].predecessors
+    )
+
+
+def hoist_invariants(instructions: list[tuple]) -> list[tuple]:
+    """
+    Tira dos laços as instruções invariantes: as que escrevem uma temporária
+    a partir de literais, de variáveis que o laço não escreve e de outras
+    temporárias já tiradas. Elas passam para o preheader (logo antes do label
+    do cabeçalho) do laço mais externo em que são invariantes. Como passam a
+    rodar mesmo quando o laço não dá nenhuma volta, só saem as que não podem
+    levantar exceção, pelo que se sabe dos tipos dos operandos na entrada do
+    laço (known_integers).
+    """
+    blocks = build_blocks(instructions)
+    loops = natural_loops(blocks, Dominators(blocks))
+
+    if not loops:
+        return list(instructions)
+
+    known = known_integers(instructions, blocks)
+
+    # Laços de cada bloco, do mais interno para o mais externo
+    loops.sort(key=lambda loop: len(loop.blocks))
+    enclosing = defaultdict(list)
+    written = {}
+    movable = {}
+
+    for loop in loops:
+        written[loop.header.index] = {
+            instruction[field]
+            for index in loop.blocks
+            for instruction in instructions[blocks[index].start:blocks[index].end]
+            if (field := written_field(instruction)) is not None
+        }
+        movable[loop.header.index] = has_preheader(loop, blocks, instructions)
+
+        for index in loop.blocks:
+            enclosing[index].append(loop)
+
+    # Temporárias escritas uma única vez e lidas só depois disso, no mesmo bloco
+    writes = defaultdict(int)
+    reads = defaultdict(list)
+
+    for i, instruction in enumerate(instructions):
+        field = written_field(instruction)
+        if field is not None and is_temp(instruction[field]):
+            writes[instruction[field]] += 1
+
+        for field in read_fields(instruction):
+            if is_temp(instruction[field]):
+                reads[instruction[field]].append(i)
+
+    hoisted = {}  # Temporária tirada -> (quantos laços ela deixou, se é int)
+    preheaders = defaultdict(list)  # Início do cabeçalho -> instruções tiradas para antes dele
+    removed = set()
+
+    for block in blocks:
+        chain = enclosing.get(block.index)
+
+        if not chain:
+            continue
+
+        for i in range(block.start, block.end):
+            instruction = instructions[i]
+            target = instruction[1]
+
+            if instruction[0] not in OPERAND_COMMANDS or not is_temp(target) or writes[target] != 1 \
+                    or not all(i < read < block.end for read in reads[target]):
+                continue
+
+            operands = [instruction[field] for field in read_fields(instruction)]
+            depth = 0
+            # Se o resultado é int, pelo que se sabe na entrada do laço mais externo deixado
+            result_int = False
+
+            for loop in chain:
+                header = loop.header.index
+
+                def invariant(operand):
+                    if isinstance(operand, Constant):
+                        return True
+                    if operand in hoisted:
+                        return hoisted[operand][0] > depth
+                    return not is_temp(operand) and operand not in written[header]
+
+                def is_int(operand):
+                    if operand in hoisted:
+                        return hoisted[operand][1]
+                    return integer_constant(operand) or operand in known[header]
+
+                if not movable[header] or not all(invariant(operand) for operand in operands) \
+                        or not cannot_raise(instruction, is_int):
+                    break
+
+                depth += 1
+                result_int = integer_result(instruction, is_int)
+
+            if depth:
+                hoisted[target] = (depth, result_int)
+                preheaders[chain[depth - 1].header.start].append(instruction)
+                removed.add(i)
+
+    result = []
+
+    for i, instruction in enumerate(instructions):
+        result.extend(preheaders.get(i, ()))
+
+        if i not in removed:
+            result.append(instruction)
+
+    return result
@@ -0,0 +1,20 @@
+from lib.optimizer.cse import eliminate_subexpressions
+from lib.optimizer.dse import eliminate_dead_stores
+from lib.optimizer.fold import fold_constants
+from lib.optimizer.induction import reduce_induction
+from lib.optimizer.licm import hoist_invariants
+from lib.optimizer.peephole import peephole
+from lib.optimizer.sccp import propagate_constants
+from lib.optimizer.ssa import from_ssa, to_ssa
+from lib.optimizer.temps import reuse_temps
+
+
+def optimize(instructions: list[tuple], symbol_table: dict) -> list[tuple]:
+    """Otimiza as instruções geradas pelo Syntatic; symbol_table é atualizada junto"""
+    instructions = fold_constants(instructions)
+    instructions = from_ssa(eliminate_dead_stores(propagate_constants(to_ssa(instructions))))
+    instructions = hoist_invariants(instructions)
+    instructions = peephole(instructions)
+    instructions = eliminate_subexpressions(instructions)
+    instructions = reduce_induction(instructions, symbol_table)
+    return reuse_temps(instructions, symbol_table)
@@ -0,0 +1,152 @@
+from collections import Counter
+
+from lib.syntatic.operands import Constant
+from lib.interpreter.interpreter import OPERAND_COMMANDS, BRANCH_COMMANDS
+from lib.optimizer.cfg import label_positions
+from lib.optimizer.ir import read_fields, label_fields, is_temp
+
+
+# Desvio condicional que substitui cada comparação seguida de IF
+BRANCHES = {branch[3:]: branch for branch in BRANCH_COMMANDS}
+
+
+def literal_of(operand, kinds: tuple) -> bool:
+    """Se o operando é um literal cujo valor é de um dos tipos em kinds"""
+    return isinstance(operand, Constant) and type(operand.value) in kinds
+
+
+def stores_once(instruction: tuple) -> bool:
+    """
+    Se escrever o resultado direto na variável dá o mesmo que escrevê-lo numa
+    temporária e copiá-la. A cópia converte o valor de novo, o que só muda
+    algo quando o resultado é um texto que to_number lê como float (como
+    "1.0e22", que vira 1e+22 e depois o texto "1e+22"); só ADD, MULT e MOD
+    sobre strings e ATT de um literal string produzem textos.
+    """
+    cmd, _, op1, op2 = instruction
+
+    if cmd == 'ATT':
+        return not literal_of(op1, (str,))
+    if cmd == 'ADD':
+        return literal_of(op1, (int, float)) or literal_of(op2, (int, float))
+    if cmd == 'MULT':
+        return not literal_of(op1, (str,)) and not literal_of(op2, (str,))
+    if cmd == 'MOD':
+        return literal_of(op1, (int, float))
+
+    return True
+
+
+def fuse(instructions: list[tuple]) -> list[tuple]:
+    """
+    Junta pares de instruções ligados por uma temporária lida uma única vez:
+    ('ADD', t, i, '1') e ('ATT', i, t) viram ('ADD', i, i, '1'), e uma
+    comparação seguida de ('IF', t, L_true, L_false) e do label L_true vira
+    um desvio condicional para L_false.
+    """
+    reads = Counter(
+        instruction[field]
+        for instruction in instructions
+        for field in read_fields(instruction)
+        if is_temp(instruction[field])
+    )
+    positions = label_positions(instructions)
+    result = []
+    count = len(instructions)
+    i = 0
+
+    while i < count:
+        instruction = instructions[i]
+        cmd = instruction[0]
+        following = instructions[i + 1] if i + 1 < count else None
+        temp = instruction[1]
+
+        if cmd in OPERAND_COMMANDS and following is not None and is_temp(temp) and reads[temp] == 1:
+            if following[0] == 'ATT' and following[2] == temp and stores_once(instruction):
+                result.append((cmd, following[1], instruction[2], instruction[3]))
+                i += 2
+                continue
+
+            # O label de L_true tem que vir logo depois do IF, para o desvio seguir adiante
+            if cmd in BRANCHES and following[0] == 'IF' and following[1] == temp \
+                    and i + 2 <= positions.get(following[2], -1) < label_run_end(instructions, i + 2):
+                result.append((BRANCHES[cmd], instruction[2], instruction[3], following[3]))
+                i += 2
+                continue
+
+        result.append(instruction)
+        i += 1
+
+    return result
+
+
+def label_run_end(instructions: list[tuple], start: int) -> int:
+    """Fim da sequência de LABELs que começa em start; saltar para um deles é seguir até lá"""
+    while start < len(instructions) and instructions[start][0] == 'LABEL':
+        start += 1
+
+    return start
+
+
+def thread_jumps(instructions: list[tuple]) -> list[tuple]:
+    """Saltos para um label seguido de um JUMP passam a ir direto ao destino desse JUMP"""
+    positions = label_positions(instructions)
+
+    def destination(label):
+        seen = {label}
+
+        while label in positions:
+            i = label_run_end(instructions, positions[label] + 1)
+
+            if i == len(instructions) or instructions[i][0] != 'JUMP' or instructions[i][1] in seen:
+                break
+
+            label = instructions[i][1]
+            seen.add(label)
+
+        return label
+
+    result = []
+
+    for instruction in instructions:
+        fields = label_fields(instruction)
+
+        if fields:
+            instruction = list(instruction)
+            for field in fields:
+                instruction[field] = destination(instruction[field])
+            instruction = tuple(instruction)
+
+        result.append(instruction)
+
+    return result
+
+
+def remove_fallthrough(instructions: list[tuple]) -> list[tuple]:
+    """Tira os JUMPs para um dos labels logo adiante e os labels para onde ninguém salta"""
+    positions = label_positions(instructions)
+    result = [
+        instruction
+        for i, instruction in enumerate(instructions)
+        if instruction[0] != 'JUMP' or not i < positions.get(instruction[1], -1) < label_run_end(instructions, i + 1)
+    ]
+    targets = {instruction[field] for instruction in result for field in label_fields(instruction)}
+
+    return [instruction for instruction in result if instruction[0] != 'LABEL' or instruction[1] in targets]
+
+
+def peephole(instructions: list[tuple]) -> list[tuple]:
+    """
+    Otimizações locais sobre sequências curtas de instruções: resultados
+    escritos direto na variável de destino, comparações e IF fundidos num
+    desvio condicional, cadeias de saltos encurtadas e saltos e labels por
+    onde a execução já passaria removidos.
+    """
+    instructions = thread_jumps(fuse(instructions))
+
+    # Tirar um JUMP pode deixar outro salto logo antes do seu label
+    while True:
+        result = remove_fallthrough(instructions)
+        if len(result) == len(instructions):
+            return result
+        instructions = result
@@ -0,0 +1,233 @@
+from collections import defaultdict
+
+from lib.syntatic.operands import Constant
+from lib.interpreter.interpreter import BRANCH_COMMANDS, stored
+from lib.optimizer.fold import OPERATIONS, evaluate
+from lib.optimizer.ir import written_field, read_fields
+from lib.optimizer.ssa import SSAForm
+
+
+# Valor de uma versão que pode mudar em execução (o literal é o valor conhecido, e a
+# ausência, uma versão ainda não alcançada)
+VARYING = object()
+
+
+def same_constant(a: Constant, b: Constant) -> bool:
+    """Se os dois literais guardam o mesmo valor, do mesmo tipo"""
+    return type(a.value) is type(b.value) and repr(a.value) == repr(b.value)
+
+
+def propagate_constants(form: SSAForm) -> SSAForm:
+    """
+    Propagação de constantes condicional esparsa (Wegman e Zadeck): as
+    versões começam sem valor e só descem para um literal ou para VARYING,
+    e um bloco só é visitado quando uma aresta executável chega nele. Um IF
+    de condição conhecida só torna executável um dos lados, então as phis
+    nos blocos de junção ignoram o lado que nunca roda, e um valor conhecido
+    atravessa laços e ifs (o que fold_constants, dentro de cada bloco, não
+    vê). No fim, as leituras de versões conhecidas viram literais, as contas
+    conhecidas viram ATTs do literal, os IFs e desvios conhecidos viram
+    JUMPs e os blocos não executáveis somem. As contas usam evaluate, com as
+    conversões do Interpreter; as que levantam exceção ficam para ele.
+    """
+    blocks = form.blocks
+    code = form.code
+    phis = form.phis
+    origin = form.origin
+
+    labels = {}
+    for block in blocks:
+        if code[block.index] and code[block.index][0][0] == 'LABEL':
+            labels[code[block.index][0][1]] = block.index
+
+    # Quem lê cada versão: (bloco, posição da instrução) ou (bloco, versão escrita pela phi)
+    users = defaultdict(list)
+    for block in blocks:
+        for target, arguments in phis[block.index].items():
+            for argument in arguments.values():
+                if argument in origin:
+                    users[argument].append((block.index, target))
+
+        for i, instruction in enumerate(code[block.index]):
+            for field in read_fields(instruction):
+                if instruction[field] in origin:
+                    users[instruction[field]].append((block.index, i))
+
+    values = {}
+    executable = set()  # Arestas (predecessor, bloco); None é a entrada do programa
+    visited = [False] * len(blocks)
+
+    def value_of(operand):
+        if isinstance(operand, Constant):
+            return operand
+        if operand in origin:
+            return values.get(operand)
+        # Variável lida antes de qualquer escrita, ou literal em texto
+        return VARYING
+
+    def lower(target, value):
+        """Desce o valor da versão; retorna se ele mudou"""
+        old = values.get(target)
+
+        if value is None or old is VARYING:
+            return False
+        if old is not None and (value is VARYING or not same_constant(old, value)):
+            value = VARYING
+        elif old is not None:
+            return False
+
+        values[target] = value
+        return True
+
+    def operation_value(instruction):
+        operands = [value_of(instruction[field]) for field in read_fields(instruction)]
+
+        if VARYING in operands:
+            return VARYING
+        if None in operands:
+            return None
+
+        constant = evaluate(instruction[0], operands)
+        return VARYING if constant is None else constant
+
+    def taken(block, instruction):
+        """Sucessores executáveis pelo que se sabe da última instrução do bloco"""
+        cmd = instruction[0]
+
+        if cmd == 'IF':
+            condition = value_of(instruction[1])
+            if condition is None:
+                return []
+            if condition is not VARYING:
+                label = instruction[2] if condition.value else instruction[3]
+                return [labels[label]] if label in labels else []
+
+        elif cmd in BRANCH_COMMANDS:
+            operands = [value_of(instruction[1]), value_of(instruction[2])]
+            if None in operands:
+                return []
+            if VARYING not in operands:
+                try:
+                    following = BRANCH_COMMANDS[cmd](operands[0].value, operands[1].value)
+                except Exception:
+                    return []
+                if following:
+                    return [block.index + 1] if block.index + 1 < len(blocks) else []
+                return [labels[instruction[3]]] if instruction[3] in labels else []
+
+        return [successor.index for successor in block.successors]
+
+    flow = [(None, 0)] if blocks else []
+    pending = []
+
+    def visit_phi(index, target):
+        arguments = phis[index][target]
+        incoming = [value_of(argument) for source, argument in arguments.items() if (source, index) in executable]
+        known = [value for value in incoming if value is not None]
+
+        if not known:
+            return
+        if any(value is VARYING or not same_constant(value, known[0]) for value in known):
+            changed = lower(target, VARYING)
+        else:
+            changed = lower(target, known[0])
+
+        if changed:
+            pending.append(target)
+
+    def visit_instruction(index, i):
+        instruction = code[index][i]
+        field = written_field(instruction)
+
+        if field is not None:
+            value = operation_value(instruction) if instruction[0] in OPERATIONS else VARYING
+            if lower(instruction[field], value):
+                pending.append(instruction[field])
+
+        if i == len(code[index]) - 1:
+            for successor in taken(blocks[index], instruction):
+                flow.append((index, successor))
+
+    while flow or pending:
+        if flow:
+            edge = flow.pop()
+            if edge in executable:
+                continue
+
+            executable.add(edge)
+            index = edge[1]
+
+            for target in phis[index]:
+                visit_phi(index, target)
+
+            if not visited[index]:
+                visited[index] = True
+                for i in range(len(code[index])):
+                    visit_instruction(index, i)
+            continue
+
+        for index, where in users[pending.pop()]:
+            if not visited[index]:
+                continue
+            if isinstance(where, int):
+                visit_instruction(index, where)
+            else:
+                visit_phi(index, where)
+
+    for block in blocks:
+        index = block.index
+
+        if not visited[index]:
+            code[index] = []
+            phis[index] = {}
+            continue
+
+        for arguments in phis[index].values():
+            for source in [source for source in arguments if (source, index) not in executable]:
+                del arguments[source]
+
+        code[index] = [rewrite(instruction, value_of) for instruction in code[index]]
+        last = code[index][-1]
+        operands = [value_of(last[field]) for field in read_fields(last)]
+
+        if last[0] == 'IF' and isinstance(operands[0], Constant):
+            code[index][-1] = ('JUMP', last[2] if operands[0].value else last[3], None, None)
+
+        elif last[0] in BRANCH_COMMANDS and all(isinstance(operand, Constant) for operand in operands):
+            try:
+                following = BRANCH_COMMANDS[last[0]](operands[0].value, operands[1].value)
+            except Exception:
+                # Fica para o Interpreter levantar a exceção
+                continue
+
+            if following:
+                code[index].pop()
+            else:
+                code[index][-1] = ('JUMP', last[3], None, None)
+
+    return form
+
+
+def rewrite(instruction: tuple, value_of) -> tuple:
+    """A instrução com as leituras de versões conhecidas trocadas pelos literais, ou o ATT do resultado"""
+    field = written_field(instruction)
+
+    if field is not None and instruction[0] in OPERATIONS:
+        constant = value_of(instruction[field])
+
+        # Como em fold_constants, só quando a conversão ao guardar não muda o literal
+        if isinstance(constant, Constant) and repr(stored(constant.value)) == repr(constant.value):
+            return ('ATT', instruction[field], constant, None)
+
+    fields = [
+        field for field in read_fields(instruction)
+        if not isinstance(instruction[field], Constant) and isinstance(value_of(instruction[field]), Constant)
+    ]
+
+    if not fields:
+        return instruction
+
+    changed = list(instruction)
+    for field in fields:
+        changed[field] = value_of(instruction[field])
+    return tuple(changed)
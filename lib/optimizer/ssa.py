@@ -0,0 +1,215 @@
+from collections import defaultdict
+
+from lib.lexical.symbols import Symbol
+from lib.optimizer.cfg import BasicBlock, Dominators, build_blocks
+from lib.optimizer.ir import written_field, read_fields, is_variable
+
+
+class SSAForm:
+    """
+    Instruções em SSA: cada escrita cria uma versão nova da variável
+    (x.1, x.2, ...), e cada leitura usa a única versão que chega até ela. Nos
+    blocos em que versões diferentes se juntam há funções phi, que escolhem a
+    versão pelo bloco de onde a execução veio. code tem as instruções de cada
+    bloco, phis a versão -> {índice do predecessor: operando} de cada bloco
+    (None é a entrada do programa), e origin a variável de cada versão. As
+    leituras sem escrita antes continuam com o nome da variável.
+    """
+
+    __slots__ = ("blocks", "code", "phis", "origin")
+
+    def __init__(self, blocks: list[BasicBlock], code: list[list[tuple]], phis: list[dict], origin: dict):
+        self.blocks = blocks
+        self.code = code
+        self.phis = phis
+        self.origin = origin
+
+    def __repr__(self):
+        return f"SSAForm({len(self.blocks)} blocos, {len(self.origin)} versões)"
+
+
+def dominance_frontiers(blocks: list[BasicBlock], dominators: Dominators) -> list[set]:
+    """
+    Fronteira de dominância de cada bloco: os blocos em que ele deixa de
+    dominar, onde caminhos que passam por ele se juntam com outros
+    """
+    idom = dominators.idom
+    frontiers = [set() for _ in blocks]
+
+    for block in blocks:
+        if idom[block.index] is None or len(block.predecessors) < 2:
+            continue
+
+        for predecessor in block.predecessors:
+            runner = predecessor
+
+            while idom[runner.index] is not None and runner is not idom[block.index]:
+                frontiers[runner.index].add(block.index)
+                runner = idom[runner.index]
+
+    return frontiers
+
+
+def to_ssa(instructions: list[tuple]) -> SSAForm:
+    """
+    Converte as instruções para SSA (Cytron et al.): as funções phi de cada
+    variável vão para a fronteira de dominância iterada dos blocos que a
+    escrevem, e as versões são numeradas percorrendo a árvore de
+    dominadores. Só ganham phis as variáveis lidas em algum bloco antes de
+    serem escritas nele; as temporárias, lidas no mesmo comando em que são
+    escritas, quase nunca. Os blocos que não são alcançados ficam como estão.
+    """
+    blocks = build_blocks(instructions)
+    dominators = Dominators(blocks)
+    idom = dominators.idom
+    reached = [idom[block.index] is not None for block in blocks]
+
+    # Variáveis lidas antes de escritas em algum bloco e os blocos que as escrevem
+    crossing = set()
+    defined_in = defaultdict(set)
+
+    for block in blocks:
+        if not reached[block.index]:
+            continue
+
+        written_here = set()
+
+        for instruction in instructions[block.start:block.end]:
+            for field in read_fields(instruction):
+                operand = instruction[field]
+                if is_variable(operand) and operand not in written_here:
+                    crossing.add(operand)
+
+            field = written_field(instruction)
+            if field is not None:
+                written_here.add(instruction[field])
+                defined_in[instruction[field]].add(block.index)
+
+    frontiers = dominance_frontiers(blocks, dominators)
+    origin = {}
+    counters = defaultdict(int)
+
+    def version(variable):
+        counters[variable] += 1
+        symbol = Symbol(f"{variable}.{counters[variable]}", -1)
+        symbol.temp = getattr(variable, "temp", False)
+        origin[symbol] = variable
+        return symbol
+
+    phis = [{} for _ in blocks]
+    phi_of = [{} for _ in blocks]  # Variável -> versão escrita pelo phi
+
+    # Um salto de volta para o primeiro bloco junta a entrada do programa com ele
+    entry_joins = bool(blocks) and bool(blocks[0].predecessors)
+
+    for variable in sorted(crossing & defined_in.keys()):
+        pending = list(defined_in[variable])
+        placed = set()
+
+        def place(target):
+            placed.add(target)
+            symbol = version(variable)
+            phis[target][symbol] = {}
+            phi_of[target][variable] = symbol
+
+        if entry_joins:
+            place(0)
+            pending.append(0)
+
+        while pending:
+            for target in frontiers[pending.pop()]:
+                if target not in placed:
+                    place(target)
+                    if target not in defined_in[variable]:
+                        pending.append(target)
+
+    children = [[] for _ in blocks]
+    for block in blocks[1:]:
+        if idom[block.index] is not None:
+            children[idom[block.index].index].append(block)
+
+    code = [list(instructions[block.start:block.end]) for block in blocks]
+    current = defaultdict(list)  # Pilha de versões de cada variável no caminho da árvore
+    pushed = [()] * len(blocks)
+
+    if blocks and reached[0]:
+        for variable, symbol in phi_of[0].items():
+            phis[0][symbol][None] = variable
+
+    stack = [(blocks[0], False)] if blocks else []
+
+    while stack:
+        block, leaving = stack.pop()
+
+        if leaving:
+            for variable in reversed(pushed[block.index]):
+                current[variable].pop()
+            continue
+
+        pushed_here = []
+
+        for variable, symbol in phi_of[block.index].items():
+            current[variable].append(symbol)
+            pushed_here.append(variable)
+
+        renamed = []
+
+        for instruction in code[block.index]:
+            changed = list(instruction)
+
+            for field in read_fields(instruction):
+                versions = current.get(instruction[field])
+                if versions:
+                    changed[field] = versions[-1]
+
+            field = written_field(instruction)
+            if field is not None:
+                variable = instruction[field]
+                changed[field] = version(variable)
+                current[variable].append(changed[field])
+                pushed_here.append(variable)
+
+            renamed.append(tuple(changed))
+
+        code[block.index] = renamed
+
+        for successor in block.successors:
+            for variable, symbol in phi_of[successor.index].items():
+                versions = current.get(variable)
+                phis[successor.index][symbol][block.index] = versions[-1] if versions else variable
+
+        pushed[block.index] = pushed_here
+        stack.append((block, True))
+        stack.extend((child, False) for child in reversed(children[block.index]))
+
+    return SSAForm(blocks, code, phis, origin)
+
+
+def from_ssa(form: SSAForm) -> list[tuple]:
+    """
+    Volta para instruções executáveis, na ordem dos blocos: as phis somem e
+    cada versão volta a ser a sua variável. Basta isso porque os passos
+    sobre SSA só trocam leituras por literais e retiram escritas e blocos,
+    sem mover nada: duas versões da mesma variável nunca estão vivas ao
+    mesmo tempo.
+    """
+    origin = form.origin
+    result = []
+
+    for code in form.code:
+        for instruction in code:
+            fields = [field for field in read_fields(instruction) if instruction[field] in origin]
+            field = written_field(instruction)
+
+            if field is not None and instruction[field] in origin:
+                fields.append(field)
+
+            if fields:
+                instruction = list(instruction)
+                for field in fields:
+                    instruction[field] = origin[instruction[field]]
+                instruction = tuple(instruction)
+
+            result.append(instruction)
+
+    return result
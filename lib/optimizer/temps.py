@@ -0,0 +1,104 @@
+from lib.optimizer.cfg import build_blocks
+from lib.optimizer.dataflow import liveness
+from lib.optimizer.ir import written_field, read_fields, is_temp, temps_in
+
+
+def reuse_temps(instructions: list[tuple], symbol_table: dict) -> list[tuple]:
+    """
+    Reaproveita as temporárias: as que nunca ficam vivas entre blocos básicos
+    são renomeadas, bloco a bloco, para um conjunto pequeno de temporárias,
+    uma por valor vivo ao mesmo tempo e separadas por tipo. Retorna as novas
+    instruções e tira de symbol_table as temporárias que deixaram de ser usadas.
+    """
+    blocks = build_blocks(instructions)
+    temps = temps_in(instructions)
+    live_in, _ = liveness(instructions, blocks, temps)
+
+    # Temporárias vivas na entrada de algum bloco ficam como estão
+    local = temps.difference(*live_in)
+
+    # Nomes do conjunto: as próprias temporárias locais, na ordem em que aparecem
+    names = iter(dict.fromkeys(
+        operand for instruction in instructions for operand in instruction[1:] if operand in local
+    ))
+    pool: dict[str | None, list] = {}
+    pool_types = {}
+    result = list(instructions)
+
+    for block in blocks:
+        # Para trás: em cada instrução, os operandos lidos pela última vez e se o valor escrito morre logo
+        live = set()
+        last_reads = {}
+        dead_writes = set()
+
+        for i in range(block.end - 1, block.start - 1, -1):
+            instruction = instructions[i]
+            field = written_field(instruction)
+
+            if field is not None and instruction[field] in local:
+                if instruction[field] not in live:
+                    dead_writes.add(i)
+                live.discard(instruction[field])
+
+            for field in read_fields(instruction):
+                operand = instruction[field]
+                if operand in local and operand not in live:
+                    live.add(operand)
+                    last_reads.setdefault(i, []).append(operand)
+
+        # Para frente: no início do bloco todo o conjunto está livre
+        free = {temp_type: list(reversed(members)) for temp_type, members in pool.items()}
+        renamed = {}
+
+        for i in range(block.start, block.end):
+            instruction = instructions[i]
+            changed = None
+
+            for field in read_fields(instruction):
+                if instruction[field] in local:
+                    changed = changed or list(instruction)
+                    changed[field] = renamed[instruction[field]]
+
+            # Os operandos são lidos antes da escrita, então o destino pode
+            # ficar com o nome de um operando lido pela última vez aqui
+            for operand in last_reads.get(i, ()):
+                name = renamed.pop(operand)
+                free.setdefault(pool_types[name], []).append(name)
+
+            field = written_field(instruction)
+
+            if field is not None and instruction[field] in local:
+                target = instruction[field]
+                temp_type = symbol_table.get(target)
+                available = free.get(temp_type)
+
+                if available:
+                    name = available.pop()
+                else:
+                    name = next(names)
+                    pool.setdefault(temp_type, []).append(name)
+                    pool_types[name] = temp_type
+
+                changed = changed or list(instruction)
+                changed[field] = name
+
+                if i in dead_writes:
+                    free.setdefault(temp_type, []).append(name)
+                else:
+                    renamed[target] = name
+
+            if changed is not None:
+                result[i] = tuple(changed)
+
+    # A tabela fica com as temporárias do conjunto, com o tipo de cada uma, e
+    # as vivas entre blocos; as que já não aparecem nas instruções saem
+    crossing = temps - local
+    entries = [
+        (name, pool_types.get(name, var_type))
+        for name, var_type in symbol_table.items()
+        if not is_temp(name) or name in pool_types or name in crossing
+    ]
+    symbol_table.clear()
+    symbol_table.update(entries)
+
+    return result
@@ -0,0 +1,115 @@
+from lib.syntatic.syntatic import Syntatic, DEFAULT_VALUES, OPERATION_LEVELS
+from lib.syntatic.tree import (
+    Node, Number, String, Variable, Binary, Not, Negate,
+    Assign, If, While, For, Break, Continue, Read, Write, Program,
+)
+
+
+class CodeGenerator(Syntatic):
+    """
+    Gera as instruções de uma árvore do TreeSyntatic com os mesmos métodos
+    de geração do Syntatic, na mesma ordem da análise, então temporárias e
+    labels têm os mesmos números. Usa a tabela de símbolos do syntatic que
+    construiu a árvore, onde registra as temporárias.
+    """
+
+    def __init__(self, syntatic: Syntatic):
+        super().__init__([], syntatic.symbols)
+        self.symbol_table = syntatic.symbol_table
+        self.variable_types = syntatic.variable_types
+        self.semantic_errors = syntatic.semantic_errors
+
+    def generate(self, program: Program) -> list[tuple]:
+        for declaration in program.declarations:
+            for var_name in declaration.names:
+                self.ir.emit('ATT', var_name, DEFAULT_VALUES[declaration.type])
+
+        self.generate_statements(program.body)
+
+        return self.ir.instructions
+
+    def generate_statements(self, statements: list[Node]):
+        for statement in statements:
+            self.generate_statement(statement)
+
+    def generate_statement(self, node: Node):
+        kind = type(node)
+
+        if kind is Assign:
+            self.ir.emit('ATT', node.target, self.generate_expression(node.value))
+        elif kind is If:
+            state = self.begin_if()
+            self.if_then(state, self.generate_expression(node.condition))
+            self.generate_statements(node.then)
+            self.if_else(state)
+            self.generate_statements(node.orelse)
+            self.end_if(state)
+        elif kind is While:
+            loop = self.begin_while()
+            self.while_condition(loop, self.generate_expression(node.condition))
+            self.generate_statements(node.body)
+            self.end_while(loop)
+        elif kind is For:
+            self.generate_statement(node.init)
+            loop = self.begin_for(node.init.target, self.generate_expression(node.end))
+            self.generate_statements(node.body)
+            self.end_for(loop)
+        elif kind is Break:
+            self.loop_jump('end', 'BREAK')
+        elif kind is Continue:
+            self.loop_jump('start', 'CONTINUE')
+        elif kind is Read:
+            self.read(node.name)
+        elif kind is Write:
+            self.write(node.value)
+        else:
+            raise TypeError(f"Unexpected node {kind.__name__}")
+
+    def generate_expression(self, node: Node):
+        """
+        Gera o código da expressão e retorna o operando com o resultado. A
+        árvore é percorrida em pós-ordem com uma pilha explícita, pois
+        expressões longas geram árvores profundas.
+        """
+        stack = [node]
+        operands = []
+
+        while stack:
+            node = stack.pop()
+            kind = type(node)
+
+            # (nó,): os operandos do nó já foram gerados
+            if kind is tuple:
+                node = node[0]
+                kind = type(node)
+
+                if kind is Binary:
+                    right = operands.pop()
+                    left = operands.pop()
+                    # Os tipos já foram verificados na análise
+                    result, _ = self.emit_binary(node.op, OPERATION_LEVELS[node.op], left, node.left.type, right, node.right.type)
+                elif kind is Not:
+                    result, _ = self.emit_not(operands.pop())
+                elif kind is Negate:
+                    result, _ = self.negate(operands.pop())
+                else:
+                    raise TypeError(f"Unexpected node {kind.__name__}")
+
+                operands.append(result)
+            elif kind is Number:
+                operands.append(self.number_operand(node.value)[0])
+            elif kind is Variable:
+                operands.append(node.name)
+            elif kind is String:
+                operands.append(self.string_operand(node.value)[0])
+            elif kind is Binary:
+                stack.append((node,))
+                stack.append(node.right)
+                stack.append(node.left)
+            elif kind is Not or kind is Negate:
+                stack.append((node,))
+                stack.append(node.operand)
+            else:
+                raise TypeError(f"Unexpected node {kind.__name__}")
+
+        return operands[0]
@@ -0,0 +1,256 @@
+import re
+from pathlib import Path
+from typing import NamedTuple
+
+from lib.lexical.token_type import TokenType
+from lib.lexical.token_map import token_map
+
+
+# Terminais escritos entre aspas no arquivo de gramática; palavras
+# reservadas vêm de token_map
+SYMBOLS: dict[str, TokenType] = {
+    "(": TokenType.OPEN_PARENTHESES,
+    ")": TokenType.CLOSE_PARENTHESES,
+    ";": TokenType.SEMICOLON,
+    ":": TokenType.COLON,
+    ",": TokenType.COMMA,
+    ".": TokenType.DOT,
+    "+": TokenType.OPERATOR_PLUS,
+    "-": TokenType.OPERATOR_MINUS,
+    "*": TokenType.OPERATOR_MULTIPLY,
+    "/": TokenType.OPERATOR_DIVIDE,
+    "==": TokenType.OPERATOR_EQUAL,
+    "<>": TokenType.OPERATOR_NOT_EQUAL,
+    "<": TokenType.OPERATOR_LESS,
+    "<=": TokenType.OPERATOR_LESS_EQUAL,
+    ">": TokenType.OPERATOR_GREATER,
+    ">=": TokenType.OPERATOR_GREATER_EQUAL,
+    ":=": TokenType.OPERATOR_ASSIGN,
+}
+
+# Fim da entrada nos conjuntos FOLLOW
+END = TokenType.EOF
+
+GRAMMAR_TOKEN = re.compile(r"\s+|//[^\n]*|'[^'\n]+'|#\w+(?::\w+)?|->|[|;&]|\w+|.")
+
+
+class Action(NamedTuple):
+    """Ação semântica (#nome ou #nome:argumento) executada quando chega ao topo da pilha"""
+
+    name: str
+    arg: str | None = None
+
+
+class Grammar:
+    """
+    Gramática lida de um arquivo no formato
+
+        naoTerminal -> simbolo simbolo #acao | 'lexema' TIPO | & ;
+
+    Lexemas entre aspas e nomes de TokenType são terminais, '&' é a
+    alternativa vazia e '//' inicia um comentário. O primeiro não terminal é
+    o inicial.
+    """
+
+    def __init__(self, productions: dict[str, list[tuple]], start: str | None = None):
+        self.productions = productions
+        self.start = start if start is not None else next(iter(productions))
+
+        for name, alternatives in productions.items():
+            for alternative in alternatives:
+                for symbol in alternative:
+                    if isinstance(symbol, str) and symbol not in productions:
+                        raise ValueError(f"Unknown nonterminal '{symbol}' in production of '{name}'")
+
+        self.nullable: set[str] = set()
+        self.first: dict[str, set[TokenType]] = {name: set() for name in productions}
+        self.follow: dict[str, set[TokenType]] = {name: set() for name in productions}
+
+        self.compute_first()
+        self.compute_follow()
+
+    @staticmethod
+    def parse(text: str) -> "Grammar":
+        productions: dict[str, list[tuple]] = {}
+        items = [item for item in GRAMMAR_TOKEN.findall(text) if not item.isspace() and not item.startswith("//")]
+        position = 0
+
+        def expect(expected: str):
+            nonlocal position
+            found = items[position] if position < len(items) else "end of grammar"
+            if found != expected:
+                raise ValueError(f"Expected '{expected}' in grammar, but got '{found}'")
+            position += 1
+
+        while position < len(items):
+            name = items[position]
+            if not name.isidentifier():
+                raise ValueError(f"Invalid nonterminal '{name}' in grammar")
+            if name in productions:
+                raise ValueError(f"Nonterminal '{name}' defined twice")
+
+            position += 1
+            expect("->")
+
+            alternatives = []
+            alternative = []
+
+            while True:
+                item = items[position] if position < len(items) else ";"
+
+                if item in ("|", ";"):
+                    alternatives.append(tuple(alternative))
+                    alternative = []
+                    if item == ";":
+                        break
+                elif item != "&":
+                    alternative.append(Grammar.symbol(item))
+
+                position += 1
+
+            expect(";")
+            productions[name] = alternatives
+
+        if not productions:
+            raise ValueError("Empty grammar")
+
+        return Grammar(productions)
+
+    @staticmethod
+    def load(filename: str | Path) -> "Grammar":
+        with open(filename, "r", encoding="utf-8") as file:
+            return Grammar.parse(file.read())
+
+    @staticmethod
+    def symbol(item: str) -> TokenType | Action | str:
+        """Terminal (TokenType), ação ou nome de não terminal"""
+        if item.startswith("'"):
+            lexeme = item[1:-1]
+            token_type = token_map.get(lexeme) or SYMBOLS.get(lexeme)
+            if token_type is None:
+                raise ValueError(f"Unknown terminal {item} in grammar")
+            return token_type
+
+        if item.startswith("#"):
+            name, _, arg = item[1:].partition(":")
+            return Action(name, arg or None)
+
+        if item.isupper():
+            if item not in TokenType.__members__:
+                raise ValueError(f"Unknown token type '{item}' in grammar")
+            return TokenType[item]
+
+        if not item.isidentifier():
+            raise ValueError(f"Unexpected '{item}' in grammar")
+
+        return item
+
+    def first_of(self, symbols) -> tuple[set[TokenType], bool]:
+        """FIRST de uma sequência de símbolos e se ela deriva a cadeia vazia"""
+        first = set()
+
+        for symbol in symbols:
+            if isinstance(symbol, TokenType):
+                first.add(symbol)
+                return first, False
+
+            if isinstance(symbol, str):
+                first |= self.first[symbol]
+                if symbol not in self.nullable:
+                    return first, False
+
+        return first, True
+
+    def compute_first(self):
+        changed = True
+
+        while changed:
+            changed = False
+
+            for name, alternatives in self.productions.items():
+                for alternative in alternatives:
+                    first, nullable = self.first_of(alternative)
+
+                    if not first <= self.first[name]:
+                        self.first[name] |= first
+                        changed = True
+
+                    if nullable and name not in self.nullable:
+                        self.nullable.add(name)
+                        changed = True
+
+    def compute_follow(self):
+        self.follow[self.start].add(END)
+        changed = True
+
+        while changed:
+            changed = False
+
+            for name, alternatives in self.productions.items():
+                for alternative in alternatives:
+                    for i, symbol in enumerate(alternative):
+                        if not isinstance(symbol, str):
+                            continue
+
+                        follow, nullable = self.first_of(alternative[i + 1:])
+                        if nullable:
+                            follow |= self.follow[name]
+
+                        if not follow <= self.follow[symbol]:
+                            self.follow[symbol] |= follow
+                            changed = True
+
+
+class ParseTable:
+    """
+    Tabela LL(1) gerada a partir de uma Grammar: para cada não terminal e
+    token, o índice da alternativa a expandir.
+
+    Um conflito entre uma alternativa que consome o token (FIRST) e uma que
+    deriva vazio (FOLLOW) é resolvido a favor da primeira, como o 'else'
+    pendente; os conflitos resolvidos ficam em resolved. Conflitos entre duas
+    alternativas de FIRST ou duas vazias são erros. Tokens sem entrada usam
+    a alternativa vazia, se houver, ou a última, cujo primeiro terminal
+    produz a mensagem de erro.
+    """
+
+    def __init__(self, grammar: Grammar):
+        self.grammar = grammar
+        self.rows: dict[str, dict[TokenType, int]] = {}
+        self.defaults: dict[str, int] = {}
+        self.resolved: list[tuple[str, TokenType]] = []
+
+        for name, alternatives in grammar.productions.items():
+            row: dict[TokenType, int] = {}
+            consuming: set[TokenType] = set()
+            default = None
+
+            for index, alternative in enumerate(alternatives):
+                first, nullable = grammar.first_of(alternative)
+
+                for token_type in first:
+                    if token_type in consuming:
+                        raise ValueError(f"Grammar is not LL(1): '{name}' has two alternatives starting with {token_type}")
+                    if token_type in row:
+                        self.resolved.append((name, token_type))
+                    row[token_type] = index
+                    consuming.add(token_type)
+
+                if nullable:
+                    if default is not None:
+                        raise ValueError(f"Grammar is not LL(1): '{name}' has two empty alternatives")
+                    default = index
+
+                    for token_type in grammar.follow[name]:
+                        if token_type in consuming:
+                            self.resolved.append((name, token_type))
+                        else:
+                            row[token_type] = index
+
+            self.rows[name] = row
+            self.defaults[name] = default if default is not None else len(alternatives) - 1
+
+    def alternative(self, name: str, token_type: TokenType) -> tuple:
+        """Símbolos da alternativa de name escolhida com o token token_type"""
+        index = self.rows[name].get(token_type, self.defaults[name])
+        return self.grammar.productions[name][index]
@@ -0,0 +1,354 @@
+from typing import Iterator
+
+from lib.lexical.token import Token
+from lib.lexical.token_type import TokenType
+from lib.lexical.scanner import Scanner
+from lib.lexical.symbols import SymbolTable
+from lib.lexical.parallel import TEXT_PATTERN
+from lib.syntatic.syntatic import Syntatic, STMT_START
+from lib.syntatic.token_cursor import IteratorCursor
+from lib.syntatic.ir_builder import IRBuilder
+
+
+def comment_after(line: str, in_comment: bool) -> bool:
+    """Se o fim da linha está dentro de um comentário de bloco"""
+    pos = 0
+
+    if in_comment:
+        close = line.find("}")
+        if close < 0:
+            return True
+        pos = close + 1
+
+    last = None
+    for last in TEXT_PATTERN.finditer(line, pos):
+        pass
+
+    # Só o último trecho da linha pode ser um comentário ainda aberto
+    return last is not None and line[last.start()] == "{" and line[last.end() - 1] != "}"
+
+
+class StatementParser(Syntatic):
+    """Syntatic que lê os tokens de um iterador, para analisar o programa comando a comando"""
+
+    def restart(self, tokens: Iterator[Token]):
+        """Passa a ler de outro iterador"""
+        self.cursor = IteratorCursor(tokens)
+        self.exhausted = False
+
+
+class Segment:
+    """Comando do bloco principal: o token em que começa e as instruções geradas"""
+
+    __slots__ = ("first", "instructions", "errors", "prev", "next")
+
+    def __init__(self, first: Token | None, instructions: list[tuple], errors: list[str]):
+        self.first = first
+        self.instructions = instructions
+        self.errors = errors
+        self.prev: Segment | None = None
+        self.next: Segment | None = None
+
+
+class Document:
+    """
+    Fonte mantido entre edições. Cada edição reanalisa só as linhas alteradas
+    (estendidas até onde o estado dos comentários de bloco volta a coincidir)
+    e só os comandos do bloco principal que as contêm; o restante dos tokens
+    e das instruções é reaproveitado. As instruções são equivalentes às de uma
+    compilação completa, a menos dos números das temporárias e labels.
+    """
+
+    def __init__(self, text: str):
+        self.lines: list[str] = text.splitlines(keepends=True)
+        self.symbols = SymbolTable()
+        self.valid = False
+
+        # comments[i]: se a linha i começa dentro de um comentário de bloco
+        self.comments: list[bool] = []
+        self.line_tokens: list[list[Token]] = []
+
+        self.parser: StatementParser | None = None
+        self.header: list[tuple] = []
+        self.header_errors: list[str] = []
+        self.begin_token: Token | None = None
+        self.begin_line = 0
+
+        # Lista duplamente ligada de comandos, com sentinela, e o índice pelo
+        # primeiro token de cada um (id, pois Token não é hashable)
+        self.head = Segment(None, [], [])
+        self.starts: dict[int, Segment] = {}
+        self.error_count = 0
+
+    @property
+    def text(self) -> str:
+        return "".join(self.lines)
+
+    @property
+    def tokens(self) -> list[Token]:
+        return list(self.iter_tokens(0, 0))
+
+    @property
+    def instructions(self) -> list[tuple]:
+        instructions = list(self.header)
+        segment = self.head.next
+
+        while segment is not None:
+            instructions.extend(segment.instructions)
+            segment = segment.next
+
+        return instructions
+
+    def iter_tokens(self, line: int, index: int) -> Iterator[Token]:
+        """Tokens a partir de line_tokens[line][index], corrigindo a linha dos tokens reaproveitados"""
+        line_tokens = self.line_tokens
+
+        for number in range(line, len(line_tokens)):
+            tokens = line_tokens[number]
+
+            for position in range(index if number == line else 0, len(tokens)):
+                token = tokens[position]
+                token.line = number
+                yield token
+
+    def compile(self):
+        """Compila o fonte inteiro"""
+        self.valid = False
+
+        comments = [False]
+        for line in self.lines:
+            comments.append(comment_after(line, comments[-1]))
+
+        self.comments = comments
+        self.line_tokens = [[] for _ in self.lines]
+
+        for token in Scanner(self.text, symbols=self.symbols).tokens():
+            self.line_tokens[token.line].append(token)
+
+        parser = StatementParser(self.iter_tokens(0, 0), self.symbols)
+        parser.advance()
+
+        parser.eat(TokenType.RESERVED_WORD_PROGRAM)
+        parser.eat(TokenType.VARIABLE)
+        parser.eat(TokenType.SEMICOLON)
+
+        parser.procDeclarations()
+        self.header = parser.ir.instructions
+        self.header_errors = parser.semantic_errors
+        self.begin_token = parser.current_token
+        self.begin_line = parser.current_token.line
+        parser.eat(TokenType.RESERVED_WORD_BEGIN)
+
+        self.head.next = None
+        self.starts = {}
+        self.error_count = 0
+        self.parser = parser
+
+        self.link(self.head, None, self.parse_statements(parser))
+
+        self.valid = True
+        self.raise_semantic_errors()
+
+    def edit(self, first_line: int, last_line: int, text: str):
+        """
+        Substitui as linhas [first_line, last_line) por text e recompila o
+        necessário. Erros são levantados como no Syntatic; depois de um erro
+        léxico ou sintático a próxima edição recompila o fonte inteiro.
+        """
+        lines = self.lines
+
+        if not 0 <= first_line <= last_line <= len(lines):
+            raise ValueError(f"Error: Invalid line range {first_line}:{last_line}")
+
+        # O texto novo se junta às linhas vizinhas que ficariam sem quebra de linha
+        if first_line > 0 and first_line == len(lines) and not lines[-1].endswith("\n"):
+            first_line -= 1
+            text = lines[first_line] + text
+
+        if text and not text.endswith("\n") and last_line < len(lines):
+            text += lines[last_line]
+            last_line += 1
+
+        new_lines = text.splitlines(keepends=True)
+
+        if not self.valid:
+            lines[first_line:last_line] = new_lines
+            self.compile()
+            return
+
+        try:
+            relexed = self.relex(first_line, last_line, new_lines)
+
+            if relexed is None:
+                self.compile()
+                return
+
+            self.reparse(*relexed)
+        except Exception:
+            self.valid = False
+            raise
+
+        self.raise_semantic_errors()
+
+    def relex(self, first_line: int, last_line: int, new_lines: list[str]) -> tuple[int, list[list[Token]]] | None:
+        """
+        Atualiza as linhas e reanalisa lexicamente o trecho afetado. Retorna a
+        primeira linha reanalisada e os tokens substituídos, ou None quando a
+        edição alcança o cabeçalho e exige compilação completa.
+        """
+        lines = self.lines
+        comments = self.comments
+        delta = len(new_lines) - (last_line - first_line)
+
+        # Começa numa linha fora de comentário, onde o Scanner parte do estado inicial
+        start = first_line
+        while start > 0 and comments[start]:
+            start -= 1
+
+        lines[first_line:last_line] = new_lines
+
+        if start <= self.begin_line:
+            return None
+
+        # Avança até uma linha, depois do texto novo, em que o estado dos
+        # comentários volta a ser o mesmo de antes da edição
+        edited_end = first_line + len(new_lines)
+        new_comments = []
+        state = False
+        stop = start
+
+        while stop < len(lines):
+            state = comment_after(lines[stop], state)
+            stop += 1
+            new_comments.append(state)
+
+            if stop >= edited_end and not state and not comments[stop - delta]:
+                break
+
+        comments[start + 1:stop - delta + 1] = new_comments
+
+        grouped = [[] for _ in range(stop - start)]
+        for token in Scanner("".join(lines[start:stop]), symbols=self.symbols, first_line=start).tokens():
+            grouped[token.line - start].append(token)
+
+        dropped = self.line_tokens[start:stop - delta]
+        self.line_tokens[start:stop - delta] = grouped
+
+        return start, dropped
+
+    def reparse(self, start: int, dropped: list[list[Token]]):
+        """Reanalisa os comandos do bloco principal a partir do que contém a linha start"""
+        # dropped mantém vivos os tokens antigos até o fim, para que seus ids
+        # não sejam reutilizados por tokens novos enquanto starts os referencia
+        line_tokens = self.line_tokens
+        segment = None
+        line = start - 1
+        index = 0
+
+        # Procura, voltando a partir do trecho reanalisado, o início do comando que o contém
+        while segment is None:
+            tokens = line_tokens[line]
+            index = len(tokens) - 1
+
+            while index >= 0:
+                token = tokens[index]
+
+                if token is self.begin_token:
+                    break
+
+                segment = self.starts.get(id(token))
+                if segment is not None:
+                    break
+
+                index -= 1
+
+            if index >= 0 and segment is None:
+                # Nenhum comando antes da edição: recomeça após o 'begin'
+                index += 1
+                break
+
+            if segment is None:
+                line -= 1
+
+        if segment is None:
+            prev = self.head
+        else:
+            prev = segment.prev
+
+        parser = self.parser
+        parser.restart(self.iter_tokens(line, index))
+        parser.advance()
+
+        new_segments = self.parse_statements(parser)
+
+        # Remove os comandos antigos até o ponto de sincronização
+        sync = self.starts.get(id(parser.current_token)) if new_segments and new_segments[-1] is None else None
+        old = prev.next
+
+        while old is not None and old is not sync:
+            del self.starts[id(old.first)]
+            if old.errors:
+                self.error_count -= 1
+            old = old.next
+
+        self.link(prev, sync, new_segments)
+
+    def parse_statements(self, parser: StatementParser) -> list[Segment | None]:
+        """
+        Analisa comandos do bloco principal até o fim do programa, ou até
+        chegar ao início de um comando já analisado (indicado por um None no fim).
+        """
+        segments: list[Segment | None] = []
+
+        while parser.current_token.token_type in STMT_START:
+            token = parser.current_token
+
+            if segments and id(token) in self.starts:
+                segments.append(None)
+                return segments
+
+            # Sem mais tokens o Syntatic repete o último; um ';' final seria aceito para sempre
+            if parser.exhausted and segments and token is segments[-1].first:
+                raise Exception("Unexpected end of input")
+
+            # Cada comando tem as próprias instruções, para ser substituído sozinho
+            parser.semantic_errors = []
+            parser.ir = IRBuilder()
+            parser.procStmt()
+            segments.append(Segment(token, parser.ir.instructions, parser.semantic_errors))
+
+        parser.eat(TokenType.RESERVED_WORD_END)
+        parser.finish_program()
+
+        return segments
+
+    def link(self, prev: Segment, sync: Segment | None, segments: list[Segment | None]):
+        """Encadeia os comandos novos entre prev e sync"""
+        for segment in segments:
+            if segment is None:
+                break
+
+            self.starts[id(segment.first)] = segment
+            if segment.errors:
+                self.error_count += 1
+
+            segment.prev = prev
+            prev.next = segment
+            prev = segment
+
+        prev.next = sync
+        if sync is not None:
+            sync.prev = prev
+
+    def raise_semantic_errors(self):
+        """Levanta o primeiro erro semântico na ordem do fonte, como Syntatic.start"""
+        if self.header_errors:
+            raise Exception(self.header_errors[0])
+
+        if self.error_count:
+            segment = self.head.next
+
+            while not segment.errors:
+                segment = segment.next
+
+            raise Exception(segment.errors[0])
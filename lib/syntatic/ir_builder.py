@@ -0,0 +1,31 @@
+class IRBuilder:
+    """
+    Lista única de instruções à qual o sintático acrescenta o código na ordem
+    em que é analisado. Instruções cujos operandos só são conhecidos depois
+    (destinos de saltos, temporárias do for) são reservadas e remendadas.
+    """
+
+    def __init__(self):
+        self.instructions: list[tuple] = []
+
+    def __len__(self) -> int:
+        return len(self.instructions)
+
+    def emit(self, op: str, result=None, arg1=None, arg2=None) -> int:
+        """Acrescenta uma instrução e retorna sua posição"""
+        self.instructions.append((op, result, arg1, arg2))
+        return len(self.instructions) - 1
+
+    def reserve(self, count: int = 1) -> int:
+        """Reserva count instruções a serem preenchidas com patch; retorna a posição da primeira"""
+        position = len(self.instructions)
+        self.instructions.extend([None] * count)
+        return position
+
+    def patch(self, position: int, op: str, result=None, arg1=None, arg2=None):
+        """Substitui a instrução da posição position"""
+        self.instructions[position] = (op, result, arg1, arg2)
+
+    def truncate(self, position: int):
+        """Descarta as instruções a partir de position"""
+        del self.instructions[position:]
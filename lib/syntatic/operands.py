@@ -0,0 +1,101 @@
+def to_number(value):
+    """Converte o texto de um valor como o Interpreter: hexadecimal, octal, float ou int; senão o próprio texto"""
+    value = str(value)
+
+    if len(value) > 2 and value[:2] == '0x':
+        # Verifica se é um número hexadecimal
+        try:
+            return int(value, 16)
+        except ValueError:
+            return value
+    elif len(value) > 0 and value[0] == '0':
+        # Verifica se é um número octal
+        try:
+            return int(value, 8)
+        except ValueError:
+            return value
+
+    if "." in value:
+        try:
+            return float(value)
+        except ValueError:
+            return value
+
+    try:
+        return int(value)
+    except ValueError:
+        return value
+
+
+def literal_value(text: str):
+    """Valor em execução de um operando que não é variável, pela codificação da IR"""
+    if text.startswith("'") and text.endswith("'"):
+        return to_number(text[1:-1])
+
+    if text.startswith('"') and text.endswith('"'):
+        return text[1:-1]
+
+    if text == '\\n':
+        return '\n'
+
+    return to_number(text)
+
+
+class Constant(str):
+    """
+    Operando literal da IR. Continua sendo o texto de sempre ("'5'", '"x"',
+    '0.0', ...), mas carrega o tipo semântico (type) e o valor em execução
+    (value), resolvidos uma única vez na compilação.
+    """
+
+    type = 'unknown'
+
+    def __new__(cls, text: str):
+        constant = super().__new__(cls, text)
+        constant.value = literal_value(text)
+        return constant
+
+    def __reduce__(self):
+        return (type(self), (str(self),))
+
+
+class IntegerConstant(Constant):
+    type = 'integer'
+
+
+class RealConstant(Constant):
+    type = 'real'
+
+
+class StringConstant(Constant):
+    type = 'string'
+
+
+def number_constant(text: str) -> Constant:
+    """Literal numérico; é real quando tem '.', como em get_expression_type"""
+    return RealConstant(text) if '.' in text else IntegerConstant(text)
+
+
+def constant_for(value) -> Constant | None:
+    """Literal cujo valor em execução é exatamente value (int, float ou str), ou None se não há um"""
+    if type(value) is str:
+        constant = StringConstant(f'"{value}"')
+    elif type(value) is int or type(value) is float:
+        try:
+            constant = (RealConstant if type(value) is float else IntegerConstant)(f"'{value}'")
+        except ValueError:
+            # Inteiros grandes demais para str
+            return None
+    else:
+        return None
+
+    if type(constant.value) is type(value) and repr(constant.value) == repr(value):
+        return constant
+
+    return None
+
+
+# Operandos fixos gerados pelo Syntatic
+ZERO = IntegerConstant('0')
+ONE = IntegerConstant('1')
+NEWLINE = StringConstant('\n')
@@ -1,24 +1,132 @@
+from typing import Iterable
+
 from lib.lexical.token import Token
 from lib.lexical.token_type import TokenType
+from lib.lexical.token_stream import TokenStream
+from lib.lexical.symbols import Symbol, SymbolTable
 from lib.syntatic.command import Command
+from lib.syntatic.token_cursor import TokenCursor
+from lib.syntatic.ir_builder import IRBuilder
+from lib.syntatic.operands import (
+    Constant, IntegerConstant, RealConstant, StringConstant, number_constant, ZERO, ONE, NEWLINE,
+)
+
+
+# Tokens que podem iniciar um <stmt>
+STMT_START = {
+    # forStmt
+    TokenType.RESERVED_WORD_FOR,
+
+    # ioStmt
+    TokenType.RESERVED_WORD_READ,
+    TokenType.RESERVED_WORD_WRITE,
+    TokenType.RESERVED_WORD_READLN,
+    TokenType.RESERVED_WORD_WRITELN,
+
+    # whileStmt
+    TokenType.RESERVED_WORD_WHILE,
+
+    # atrib
+    TokenType.VARIABLE,
+
+    # ifStmt
+    TokenType.RESERVED_WORD_IF,
+    TokenType.RESERVED_WORD_ELSE,
+
+    # bloco
+    TokenType.RESERVED_WORD_BEGIN,
+
+    TokenType.RESERVED_WORD_BREAK,
+    TokenType.RESERVED_WORD_CONTINUE,
+    TokenType.SEMICOLON
+}
+
+# Níveis de precedência das expressões, do mais fraco ao mais forte
+OR_LEVEL, AND_LEVEL, NOT_LEVEL, REL_LEVEL, ADD_LEVEL, MULT_LEVEL, ATOM_LEVEL = range(1, 8)
+
+# Operadores binários: nível de precedência e instrução gerada
+BINARY_OPS = {
+    TokenType.OPERATOR_OR: (OR_LEVEL, 'OR'),
+    TokenType.OPERATOR_AND: (AND_LEVEL, 'AND'),
+    TokenType.OPERATOR_EQUAL: (REL_LEVEL, 'EQ'),
+    TokenType.OPERATOR_NOT_EQUAL: (REL_LEVEL, 'NEQ'),
+    TokenType.OPERATOR_LESS: (REL_LEVEL, 'LESS'),
+    TokenType.OPERATOR_LESS_EQUAL: (REL_LEVEL, 'LEQ'),
+    TokenType.OPERATOR_GREATER: (REL_LEVEL, 'GRET'),
+    TokenType.OPERATOR_GREATER_EQUAL: (REL_LEVEL, 'GEQ'),
+    TokenType.OPERATOR_PLUS: (ADD_LEVEL, 'ADD'),
+    TokenType.OPERATOR_MINUS: (ADD_LEVEL, 'SUB'),
+    TokenType.OPERATOR_MULTIPLY: (MULT_LEVEL, 'MULT'),
+    TokenType.OPERATOR_DIVIDE: (MULT_LEVEL, 'DIV'),
+    TokenType.OPERATOR_MOD: (MULT_LEVEL, 'MOD'),
+    TokenType.OPERATOR_INTEGER_DIVIDER: (MULT_LEVEL, 'IDIV'),
+}
+
+# Nível de precedência de cada instrução binária
+OPERATION_LEVELS = {op: level for level, op in BINARY_OPS.values()}
+
+# Nome das operações aritméticas nas mensagens de erro com strings
+OPERATION_NAMES = {
+    'SUB': 'subtraction',
+    'MULT': 'multiplication',
+    'DIV': 'division',
+    'MOD': 'modulo',
+    'IDIV': 'integer division',
+}
+
+NUMBER_TYPES = {TokenType.DECIMAL, TokenType.OCTAL, TokenType.HEXADECIMAL, TokenType.FLOAT}
+
+IO_START = {
+    TokenType.RESERVED_WORD_READ,
+    TokenType.RESERVED_WORD_WRITE,
+    TokenType.RESERVED_WORD_READLN,
+    TokenType.RESERVED_WORD_WRITELN
+}
+
+# Valor inicial de cada tipo nas declarações
+DEFAULT_VALUES = {'string': StringConstant('""'), 'integer': IntegerConstant('0'), 'real': RealConstant('0.0')}
+
+# Tipos de entrada na pilha de procExpr
+BINARY_FRAME, NOT_FRAME, PAREN_FRAME = range(3)
 
 
 class Syntatic:
-    def __init__(self, tokens: list[Token] = []):
-        self.tokens: list[Token] = tokens
+    def __init__(self, tokens: list[Token] | TokenStream | Iterable[Token] = [], symbols: SymbolTable | None = None):
+        # A entrada não é modificada; outros iteráveis (como um TokenPipeline)
+        # são consumidos sob demanda
+        self.tokens = tokens
+        self.cursor = TokenCursor.over(tokens)
+        # Sem mais tokens, advance mantém o último em current_token
+        self.exhausted = False
         self.current_token: Token = Token(
             TokenType.RESERVED_WORD_END, "None", 0, 0)
         self.temp_counter = 0
         self.label_counter = 0
         self.loop_stack = []
+        self.ir = IRBuilder()
+        # Literais já criados, pelo texto na IR; literais iguais compartilham o operando
+        self.constants: dict[str, Constant] = {}
+
+        # Mesma tabela do léxico quando possível, para reaproveitar os ids
+        if symbols is None:
+            symbols = tokens.symbols if isinstance(tokens, TokenStream) else SymbolTable()
 
+        self.symbols = symbols
         self.symbol_table = {}
+        # Tipo de cada variável declarada, indexado pelo id do Symbol
+        self.variable_types: list[str | None] = []
         self.semantic_errors = []
 
+    def intern(self, name) -> Symbol:
+        """Symbol do nome; lexemas vindos do léxico já são Symbols e não passam por hash"""
+        return self.symbols.intern(name)
+
     def generate_temp_var(self):
         """Gera uma variável temporária única"""
         self.temp_counter += 1
-        return f"temp_{self.temp_counter}"
+        symbol = self.intern(f"temp_{self.temp_counter}")
+        symbol.temp = True
+        return symbol
 
     def generate_label(self):
         """Gera um label único"""
@@ -27,25 +135,48 @@ class Syntatic:
 
     def add_variable(self, var_name, var_type):
         """Adiciona variável na tabela de símbolos"""
-        if var_name in self.symbol_table:
+        symbol = self.intern(var_name)
+        types = self.variable_types
+
+        if symbol.id >= len(types):
+            types.extend([None] * (len(self.symbols) - len(types)))
+
+        if types[symbol.id] is not None:
             self.semantic_errors.append(
                 f"Variable '{var_name}' already declared")
         else:
-            self.symbol_table[var_name] = var_type
+            types[symbol.id] = var_type
+            self.symbol_table[symbol] = var_type
 
     def check_variable_declared(self, var_name):
         """Verifica se variável foi declarada"""
-        if var_name not in self.symbol_table:
+        if self.get_variable_type(var_name) == 'unknown':
             self.semantic_errors.append(f"Variable '{var_name}' not declared")
             return False
         return True
 
     def get_variable_type(self, var_name):
         """Retorna tipo da variável"""
-        return self.symbol_table.get(var_name, 'unknown')
+        symbol_id = self.intern(var_name).id
+
+        if symbol_id < len(self.variable_types):
+            return self.variable_types[symbol_id] or 'unknown'
+
+        return 'unknown'
 
     def get_expression_type(self, expression):
         """Determina o tipo de uma expressão"""
+        if self.symbols.owns(expression):
+            var_type = self.get_variable_type(expression)
+            if var_type == 'unknown':
+                self.semantic_errors.append(
+                    f"Variable '{expression}' not declared")
+            return var_type
+
+        # Literais gerados pelo Syntatic já têm o tipo
+        if isinstance(expression, Constant):
+            return expression.type
+
         if isinstance(expression, str):
             expression = expression.strip()
 
@@ -89,6 +220,10 @@ class Syntatic:
             return True
         return False
 
+    def slots(self) -> dict[Symbol, int]:
+        """Slot denso de cada variável declarada e temporária, na ordem da tabela de símbolos; usado pelo Interpreter"""
+        return {symbol: slot for slot, symbol in enumerate(self.symbol_table)}
+
     def print_symbol_table(self):
         """Imprime a tabela de símbolos para debug"""
         print("\n=== SYMBOL TABLE ===")
@@ -99,8 +234,20 @@ class Syntatic:
         """
         Move to the next token in the list.
         """
-        if self.tokens:
-            self.current_token = self.tokens.pop(0)
+        token = self.cursor.next()
+
+        if token is not None:
+            self.current_token = token
+        else:
+            self.exhausted = True
+
+    def peek(self, k: int = 1) -> Token | None:
+        """k-ésimo token depois de current_token, sem consumi-lo"""
+        return self.cursor.peek(k)
+
+    def remaining_tokens(self) -> list[Token]:
+        """Tokens ainda não consumidos"""
+        return self.cursor.remaining()
 
     def eat(self, token_type: TokenType, next_token: bool = True):
         """
@@ -119,46 +266,44 @@ class Syntatic:
     def start(self):
         self.advance()
 
-        cmds = self.procFunction()
+        self.procFunction()
 
         if self.semantic_errors:
             raise Exception(self.semantic_errors[0])
 
-        return cmds
+        return self.ir.instructions
 
     def procFunction(self):
         """<function*> -> 'program' 'IDENT' ';' <declarations> 'begin' <stmtList> 'end' '.' ;"""
-        aux = []
-
         self.eat(TokenType.RESERVED_WORD_PROGRAM)
         self.eat(TokenType.VARIABLE)
         self.eat(TokenType.SEMICOLON)
 
-        aux.extend(self.procDeclarations())
+        self.procDeclarations()
 
         self.eat(TokenType.RESERVED_WORD_BEGIN)
 
-        aux.extend(self.procStmtList())
+        self.procStmtList()
 
         self.eat(TokenType.RESERVED_WORD_END)
+        self.finish_program()
+
+    def finish_program(self):
+        """Consome o '.' final, que deve ser o último token"""
         self.eat(TokenType.DOT, next_token=False)
 
-        if len(self.tokens) > 0:
-            raise Exception(
-                f"Unexpected tokens after end of program: {self.tokens}")
+        remaining = self.remaining_tokens()
 
-        return aux
+        if len(remaining) > 0:
+            raise Exception(
+                f"Unexpected tokens after end of program: {remaining}")
 
     def procDeclarations(self):
         """<declarations> -> var <declaration> <restoDeclaration> ;"""
         self.eat(TokenType.RESERVED_WORD_VAR)
 
-        aux = []
-
-        aux.extend(self.procDeclaration())
-        aux.extend(self.procRestoDeclaration())
-
-        return aux
+        self.procDeclaration()
+        self.procRestoDeclaration()
 
     def procDeclaration(self):
         """<declaration> -> <listaIdent> ':' <type> ';' ;"""
@@ -167,19 +312,13 @@ class Syntatic:
         var_type = self.procType()
         self.eat(TokenType.SEMICOLON)
 
-        cmds = []
+        self.declare(var_list, var_type)
 
+    def declare(self, var_list, var_type):
+        """Adiciona as variáveis e gera sua inicialização"""
         for var_name in var_list:
             self.add_variable(var_name, var_type)
-
-            if var_type == 'string':
-                cmds.append(('ATT', var_name, '""', None))
-            elif var_type == 'integer':
-                cmds.append(('ATT', var_name, '0', None))
-            elif var_type == 'real':
-                cmds.append(('ATT', var_name, '0.0', None))
-
-        return cmds
+            self.ir.emit('ATT', var_name, DEFAULT_VALUES[var_type])
 
     def procListIdent(self):
         """<listaIdent> -> 'IDENT' <restoIdentList> ;"""
@@ -193,25 +332,20 @@ class Syntatic:
         return var_list
 
     def procRestoListIdent(self):
-        """<restoIdentList> -> ',' 'IDENT' <restoIdentList> | & ;"""
-        if self.current_token.token_type == TokenType.COMMA:
+        """<restoIdentList> -> ',' 'IDENT' <restoIdentList> | & ; (analisado como laço)"""
+        var_list = []
+
+        while self.current_token.token_type == TokenType.COMMA:
             self.eat(TokenType.COMMA)
-            var_name = self.current_token.lexeme
+            var_list.append(self.current_token.lexeme)
             self.eat(TokenType.VARIABLE)
-            more_vars = self.procRestoListIdent()
-            return [var_name] + more_vars
-        else:
-            return []
+
+        return var_list
 
     def procRestoDeclaration(self):
-        """<restoDeclaration> -> <declaration> <restoDeclaration> | & ;"""
-        if self.current_token.token_type == TokenType.VARIABLE:
-            aux = []
-            aux.extend(self.procDeclaration())
-            aux.extend(self.procRestoDeclaration())
-            return aux
-        else:
-            return []
+        """<restoDeclaration> -> <declaration> <restoDeclaration> | & ; (analisado como laço)"""
+        while self.current_token.token_type == TokenType.VARIABLE:
+            self.procDeclaration()
 
     def procType(self):
         """<type> -> 'integer' | 'real' | 'string' ;"""
@@ -228,57 +362,25 @@ class Syntatic:
     def procBloco(self):
         """<bloco> -> 'begin' <stmtList> 'end' ';' ;"""
         self.eat(TokenType.RESERVED_WORD_BEGIN)
-        commands = self.procStmtList()
+        self.procStmtList()
         self.eat(TokenType.RESERVED_WORD_END)
 
         if self.current_token.token_type == TokenType.SEMICOLON:
             self.eat(TokenType.SEMICOLON)
 
-        return commands
-
     def procStmtList(self):
         """
             <stmtList> -> <stmt> <stmtList> | & ;
-        """
-
-        stmt = {
-            # forStmt
-            TokenType.RESERVED_WORD_FOR,
-
-            # ioStmt
-            TokenType.RESERVED_WORD_READ,
-            TokenType.RESERVED_WORD_WRITE,
-            TokenType.RESERVED_WORD_READLN,
-            TokenType.RESERVED_WORD_WRITELN,
-
-            # whileStmt
-            TokenType.RESERVED_WORD_WHILE,
-
-            # atrib
-            TokenType.VARIABLE,
-
-            # ifStmt
-            TokenType.RESERVED_WORD_IF,
-            TokenType.RESERVED_WORD_ELSE,
-
-
-            # bloco
-            TokenType.RESERVED_WORD_BEGIN,
-
-            TokenType.RESERVED_WORD_BREAK,
-            TokenType.RESERVED_WORD_CONTINUE,
-            TokenType.SEMICOLON
-        }
 
-        if self.current_token.token_type in stmt:
-            aux = []
-
-            aux.extend(self.procStmt())
-            aux.extend(self.procStmtList())
+            Analisado como laço, para que a pilha não cresça com o número de comandos.
+        """
+        while self.current_token.token_type in STMT_START:
+            token = self.current_token
+            self.procStmt()
 
-            return aux
-        else:
-            return []
+            # Sem mais tokens o advance repete o último; um ';' final seria aceito para sempre
+            if self.current_token is token:
+                raise Exception("Unexpected end of input")
 
     def procStmt(self):
         """
@@ -292,64 +394,58 @@ class Syntatic:
                     | 'continue'';'
                     | ';' ;
         """
-
-        io = {
-            TokenType.RESERVED_WORD_READ,
-            TokenType.RESERVED_WORD_WRITE,
-            TokenType.RESERVED_WORD_READLN,
-            TokenType.RESERVED_WORD_WRITELN
-        }
-
         if self.current_token.token_type == TokenType.RESERVED_WORD_FOR:
-            return self.procForStmt()
-        elif self.current_token.token_type in io:
-            return self.procIoStmt()
+            self.procForStmt()
+        elif self.current_token.token_type in IO_START:
+            self.procIoStmt()
         elif self.current_token.token_type == TokenType.RESERVED_WORD_WHILE:
-            return self.procWhileStmt()
+            self.procWhileStmt()
         elif self.current_token.token_type == TokenType.VARIABLE:
-            cmds = self.procAtrib()
+            self.procAtrib()
             self.eat(TokenType.SEMICOLON)
-            return cmds
         elif self.current_token.token_type == TokenType.RESERVED_WORD_IF:
-            return self.procIfStmt()
+            self.procIfStmt()
         elif self.current_token.token_type == TokenType.RESERVED_WORD_ELSE:
-            return self.procElsePart()
+            self.procElsePart()
         elif self.current_token.token_type == TokenType.RESERVED_WORD_BEGIN:
-            return self.procBloco()
+            self.procBloco()
         elif self.current_token.token_type == TokenType.RESERVED_WORD_BREAK:
             self.eat(TokenType.RESERVED_WORD_BREAK)
             self.eat(TokenType.SEMICOLON)
-
-            if not self.loop_stack:
-                raise Exception("BREAK outside of loop")
-
-            current_loop = self.loop_stack[-1]
-            return [('JUMP', current_loop['end'], None, None)]
+            self.loop_jump('end', 'BREAK')
         elif self.current_token.token_type == TokenType.RESERVED_WORD_CONTINUE:
             self.eat(TokenType.RESERVED_WORD_CONTINUE)
             self.eat(TokenType.SEMICOLON)
-
-            if not self.loop_stack:
-                raise Exception("CONTINUE outside of loop")
-
-            current_loop = self.loop_stack[-1]
-            return [('JUMP', current_loop['start'], None, None)]
+            self.loop_jump('start', 'CONTINUE')
         else:
             self.eat(TokenType.SEMICOLON)
 
-        return []
+    def loop_jump(self, target, keyword):
+        """Salto para o início ('start') ou o fim ('end') do laço mais interno"""
+        if not self.loop_stack:
+            raise Exception(f"{keyword} outside of loop")
+
+        current_loop = self.loop_stack[-1]
+        self.ir.emit('JUMP', current_loop[target])
 
     def procForStmt(self):
         """<forStmt> -> 'for' <atrib> 'to' <endFor> 'do' <stmt> ;"""
         self.eat(TokenType.RESERVED_WORD_FOR)
 
-        init_cmds = self.procAtrib()
-        var_name = init_cmds[-1][1]
+        var_name = self.procAtrib()
 
         self.eat(TokenType.RESERVED_WORD_TO)
 
-        end_cmds, end_value = self.procEndFor()
+        end_value = self.procEndFor()
+
+        self.eat(TokenType.RESERVED_WORD_DO)
+
+        loop = self.begin_for(var_name, end_value)
+        self.procStmt()
+        self.end_for(loop)
 
+    def begin_for(self, var_name, end_value):
+        """Gera o início do for, antes do corpo; retorna o estado passado a end_for"""
         for_counter = self.generate_label()
         loop_start = f'FOR_START_{for_counter}'
         loop_end = f'FOR_END_{for_counter}'
@@ -360,14 +456,17 @@ class Syntatic:
             'type': 'FOR'
         })
 
-        self.eat(TokenType.RESERVED_WORD_DO)
+        self.ir.emit('LABEL', loop_start)
 
-        body_cmds = self.procStmt()
-        commands = []
+        # O teste usa um label e uma temporária criados depois do corpo
+        test = self.ir.reserve(3)
 
-        commands.extend(init_cmds)
+        return var_name, end_value, loop_start, loop_end, test
 
-        commands.append(('LABEL', loop_start, None, None))
+    def end_for(self, loop):
+        """Preenche o teste e gera o incremento do for, depois do corpo"""
+        var_name, end_value, loop_start, loop_end, test = loop
+        ir = self.ir
 
         if_counter = self.generate_label()
         then_label = f'IF_BODY_{if_counter}'
@@ -375,50 +474,43 @@ class Syntatic:
         temp_var = self.generate_temp_var()
         self.add_variable(temp_var, 'integer')
 
-        commands.append(('LEQ', temp_var, var_name, end_value))
-        commands.append(('IF', temp_var, then_label, loop_end))
-
-        commands.append(('LABEL', then_label, None, None))
-
-        commands.extend(body_cmds)
+        ir.patch(test, 'LEQ', temp_var, var_name, end_value)
+        ir.patch(test + 1, 'IF', temp_var, then_label, loop_end)
+        ir.patch(test + 2, 'LABEL', then_label)
 
         temp_increment = self.generate_temp_var()
         self.add_variable(temp_increment, 'integer')
 
-        commands.append(('ADD', temp_increment, var_name, '1'))
-        commands.append(('ATT', var_name, temp_increment, None))
+        ir.emit('ADD', temp_increment, var_name, ONE)
+        ir.emit('ATT', var_name, temp_increment)
 
-        commands.append(('JUMP', loop_start, None, None))
+        ir.emit('JUMP', loop_start)
 
-        commands.append(('LABEL', loop_end, None, None))
+        ir.emit('LABEL', loop_end)
 
         self.loop_stack.pop()
 
-        return commands
-
     def procEndFor(self):
         """<endFor> -> 'IDENT' | 'NUMint' ;"""
         if self.current_token.token_type == TokenType.VARIABLE:
             value = self.current_token.lexeme
             self.eat(TokenType.VARIABLE)
-            return [], value
+            return self.variable_operand(value)[0]
         elif self.current_token.token_type == TokenType.DECIMAL:
             value = self.current_token.lexeme
             self.eat(TokenType.DECIMAL)
-            return [], f"'{value}'"
+            return self.number_operand(value)[0]
         elif self.current_token.token_type == TokenType.OCTAL:
             value = self.current_token.lexeme
             self.eat(TokenType.OCTAL)
-            return [], f"'{value}'"
+            return self.number_operand(value)[0]
         else:  # HEXADECIMAL
             value = self.current_token.lexeme
             self.eat(TokenType.HEXADECIMAL)
-            return [], f"'{value}'"
+            return self.number_operand(value)[0]
 
     def procIoStmt(self):
         """<ioStmt> -> 'read' '(' 'IDENT' ')' ';' | 'write' '(' <outList> ')' ';' | 'readln' '(' 'IDENT' ')' ';' | 'writeln' '(' <outList> ')' ';' ;"""
-        aux = []
-
         if self.current_token.token_type == TokenType.RESERVED_WORD_READ:
             self.eat(TokenType.RESERVED_WORD_READ)
             self.eat(TokenType.OPEN_PARENTHESES)
@@ -426,7 +518,7 @@ class Syntatic:
             self.eat(TokenType.VARIABLE)
             self.eat(TokenType.CLOSE_PARENTHESES)
             self.eat(TokenType.SEMICOLON)
-            aux.append(('CALL', 'read', var_name, None))
+            self.read(var_name)
         elif self.current_token.token_type == TokenType.RESERVED_WORD_READLN:
             self.eat(TokenType.RESERVED_WORD_READLN)
             self.eat(TokenType.OPEN_PARENTHESES)
@@ -434,62 +526,66 @@ class Syntatic:
             self.eat(TokenType.VARIABLE)
             self.eat(TokenType.CLOSE_PARENTHESES)
             self.eat(TokenType.SEMICOLON)
-            aux.append(('CALL', 'read', var_name, None))
-            aux.append(('CALL', 'write', '\n', None))
+            self.read(var_name)
+            self.write(NEWLINE)
         elif self.current_token.token_type == TokenType.RESERVED_WORD_WRITE:
             self.eat(TokenType.RESERVED_WORD_WRITE)
             self.eat(TokenType.OPEN_PARENTHESES)
-            aux.extend(self.procOutList())
+            self.procOutList()
             self.eat(TokenType.CLOSE_PARENTHESES)
             self.eat(TokenType.SEMICOLON)
         else:  # WRITELN
             self.eat(TokenType.RESERVED_WORD_WRITELN)
             self.eat(TokenType.OPEN_PARENTHESES)
-            aux.extend(self.procOutList())
-            aux.append(('CALL', 'write', '\n', None))
+            self.procOutList()
+            self.write(NEWLINE)
             self.eat(TokenType.CLOSE_PARENTHESES)
             self.eat(TokenType.SEMICOLON)
 
-        return aux
-
     def procOutList(self):
         """
             <outList> -> <out> <restoOutList> ;
         """
-
-        aux = []
-
-        aux.extend(self.procOut())
-        aux.extend(self.procRestoOutList())
-
-        return aux
+        self.procOut()
+        self.procRestoOutList()
 
     def procRestoOutList(self):
         """
             <restoOutList> -> ',' <outList> | & ;
         """
-
         if self.current_token.token_type == TokenType.COMMA:
             self.eat(TokenType.COMMA)
-            return self.procOutList()
-        else:
-            return []
+            self.procOutList()
 
     def procOut(self):
         """<out> -> 'STR' | 'IDENT' | 'NUMint' | 'NUMfloat' ;"""
-        command = []
-
         if self.current_token.token_type == TokenType.STRING:
-            command.append(('CALL', 'write', self.current_token.lexeme, None))
+            self.write(self.output_operand(self.current_token))
             self.eat(TokenType.STRING)
         elif self.current_token.token_type == TokenType.VARIABLE:
-            command.append(('CALL', 'write', self.current_token.lexeme, None))
+            self.write(self.output_operand(self.current_token))
             self.eat(TokenType.VARIABLE)
         elif self.current_token.token_type in [TokenType.DECIMAL, TokenType.OCTAL, TokenType.HEXADECIMAL, TokenType.FLOAT]:
-            command.append(('CALL', 'write', self.current_token.lexeme, None))
+            self.write(self.output_operand(self.current_token))
             self.eat(self.current_token.token_type)
 
-        return command
+    def output_operand(self, token: Token):
+        """Operando escrito por um <out>: o lexema, como literal quando não é uma variável"""
+        if token.token_type == TokenType.VARIABLE:
+            return token.lexeme
+
+        if token.token_type == TokenType.STRING:
+            return self.constant(token.lexeme, StringConstant)
+
+        return self.constant(token.lexeme, number_constant)
+
+    def read(self, var_name):
+        """Gera a leitura de uma variável"""
+        self.ir.emit('CALL', 'read', var_name)
+
+    def write(self, value):
+        """Gera a escrita de um lexema (string, variável ou número) ou de '\\n'"""
+        self.ir.emit('CALL', 'write', value)
 
     def procWhileStmt(self):
         """
@@ -497,6 +593,16 @@ class Syntatic:
         """
         self.eat(TokenType.RESERVED_WORD_WHILE)
 
+        loop = self.begin_while()
+        condition_result = self.procExpr()
+        self.while_condition(loop, condition_result)
+
+        self.eat(TokenType.RESERVED_WORD_DO)
+        self.procStmt()
+        self.end_while(loop)
+
+    def begin_while(self):
+        """Gera o início do while, antes da condição; retorna os labels do laço"""
         while_counter = self.generate_label()
         loop_start = f'WHILE_START_{while_counter}'
         loop_end = f'WHILE_END_{while_counter}'
@@ -506,74 +612,85 @@ class Syntatic:
             'end': loop_end,
             'type': 'WHILE'
         })
-        commands = []
 
-        commands.append(('LABEL', loop_start, None, None))
-        condition_cmds, condition_result = self.procExpr()
-        commands.extend(condition_cmds)
+        self.ir.emit('LABEL', loop_start)
+        return loop_start, loop_end
 
+    def while_condition(self, loop, condition_result):
+        """Gera o teste da condição do while"""
         if_counter = self.generate_label()
         then_label = f'IF_BODY_{if_counter}'
 
-        commands.append(('IF', condition_result, then_label, loop_end))
+        self.ir.emit('IF', condition_result, then_label, loop[1])
+        self.ir.emit('LABEL', then_label)
 
-        commands.append(('LABEL', then_label, None, None))
+    def end_while(self, loop):
+        """Gera o salto de volta e o fim do while, depois do corpo"""
+        loop_start, loop_end = loop
 
-        self.eat(TokenType.RESERVED_WORD_DO)
-        body_cmds = self.procStmt()
-        commands.extend(body_cmds)
-        commands.append(('JUMP', loop_start, None, None))
-        commands.append(('LABEL', loop_end, None, None))
+        self.ir.emit('JUMP', loop_start)
+        self.ir.emit('LABEL', loop_end)
 
         self.loop_stack.pop()
 
-        return commands
-
     def procIfStmt(self):
         """<ifStmt> -> 'if' <expr> 'then' <stmt> <elsePart> ;"""
         self.eat(TokenType.RESERVED_WORD_IF)
-        if_counter = self.generate_label()
-        then_label = f'IF_BODY_{if_counter}'
-        end_label = f'IF_END_{if_counter}'
+        state = self.begin_if()
 
-        commands = []
-
-        condition_cmds, condition_result = self.procExpr()
-        commands.extend(condition_cmds)
+        condition_result = self.procExpr()
 
         self.eat(TokenType.RESERVED_WORD_THEN)
 
-        then_cmds = self.procStmt()
+        self.if_then(state, condition_result)
+        self.procStmt()
+
+        self.if_else(state)
+        self.procElsePart()
+
+        self.end_if(state)
 
-        else_cmds = self.procElsePart()
+    def begin_if(self):
+        """Início do if, antes da condição; retorna o estado passado aos demais passos"""
+        # [contador do label, condição, posição do IF, posição do salto do else]
+        return [self.generate_label(), None, None, None]
 
-        if else_cmds:
+    def if_then(self, state, condition_result):
+        """Antes do then: o destino do IF depende de haver código no else"""
+        state[1] = condition_result
+        state[2] = self.ir.reserve(2)
+
+    def if_else(self, state):
+        """Entre o then e o else"""
+        state[3] = self.ir.reserve(2)
+
+    def end_if(self, state):
+        """Preenche o IF e o salto reservados antes do then e do else, depois do else"""
+        if_counter, condition_result, branch, else_jump = state
+        ir = self.ir
+        then_label = f'IF_BODY_{if_counter}'
+        end_label = f'IF_END_{if_counter}'
+
+        if len(ir) > else_jump + 2:
             else_label = f'IF_ELSE_{if_counter}'
-            commands.append(('IF', condition_result, then_label, else_label))
-            commands.append(('LABEL', then_label, None, None))
-            commands.extend(then_cmds)
-            commands.append(('JUMP', end_label, None, None))
-            commands.append(('LABEL', else_label, None, None))
-            commands.extend(else_cmds)
-            commands.append(('LABEL', end_label, None, None))
+            ir.patch(branch, 'IF', condition_result, then_label, else_label)
+            ir.patch(else_jump, 'JUMP', end_label)
+            ir.patch(else_jump + 1, 'LABEL', else_label)
         else:
-            commands.append(('IF', condition_result, then_label, end_label))
-            commands.append(('LABEL', then_label, None, None))
-            commands.extend(then_cmds)
-            commands.append(('LABEL', end_label, None, None))
+            ir.truncate(else_jump)
+            ir.patch(branch, 'IF', condition_result, then_label, end_label)
 
-        return commands
+        ir.patch(branch + 1, 'LABEL', then_label)
+        ir.emit('LABEL', end_label)
 
     def procElsePart(self):
         """<elsePart> -> 'else' <stmt> | & ;"""
         if self.current_token.token_type == TokenType.RESERVED_WORD_ELSE:
             self.eat(TokenType.RESERVED_WORD_ELSE)
-            return self.procStmt()
-        else:
-            return []
+            self.procStmt()
 
     def procAtrib(self):
-        """<atrib> -> 'IDENT' ':=' <expr> ;"""
+        """<atrib> -> 'IDENT' ':=' <expr> ; retorna a variável atribuída"""
         var_name = self.current_token.lexeme
 
         self.check_variable_declared(var_name)
@@ -581,8 +698,18 @@ class Syntatic:
         self.eat(TokenType.VARIABLE)
         self.eat(TokenType.OPERATOR_ASSIGN)
 
-        expr_cmds, expr_result = self.procExpr()
+        expr_result = self.procExpr()
+
+        self.assign(var_name, expr_result)
+        return var_name
 
+    def assign(self, var_name, expr_result):
+        """Verifica os tipos e gera a atribuição"""
+        self.check_assign(var_name, expr_result)
+        self.ir.emit('ATT', var_name, expr_result)
+
+    def check_assign(self, var_name, expr_result):
+        """Registra um erro semântico se o valor não pode ser atribuído à variável"""
         var_type = self.get_variable_type(var_name)
         expr_type = self.get_expression_type(expr_result)
 
@@ -590,361 +717,189 @@ class Syntatic:
             self.semantic_errors.append(
                 f"Type mismatch: cannot assign {expr_type} to {var_type} variable '{var_name}'")
 
-        att_cmd = ('ATT', var_name, expr_result, None)
-        return expr_cmds + [att_cmd]
-
     def procExpr(self):
-        """<expr> -> <or> ;"""
-        return self.procOr()
-
-    def procOr(self):
-        """<or> -> <and> <restoOr> ;"""
-        left_cmds, left_result = self.procAnd()
-        return self.procRestoOr(left_cmds, left_result)
-
-    def procRestoOr(self, left_cmds, left_result):
-        """<restoOr> -> 'or' <and> <restoOr> | & ;"""
-
-        if self.current_token.token_type == TokenType.OPERATOR_OR:
-            self.eat(TokenType.OPERATOR_OR)
-            right_cmds, right_result = self.procAnd()
-
-            temp_var = self.generate_temp_var()
-            self.add_variable(temp_var, 'boolean')
-
-            or_cmd = ('OR', temp_var, left_result, right_result)
-
-            all_cmds = left_cmds + right_cmds + [or_cmd]
-            return self.procRestoOr(all_cmds, temp_var)
-        else:
-            return left_cmds, left_result  # Sem mais operações OR
-
-    def procAnd(self):
-        """<and> -> <not> <restoAnd> ;"""
-        left_cmds, left_result = self.procNot()
-        return self.procRestoAnd(left_cmds, left_result)
-
-    def procRestoAnd(self, left_cmds, left_result):
-        """<restoAnd> -> 'and' <not> <restoAnd> | & ;"""
-
-        if self.current_token.token_type == TokenType.OPERATOR_AND:
-            self.eat(TokenType.OPERATOR_AND)
-            right_cmds, right_result = self.procNot()
-
-            temp_var = self.generate_temp_var()
-            self.add_variable(temp_var, 'boolean')
-
-            and_cmd = ('AND', temp_var, left_result, right_result)
-
-            all_cmds = left_cmds + right_cmds + [and_cmd]
-            return self.procRestoAnd(all_cmds, temp_var)
-        else:
-            return left_cmds, left_result  # Sem mais operações AND
-
-    def procNot(self):
-        """<not> -> 'not' <not> | <rel> ;"""
-        if self.current_token.token_type == TokenType.OPERATOR_NOT:
-            self.eat(TokenType.OPERATOR_NOT)
-            cmds, result = self.procNot()
-
-            temp_var = self.generate_temp_var()
-            self.add_variable(temp_var, 'boolean')
-
-            not_cmd = ('NOT', temp_var, result, None)
-
-            return cmds + [not_cmd], temp_var
-        else:
-            return self.procRel()
-
-    def procRel(self):
-        """<rel> -> <add> <restoRel> ;"""
-        left_cmds, left_result = self.procAdd()
-        return self.procRestoRel(left_cmds, left_result)
-
-    def procRestoRel(self, left_cmds, left_result):
-        """<restoRel> -> '==' <add> | '' <add> | '<' <add> | '<=' <add> | '>' <add> | '>=' <add> | & ;"""
-
-        if self.current_token.token_type == TokenType.OPERATOR_EQUAL:
-            self.eat(TokenType.OPERATOR_EQUAL)
-            right_cmds, right_result = self.procAdd()
-
-            temp_var = self.generate_temp_var()
-            self.add_variable(temp_var, 'boolean')
-
-            eq_cmd = ('EQ', temp_var, left_result, right_result)
-
-            all_cmds = left_cmds + right_cmds + [eq_cmd]
-            return all_cmds, temp_var
-
-        elif self.current_token.token_type == TokenType.OPERATOR_NOT_EQUAL:
-            self.eat(TokenType.OPERATOR_NOT_EQUAL)
-            right_cmds, right_result = self.procAdd()
-
-            temp_var = self.generate_temp_var()
-            self.add_variable(temp_var, 'boolean')
-
-            neq_cmd = ('NEQ', temp_var, left_result, right_result)
-
-            all_cmds = left_cmds + right_cmds + [neq_cmd]
-            return all_cmds, temp_var
-
-        elif self.current_token.token_type == TokenType.OPERATOR_LESS:
-            self.eat(TokenType.OPERATOR_LESS)
-            right_cmds, right_result = self.procAdd()
-
-            temp_var = self.generate_temp_var()
-            self.add_variable(temp_var, 'boolean')
-
-            less_cmd = ('LESS', temp_var, left_result, right_result)
-
-            all_cmds = left_cmds + right_cmds + [less_cmd]
-            return all_cmds, temp_var
-
-        elif self.current_token.token_type == TokenType.OPERATOR_LESS_EQUAL:
-            self.eat(TokenType.OPERATOR_LESS_EQUAL)
-            right_cmds, right_result = self.procAdd()
-
-            temp_var = self.generate_temp_var()
-            self.add_variable(temp_var, 'boolean')
-
-            leq_cmd = ('LEQ', temp_var, left_result, right_result)
-
-            all_cmds = left_cmds + right_cmds + [leq_cmd]
-            return all_cmds, temp_var
-
-        elif self.current_token.token_type == TokenType.OPERATOR_GREATER:
-            self.eat(TokenType.OPERATOR_GREATER)
-            right_cmds, right_result = self.procAdd()
-
-            temp_var = self.generate_temp_var()
-            self.add_variable(temp_var, 'boolean')
-
-            gret_cmd = ('GRET', temp_var, left_result, right_result)
-
-            all_cmds = left_cmds + right_cmds + [gret_cmd]
-            return all_cmds, temp_var
-
-        elif self.current_token.token_type == TokenType.OPERATOR_GREATER_EQUAL:
-            self.eat(TokenType.OPERATOR_GREATER_EQUAL)
-            right_cmds, right_result = self.procAdd()
-
-            temp_var = self.generate_temp_var()
-            self.add_variable(temp_var, 'boolean')
-
-            geq_cmd = ('GEQ', temp_var, left_result, right_result)
-
-            all_cmds = left_cmds + right_cmds + [geq_cmd]
-            return all_cmds, temp_var
-        else:
-            return left_cmds, left_result  # Sem comparação
-
-    def procAdd(self):
-        """<add> -> <mult> <restoAdd> ;"""
-        left_cmds, left_result = self.procMult()
-        return self.procRestoAdd(left_cmds, left_result)
-
-    def procRestoAdd(self, left_cmds, left_result):
-        """<restoAdd> -> '+' <mult> <restoAdd> | '-' <mult> <restoAdd> | & """
-
-        if self.current_token.token_type == TokenType.OPERATOR_PLUS:
-            self.eat(TokenType.OPERATOR_PLUS)
-            right_cmds, right_result = self.procMult()
-
-            left_type = self.get_expression_type(left_result)
-            right_type = self.get_expression_type(right_result)
-
-            if not self.types_compatible(left_type, right_type):
-                raise TypeError(
-                    f"Incompatible types: {left_type} and {right_type} in ADD operation")
-
-            temp_var = self.generate_temp_var()
-            self.add_variable(
-                temp_var, self.get_majority_type(left_type, right_type))
-
-            add_cmd = ('ADD', temp_var, left_result, right_result)
-
-            all_cmds = left_cmds + right_cmds + [add_cmd]
-            return self.procRestoAdd(all_cmds, temp_var)
-
-        elif self.current_token.token_type == TokenType.OPERATOR_MINUS:
-            self.eat(TokenType.OPERATOR_MINUS)
-            right_cmds, right_result = self.procMult()
-
-            left_type = self.get_expression_type(left_result)
-            right_type = self.get_expression_type(right_result)
-
-            if left_type == 'string' or right_type == 'string':
-                raise TypeError(
-                    f"Cannot perform subtraction on string types")
-
-            if not self.types_compatible(left_type, right_type):
-                raise TypeError(
-                    f"Incompatible types: {left_type} and {right_type} in SUB operation")
-
-            temp_var = self.generate_temp_var()
-            self.add_variable(
-                temp_var, self.get_majority_type(left_type, right_type))
-
-            sub_cmd = ('SUB', temp_var, left_result, right_result)
-
-            all_cmds = left_cmds + right_cmds + [sub_cmd]
-            return self.procRestoAdd(all_cmds, temp_var)
-        else:
-            return left_cmds, left_result  # Sem mais operações
-
-    def procMult(self):
-        """<mult> -> <uno> <restoMult> ;"""
-        left_cmds, left_result = self.procUno()
-        return self.procRestoMult(left_cmds, left_result)
-
-    def procRestoMult(self, left_cmds, left_result):
-        """<restoMult> -> '*' <uno> <restoMult> | '/' <uno> <restoMult> | 'mod' <uno> <restoMult> | 'div' <uno> <restoMult> | & ;"""
-
-        if self.current_token.token_type == TokenType.OPERATOR_MULTIPLY:
-            self.eat(TokenType.OPERATOR_MULTIPLY)
-            right_cmds, right_result = self.procUno()
-
-            left_type = self.get_expression_type(left_result)
-            right_type = self.get_expression_type(right_result)
-
-            if left_type == 'string' or right_type == 'string':
-                raise TypeError(
-                    f"Cannot perform multiplication on string types")
-
-            if not self.types_compatible(left_type, right_type):
-                raise TypeError(
-                    f"Incompatible types: {left_type} and {right_type} in MULT operation")
-
-            temp_var = self.generate_temp_var()
-            self.add_variable(
-                temp_var, self.get_majority_type(left_type, right_type))
-
-            mult_cmd = ('MULT', temp_var, left_result, right_result)
-
-            all_cmds = left_cmds + right_cmds + [mult_cmd]
-            return self.procRestoMult(all_cmds, temp_var)
-
-        elif self.current_token.token_type == TokenType.OPERATOR_DIVIDE:
-            self.eat(TokenType.OPERATOR_DIVIDE)
-            right_cmds, right_result = self.procUno()
-
-            left_type = self.get_expression_type(left_result)
-            right_type = self.get_expression_type(right_result)
-
-            if left_type == 'string' or right_type == 'string':
-                raise TypeError(
-                    f"Cannot perform division on string types")
+        """
+        <expr> -> <or> ; retorna o operando com o resultado
+
+            <or>    -> <and> { 'or' <and> } ;
+            <and>   -> <not> { 'and' <not> } ;
+            <not>   -> 'not' <not> | <rel> ;
+            <rel>   -> <add> [ ( '==' | '<>' | '<' | '<=' | '>' | '>=' ) <add> ] ;
+            <add>   -> <mult> { ( '+' | '-' ) <mult> } ;
+            <mult>  -> <uno> { ( '*' | '/' | 'mod' | 'div' ) <uno> } ;
+            <uno>   -> '+' <uno> | '-' <uno> | <fator> ;
+            <fator> -> 'NUMint' | 'NUMfloat' | 'IDENT' | '(' <expr> ')' | 'STR' ;
+
+        Analisado por precedência (precedence climbing) com os níveis de
+        BINARY_OPS. Operadores binários, 'not' e parênteses pendentes ficam em
+        uma pilha explícita, então o aninhamento não depende da pilha do Python.
+        """
+        stack = []
+        min_level = OR_LEVEL
+
+        while True:
+            # Operando: prefixos 'not', sinais e '(' empilham até chegar a um fator
+            token_type = self.current_token.token_type
+
+            if token_type == TokenType.OPERATOR_NOT and min_level <= NOT_LEVEL:
+                self.advance_prefix()
+                stack.append((NOT_FRAME, min_level, None, None))
+                min_level = NOT_LEVEL
+                continue
+
+            signs = []
+
+            while token_type == TokenType.OPERATOR_PLUS or token_type == TokenType.OPERATOR_MINUS:
+                signs.append(token_type == TokenType.OPERATOR_MINUS)
+                self.advance_prefix()
+                token_type = self.current_token.token_type
+
+            if token_type == TokenType.OPEN_PARENTHESES:
+                self.advance_prefix()
+                stack.append((PAREN_FRAME, min_level, signs, None))
+                min_level = OR_LEVEL
+                continue
+
+            # Tipo do operando quando já conhecido (literais numéricos e
+            # temporárias); None para variáveis e strings, que são verificadas
+            # por get_expression_type a cada uso, como antes
+            left, left_type = self.procFactor()
+            if signs:
+                left, left_type = self.apply_signs(signs, left, left_type)
+            level = ATOM_LEVEL
+
+            # Operadores: empilha o próximo se couber no nível atual; senão
+            # reduz o que está no topo da pilha
+            while True:
+                operation = BINARY_OPS.get(self.current_token.token_type)
+
+                # Comparações não se encadeiam: 'a < b < c' termina em 'a < b'
+                if operation is not None and operation[0] >= min_level and (operation[0] != REL_LEVEL or level > REL_LEVEL):
+                    self.advance()
+                    stack.append((BINARY_FRAME, min_level, (left, left_type), operation))
+                    min_level = operation[0] + 1
+                    break
+
+                if not stack:
+                    return left
+
+                kind, min_level, data, operation = stack.pop()
+
+                if kind == BINARY_FRAME:
+                    level, op = operation
+                    left, left_type = self.emit_binary(op, level, data[0], data[1], left, left_type)
+                elif kind == NOT_FRAME:
+                    left, left_type = self.emit_not(left)
+                    level = NOT_LEVEL
+                else:
+                    self.eat(TokenType.CLOSE_PARENTHESES)
+                    if data:
+                        left, left_type = self.apply_signs(data, left, left_type)
+                    level = ATOM_LEVEL
 
-            if not self.types_compatible(left_type, right_type):
-                raise TypeError(
-                    f"Incompatible types: {left_type} and {right_type} in DIV operation")
+    def advance_prefix(self):
+        """Consome um prefixo de operando; sem mais tokens o prefixo se repetiria para sempre"""
+        self.advance()
 
-            temp_var = self.generate_temp_var()
-            self.add_variable(
-                temp_var, self.get_majority_type(left_type, right_type))
+        if self.exhausted:
+            raise Exception("Unexpected end of input")
 
-            div_cmd = ('DIV', temp_var, left_result, right_result)
+    def emit_binary(self, op, level, left_result, left_type, right_result, right_type):
+        """
+        Verifica os tipos e gera a instrução de uma operação binária. Tipos
+        None são obtidos com get_expression_type. Retorna a temporária e seu tipo.
+        """
+        result_type = self.binary_type(op, level, left_result, left_type, right_result, right_type)
 
-            all_cmds = left_cmds + right_cmds + [div_cmd]
-            return self.procRestoMult(all_cmds, temp_var)
+        temp_var = self.generate_temp_var()
+        self.add_variable(temp_var, result_type)
 
-        elif self.current_token.token_type == TokenType.OPERATOR_MOD:
-            self.eat(TokenType.OPERATOR_MOD)
-            right_cmds, right_result = self.procUno()
+        self.ir.emit(op, temp_var, left_result, right_result)
+        return temp_var, result_type
 
-            left_type = self.get_expression_type(left_result)
-            right_type = self.get_expression_type(right_result)
+    def binary_type(self, op, level, left_result, left_type, right_result, right_type):
+        """Tipo do resultado de uma operação binária; levanta TypeError se os operandos não combinam"""
+        if level >= ADD_LEVEL:
+            if left_type is None:
+                left_type = self.get_expression_type(left_result)
+            if right_type is None:
+                right_type = self.get_expression_type(right_result)
 
-            if left_type == 'string' or right_type == 'string':
+            if op != 'ADD' and (left_type == 'string' or right_type == 'string'):
                 raise TypeError(
-                    f"Cannot perform modulo on string types")
+                    f"Cannot perform {OPERATION_NAMES[op]} on string types")
 
             if not self.types_compatible(left_type, right_type):
                 raise TypeError(
-                    f"Incompatible types: {left_type} and {right_type} in MOD operation")
-
-            temp_var = self.generate_temp_var()
-            self.add_variable(
-                temp_var, self.get_majority_type(left_type, right_type))
-
-            mod_cmd = ('MOD', temp_var, left_result, right_result)
-
-            all_cmds = left_cmds + right_cmds + [mod_cmd]
-            return self.procRestoMult(all_cmds, temp_var)
-
-        elif self.current_token.token_type == TokenType.OPERATOR_INTEGER_DIVIDER:
-            self.eat(TokenType.OPERATOR_INTEGER_DIVIDER)
-            right_cmds, right_result = self.procUno()
-
-            left_type = self.get_expression_type(left_result)
-            right_type = self.get_expression_type(right_result)
-
-            if left_type == 'string' or right_type == 'string':
-                raise TypeError(
-                    f"Cannot perform integer division on string types")
+                    f"Incompatible types: {left_type} and {right_type} in {op} operation")
 
-            if not self.types_compatible(left_type, right_type):
-                raise TypeError(
-                    f"Incompatible types: {left_type} and {right_type} in IDIV operation")
+            return self.get_majority_type(left_type, right_type)
 
-            temp_var = self.generate_temp_var()
-            self.add_variable(
-                temp_var, self.get_majority_type(left_type, right_type))
+        return 'boolean'
 
-            idiv_cmd = ('IDIV', temp_var, left_result, right_result)
+    def emit_not(self, operand):
+        """Gera a negação lógica; retorna a temporária e seu tipo"""
+        temp_var = self.generate_temp_var()
+        self.add_variable(temp_var, 'boolean')
 
-            all_cmds = left_cmds + right_cmds + [idiv_cmd]
-            return self.procRestoMult(all_cmds, temp_var)
-        else:
-            return left_cmds, left_result  # Sem mais operações
+        self.ir.emit('NOT', temp_var, operand)
+        return temp_var, 'boolean'
 
-    def procUno(self):
-        """<uno> -> '+' <uno> | '-' <uno> | <fator> ;"""
-        if self.current_token.token_type == TokenType.OPERATOR_PLUS:
-            self.eat(TokenType.OPERATOR_PLUS)
-            return self.procUno()  # +5 é igual a 5
-        elif self.current_token.token_type == TokenType.OPERATOR_MINUS:
-            self.eat(TokenType.OPERATOR_MINUS)
-            cmds, result = self.procUno()
+    def apply_signs(self, signs, result, result_type):
+        """Aplica os sinais unários, do mais interno ao mais externo; '+' não gera código"""
+        for negative in reversed(signs):
+            if negative:
+                result, result_type = self.negate(result)
 
-            # Para -numero, fazemos SUB(temp, 0, numero)
-            temp_var = self.generate_temp_var()
-            self.add_variable(temp_var, 'integer')
+        return result, result_type
 
-            sub_cmd = ('SUB', temp_var, '0', result)
+    def negate(self, operand):
+        """Gera o sinal '-'; retorna a temporária e seu tipo"""
+        # Para -numero, fazemos SUB(temp, 0, numero)
+        temp_var = self.generate_temp_var()
+        self.add_variable(temp_var, 'integer')
 
-            return cmds + [sub_cmd], temp_var
-        else:
-            return self.procFactor()
+        self.ir.emit('SUB', temp_var, ZERO, operand)
+        return temp_var, 'integer'
 
     def procFactor(self):
-        """<fator> -> 'NUMint' | 'NUMfloat' | 'IDENT' | '(' <expr> ')' | 'STR' ;"""
-        if self.current_token.token_type == TokenType.DECIMAL:
-            value = self.current_token.lexeme
-            self.eat(TokenType.DECIMAL)
-            return [], f"'{value}'"
-        elif self.current_token.token_type == TokenType.OCTAL:
-            value = self.current_token.lexeme
-            self.eat(TokenType.OCTAL)
-            return [], f"'{value}'"
-        elif self.current_token.token_type == TokenType.HEXADECIMAL:
-            value = self.current_token.lexeme
-            self.eat(TokenType.HEXADECIMAL)
-            return [], f"'{value}'"
-        elif self.current_token.token_type == TokenType.FLOAT:
+        """
+        <fator> -> 'NUMint' | 'NUMfloat' | 'IDENT' | 'STR' ; os parênteses são tratados em procExpr.
+        Retorna o operando e o tipo dos literais numéricos (None nos demais).
+        """
+        token_type = self.current_token.token_type
+
+        if token_type in NUMBER_TYPES:
             value = self.current_token.lexeme
-            self.eat(TokenType.FLOAT)
-            return [], f"'{value}'"
-        elif self.current_token.token_type == TokenType.VARIABLE:
+            self.eat(token_type)
+            return self.number_operand(value)
+        elif token_type == TokenType.VARIABLE:
             value = self.current_token.lexeme
             self.eat(TokenType.VARIABLE)
-            return [], value
-        elif self.current_token.token_type == TokenType.OPEN_PARENTHESES:
-            self.eat(TokenType.OPEN_PARENTHESES)
-            expr_cmds, expr_result = self.procExpr()
-            self.eat(TokenType.CLOSE_PARENTHESES)
-            return expr_cmds, expr_result
+            return self.variable_operand(value)
         else:  # STRING
             value = self.current_token.lexeme
             self.eat(TokenType.STRING)
-            return [], value
+            return self.string_operand(value)
+
+    def constant(self, text, kind=number_constant):
+        """Operando literal com o texto dado; kind cria o Constant na primeira vez"""
+        constant = self.constants.get(text)
+
+        if constant is None:
+            constant = self.constants[text] = kind(text)
+
+        return constant
+
+    def number_operand(self, value):
+        """Operando e tipo de um literal numérico; o tipo é real quando o lexema tem '.'"""
+        constant = self.constant(f"'{value}'")
+        return constant, constant.type
+
+    def variable_operand(self, value):
+        """Operando de uma variável; o tipo é verificado a cada uso, por get_expression_type"""
+        return value, None
+
+    def string_operand(self, value):
+        """Operando e tipo de um literal string; value é o lexema, com as aspas"""
+        return self.constant(value, StringConstant), 'string'
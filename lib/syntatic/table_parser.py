@@ -0,0 +1,271 @@
+from pathlib import Path
+
+from lib.lexical.token_type import TokenType
+from lib.syntatic.grammar import Action, Grammar, ParseTable
+from lib.syntatic.operands import NEWLINE
+from lib.syntatic.syntatic import Syntatic, OPERATION_LEVELS
+from lib.syntatic.token_cursor import TokenCursor
+
+
+GRAMMAR_FILE = Path(__file__).with_name("pascal.grammar")
+
+DEFAULT_TABLE = ParseTable(Grammar.load(GRAMMAR_FILE))
+
+
+class ParseRow(dict):
+    """
+    Linha da tabela pronta para a análise: tipo do token -> símbolos da
+    alternativa em ordem inversa, para serem empilhados de uma vez. Todos os
+    tipos de token têm entrada.
+    """
+
+    __slots__ = ("name",)
+
+    def __init__(self, name: str):
+        super().__init__()
+        self.name = name
+
+
+def compile_rows(table: ParseTable, parser_class: type) -> ParseRow:
+    """
+    Converte a tabela em linhas ParseRow, trocando não terminais por suas
+    linhas e ações pelos métodos action_* de parser_class. Retorna a linha
+    do símbolo inicial.
+
+    Os não terminais no início de cada alternativa já são expandidos com o
+    mesmo token (nenhum token foi consumido antes deles), então cadeias
+    como expr -> and -> not -> ... -> factor custam uma consulta só.
+    """
+    productions = table.grammar.productions
+    rows = {name: ParseRow(name) for name in productions}
+
+    def resolve(symbol):
+        if isinstance(symbol, str):
+            return rows[symbol]
+
+        if isinstance(symbol, Action):
+            method = getattr(parser_class, f"action_{symbol.name}", None)
+            if method is None:
+                raise ValueError(f"Unknown action '#{symbol.name}' in grammar")
+
+            if symbol.arg is None:
+                return method
+
+            arg = symbol.arg
+            return lambda parser: method(parser, arg)
+
+        return symbol
+
+    def expand(symbols, token_type, expanding):
+        """Expande os não terminais iniciais; retorna os símbolos e se algum terminal foi alcançado"""
+        expanded = []
+
+        for i, symbol in enumerate(symbols):
+            if isinstance(symbol, TokenType):
+                expanded.extend(symbols[i:])
+                return expanded, True
+
+            if not isinstance(symbol, str):
+                expanded.append(symbol)
+                continue
+
+            if symbol in expanding:
+                raise ValueError(f"Grammar is not LL(1): '{symbol}' is left recursive")
+
+            alternative = table.alternative(symbol, token_type)
+            prefix, reached = expand(alternative, token_type, expanding | {symbol})
+            expanded.extend(prefix)
+
+            if reached:
+                expanded.extend(symbols[i + 1:])
+                return expanded, True
+
+        return expanded, False
+
+    for name, row in rows.items():
+        for token_type in TokenType:
+            symbols, _ = expand(table.alternative(name, token_type), token_type, {name})
+            row[token_type] = tuple(resolve(symbol) for symbol in reversed(symbols))
+
+    return rows[table.grammar.start]
+
+
+class TableSyntatic(Syntatic):
+    """
+    Syntatic dirigido pela tabela LL(1) gerada de pascal.grammar, com uma
+    pilha explícita de símbolos. As ações semânticas usam os mesmos métodos
+    do Syntatic e geram as mesmas instruções. Operandos e estados dos
+    comandos ficam na pilha de valores values.
+
+    Os erros são os do Syntatic, exceto na entrada truncada: consumir de
+    novo o último token depois do fim da entrada é sempre
+    "Unexpected end of input".
+    """
+
+    table = DEFAULT_TABLE
+    compiled: dict[tuple[type, ParseTable], ParseRow] = {}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.values = []
+        # Último token consumido, lido pelas ações
+        self.matched = self.current_token
+        # Variável da última atribuição, usada pelo for
+        self.assigned = None
+
+        key = (type(self), self.table)
+        if key not in self.compiled:
+            self.compiled[key] = compile_rows(self.table, type(self))
+
+        self.start_row = self.compiled[key]
+
+    def procFunction(self):
+        """<function> analisado pela tabela"""
+        stack = [self.start_row]
+        pop = stack.pop
+        extend = stack.extend
+
+        # Sobre listas e TokenStreams o avanço é feito aqui mesmo, por índice
+        cursor = self.cursor
+        indexed = type(cursor) is TokenCursor
+        tokens = cursor.tokens
+        size = len(tokens) if indexed else 0
+
+        token = self.current_token
+        token_type = token.token_type
+
+        while stack:
+            top = pop()
+            kind = top.__class__
+
+            if kind is ParseRow:
+                extend(top[token_type])
+            elif kind is TokenType:
+                if top is not token_type:
+                    self.eat(top)
+
+                # Sem mais tokens o último se repete; consumi-lo de novo
+                # poderia repetir uma produção para sempre
+                if self.exhausted:
+                    raise Exception("Unexpected end of input")
+
+                self.matched = token
+
+                if indexed:
+                    position = cursor.position
+                    following = tokens[position] if position < size else None
+                    if following is not None:
+                        cursor.position = position + 1
+                else:
+                    following = cursor.next()
+
+                if following is None:
+                    self.exhausted = True
+                else:
+                    token = self.current_token = following
+                    token_type = token.token_type
+            else:
+                top(self)
+
+    def action_program_end(self):
+        self.finish_program()
+
+    def action_first_name(self):
+        self.values.append([self.matched.lexeme])
+
+    def action_name(self):
+        self.values[-1].append(self.matched.lexeme)
+
+    def action_type(self, var_type):
+        self.values.append(var_type)
+
+    def action_declare(self):
+        var_type = self.values.pop()
+        self.declare(self.values.pop(), var_type)
+
+    def action_break(self):
+        self.loop_jump('end', 'BREAK')
+
+    def action_continue(self):
+        self.loop_jump('start', 'CONTINUE')
+
+    def action_for_begin(self):
+        end_value = self.values.pop()
+        self.values.append(self.begin_for(self.assigned, end_value))
+
+    def action_for_end(self):
+        self.end_for(self.values.pop())
+
+    def action_end_variable(self):
+        self.values.append(self.variable_operand(self.matched.lexeme)[0])
+
+    def action_end_number(self):
+        self.values.append(self.number_operand(self.matched.lexeme)[0])
+
+    def action_read(self):
+        self.read(self.matched.lexeme)
+
+    def action_readln(self):
+        self.read(self.matched.lexeme)
+        self.write(NEWLINE)
+
+    def action_write(self):
+        self.write(self.output_operand(self.matched))
+
+    def action_newline(self):
+        self.write(NEWLINE)
+
+    def action_while_begin(self):
+        self.values.append(self.begin_while())
+
+    def action_while_test(self):
+        condition_result = self.values.pop()[0]
+        self.while_condition(self.values[-1], condition_result)
+
+    def action_while_end(self):
+        self.end_while(self.values.pop())
+
+    def action_if_begin(self):
+        self.values.append(self.begin_if())
+
+    def action_if_then(self):
+        condition_result = self.values.pop()[0]
+        self.if_then(self.values[-1], condition_result)
+
+    def action_if_else(self):
+        self.if_else(self.values[-1])
+
+    def action_if_end(self):
+        self.end_if(self.values.pop())
+
+    def action_target(self):
+        var_name = self.matched.lexeme
+        self.check_variable_declared(var_name)
+        self.values.append(var_name)
+
+    def action_atrib(self):
+        expr_result = self.values.pop()[0]
+        var_name = self.values.pop()
+        self.assign(var_name, expr_result)
+        self.assigned = var_name
+
+    def action_binary(self, op):
+        values = self.values
+        right, right_type = values.pop()
+        left, left_type = values[-1]
+        values[-1] = self.emit_binary(op, OPERATION_LEVELS[op], left, left_type, right, right_type)
+
+    def action_not(self):
+        self.values[-1] = self.emit_not(self.values[-1][0])
+
+    def action_negate(self):
+        self.values[-1] = self.negate(self.values[-1][0])
+
+    def action_number(self):
+        self.values.append(self.number_operand(self.matched.lexeme))
+
+    def action_variable(self):
+        self.values.append(self.variable_operand(self.matched.lexeme))
+
+    def action_string(self):
+        self.values.append(self.string_operand(self.matched.lexeme))
@@ -0,0 +1,89 @@
+from collections import deque
+from typing import Iterable, Iterator, Sequence
+
+from lib.lexical.token import Token
+from lib.lexical.token_stream import TokenStream
+
+
+class TokenCursor:
+    """
+    Posição de leitura sobre uma sequência de tokens (lista ou TokenStream).
+    Avançar é O(1) e a sequência não é modificada.
+    """
+
+    def __init__(self, tokens: Sequence[Token]):
+        self.tokens = tokens
+        self.position = 0
+
+    @staticmethod
+    def over(tokens: Sequence[Token] | Iterable[Token]) -> "TokenCursor":
+        """Cursor adequado à entrada: por índice em sequências, com buffer em iteradores"""
+        if isinstance(tokens, (list, tuple, TokenStream)):
+            return TokenCursor(tokens)
+
+        return IteratorCursor(tokens)
+
+    def next(self) -> Token | None:
+        """Consome e retorna o próximo token; None no fim da entrada"""
+        position = self.position
+
+        if position < len(self.tokens):
+            self.position = position + 1
+            return self.tokens[position]
+
+        return None
+
+    def peek(self, k: int = 1) -> Token | None:
+        """k-ésimo token ainda não consumido (peek(1) é o que next() retornaria), sem consumir"""
+        if k < 1:
+            raise ValueError(f"Error: Invalid lookahead {k}")
+
+        position = self.position + k - 1
+
+        if position < len(self.tokens):
+            return self.tokens[position]
+
+        return None
+
+    def remaining(self) -> list[Token]:
+        """Tokens ainda não consumidos"""
+        return [self.tokens[i] for i in range(self.position, len(self.tokens))]
+
+
+class IteratorCursor(TokenCursor):
+    """Cursor sobre um iterador (como um TokenPipeline); só os tokens espiados ficam em memória"""
+
+    def __init__(self, tokens: Iterable[Token]):
+        super().__init__(())
+        self.iterator: Iterator[Token] = iter(tokens)
+        self.buffer: deque[Token] = deque()
+
+    def next(self) -> Token | None:
+        token = self.buffer.popleft() if self.buffer else next(self.iterator, None)
+
+        if token is not None:
+            self.position += 1
+
+        return token
+
+    def peek(self, k: int = 1) -> Token | None:
+        if k < 1:
+            raise ValueError(f"Error: Invalid lookahead {k}")
+
+        buffer = self.buffer
+
+        while len(buffer) < k:
+            token = next(self.iterator, None)
+
+            if token is None:
+                return None
+
+            buffer.append(token)
+
+        return buffer[k - 1]
+
+    def remaining(self) -> list[Token]:
+        remaining = list(self.buffer)
+        remaining.extend(self.iterator)
+        self.buffer.clear()
+        return remaining
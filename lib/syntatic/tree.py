@@ -0,0 +1,156 @@
+from lib.lexical.symbols import Symbol
+
+
+class Node:
+    """Nó da árvore sintática; os campos são os __slots__ de cada classe"""
+
+    __slots__ = ()
+
+    def __eq__(self, other):
+        return type(self) is type(other) and all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        fields = ", ".join(repr(getattr(self, name)) for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+# Expressões. type é 'integer', 'real', 'string', 'boolean' ou 'unknown'
+
+
+class Number(Node):
+    """Literal numérico; value é o lexema (decimal, octal, hexadecimal ou float)"""
+
+    __slots__ = ("value", "type")
+
+    def __init__(self, value: str, type: str):
+        self.value = value
+        self.type = type
+
+
+class String(Node):
+    """Literal string; value é o lexema, com as aspas"""
+
+    __slots__ = ("value", "type")
+
+    def __init__(self, value: str):
+        self.value = value
+        self.type = 'string'
+
+
+class Variable(Node):
+    """Uso de uma variável, com o tipo declarado"""
+
+    __slots__ = ("name", "type")
+
+    def __init__(self, name: Symbol, type: str):
+        self.name = name
+        self.type = type
+
+
+class Binary(Node):
+    """Operação binária; op é a instrução gerada (ADD, LESS, AND, ...)"""
+
+    __slots__ = ("op", "left", "right", "type")
+
+    def __init__(self, op: str, left: Node, right: Node, type: str):
+        self.op = op
+        self.left = left
+        self.right = right
+        self.type = type
+
+
+class Not(Node):
+    __slots__ = ("operand", "type")
+
+    def __init__(self, operand: Node):
+        self.operand = operand
+        self.type = 'boolean'
+
+
+class Negate(Node):
+    """Sinal '-'; o resultado é sempre integer, como no Syntatic"""
+
+    __slots__ = ("operand", "type")
+
+    def __init__(self, operand: Node):
+        self.operand = operand
+        self.type = 'integer'
+
+
+# Comandos. Corpos são listas de comandos; blocos 'begin ... end' não têm nó próprio
+
+
+class Declaration(Node):
+    __slots__ = ("names", "type")
+
+    def __init__(self, names: list[str], type: str):
+        self.names = names
+        self.type = type
+
+
+class Assign(Node):
+    __slots__ = ("target", "value")
+
+    def __init__(self, target: str, value: Node):
+        self.target = target
+        self.value = value
+
+
+class If(Node):
+    __slots__ = ("condition", "then", "orelse")
+
+    def __init__(self, condition: Node | None = None, then: list[Node] | None = None, orelse: list[Node] | None = None):
+        self.condition = condition
+        self.then = then if then is not None else []
+        self.orelse = orelse if orelse is not None else []
+
+
+class While(Node):
+    __slots__ = ("condition", "body")
+
+    def __init__(self, condition: Node | None = None, body: list[Node] | None = None):
+        self.condition = condition
+        self.body = body if body is not None else []
+
+
+class For(Node):
+    """'for' init 'to' end 'do' body; init é a atribuição inicial da variável de controle"""
+
+    __slots__ = ("init", "end", "body")
+
+    def __init__(self, init: Assign, end: Node, body: list[Node] | None = None):
+        self.init = init
+        self.end = end
+        self.body = body if body is not None else []
+
+
+class Break(Node):
+    __slots__ = ()
+
+
+class Continue(Node):
+    __slots__ = ()
+
+
+class Read(Node):
+    __slots__ = ("name",)
+
+    def __init__(self, name: str):
+        self.name = name
+
+
+class Write(Node):
+    """Escrita de um lexema (string, variável ou número) ou de '\\n'"""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: str):
+        self.value = value
+
+
+class Program(Node):
+    __slots__ = ("declarations", "body")
+
+    def __init__(self, declarations: list[Declaration], body: list[Node]):
+        self.declarations = declarations
+        self.body = body
@@ -0,0 +1,147 @@
+from lib.syntatic.syntatic import Syntatic
+from lib.syntatic.codegen import CodeGenerator
+from lib.syntatic.tree import (
+    Node, Number, String, Variable, Binary, Not, Negate,
+    Declaration, Assign, If, While, For, Break, Continue, Read, Write, Program,
+)
+
+
+class TreeSyntatic(Syntatic):
+    """
+    Syntatic que constrói a árvore sintática tipada (lib.syntatic.tree) em
+    vez de gerar instruções. A análise e as verificações semânticas são as
+    do Syntatic, na mesma ordem; as instruções são geradas depois, pelo
+    CodeGenerator, e são as mesmas do Syntatic.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.declarations: list[Declaration] = []
+        # Comandos do corpo em construção e, durante um corpo aninhado, os dos corpos externos
+        self.statements: list[Node] = []
+        self.blocks: list[list[Node]] = []
+
+    def tree(self) -> Program:
+        """Analisa o programa e retorna sua árvore; levanta os erros como start"""
+        self.advance()
+
+        self.procFunction()
+
+        if self.semantic_errors:
+            raise Exception(self.semantic_errors[0])
+
+        return Program(self.declarations, self.statements)
+
+    def start(self):
+        instructions = CodeGenerator(self).generate(self.tree())
+
+        if self.semantic_errors:
+            raise Exception(self.semantic_errors[0])
+
+        return instructions
+
+    def open_body(self):
+        self.blocks.append(self.statements)
+        self.statements = []
+
+    def close_body(self) -> list[Node]:
+        body = self.statements
+        self.statements = self.blocks.pop()
+        return body
+
+    def get_expression_type(self, expression):
+        if isinstance(expression, Variable):
+            return super().get_expression_type(expression.name)
+
+        if isinstance(expression, String):
+            return super().get_expression_type(expression.value)
+
+        if isinstance(expression, Node):
+            return expression.type
+
+        return super().get_expression_type(expression)
+
+    def declare(self, var_list, var_type):
+        for var_name in var_list:
+            self.add_variable(var_name, var_type)
+
+        self.declarations.append(Declaration(var_list, var_type))
+
+    def loop_jump(self, target, keyword):
+        if not self.loop_stack:
+            raise Exception(f"{keyword} outside of loop")
+
+        self.statements.append(Break() if target == 'end' else Continue())
+
+    def begin_for(self, var_name, end_value):
+        # A atribuição inicial acabou de ser acrescentada por assign
+        node = For(self.statements.pop(), end_value)
+        self.loop_stack.append(node)
+        self.open_body()
+        return node
+
+    def end_for(self, loop):
+        loop.body = self.close_body()
+        self.loop_stack.pop()
+        self.statements.append(loop)
+
+    def begin_while(self):
+        node = While()
+        self.loop_stack.append(node)
+        return node
+
+    def while_condition(self, loop, condition_result):
+        loop.condition = condition_result
+        self.open_body()
+
+    def end_while(self, loop):
+        loop.body = self.close_body()
+        self.loop_stack.pop()
+        self.statements.append(loop)
+
+    def begin_if(self):
+        return If()
+
+    def if_then(self, state, condition_result):
+        state.condition = condition_result
+        self.open_body()
+
+    def if_else(self, state):
+        state.then = self.close_body()
+        self.open_body()
+
+    def end_if(self, state):
+        state.orelse = self.close_body()
+        self.statements.append(state)
+
+    def assign(self, var_name, expr_result):
+        self.check_assign(var_name, expr_result)
+        self.statements.append(Assign(var_name, expr_result))
+
+    def read(self, var_name):
+        self.statements.append(Read(var_name))
+
+    def write(self, value):
+        self.statements.append(Write(value))
+
+    def emit_binary(self, op, level, left_result, left_type, right_result, right_type):
+        result_type = self.binary_type(op, level, left_result, left_type, right_result, right_type)
+        return Binary(op, left_result, right_result, result_type), result_type
+
+    def emit_not(self, operand):
+        return Not(operand), 'boolean'
+
+    def negate(self, operand):
+        return Negate(operand), 'integer'
+
+    def number_operand(self, value):
+        node = Number(value, 'real' if '.' in value else 'integer')
+        return node, node.type
+
+    def variable_operand(self, value):
+        # O tipo fica no nó; a verificação com erro continua a cada uso
+        return Variable(value, self.get_variable_type(value)), None
+
+    def string_operand(self, value):
+        node = String(value)
+        return node, node.type
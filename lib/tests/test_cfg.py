@@ -0,0 +1,125 @@
+from lib.lexical.scanner import Scanner
+from lib.syntatic.syntatic import Syntatic
+from lib.optimizer.cfg import Dominators, build_blocks, natural_loops, reverse_postorder
+from lib.optimizer.dataflow import liveness, reaching_definitions, solve
+from lib.optimizer.ir import written
+from lib.optimizer.ssa import dominance_frontiers, from_ssa, to_ssa
+
+
+NESTED = """program P;
+var i, j, s: integer;
+begin
+s := 0;
+for i := 1 to 3 do
+begin
+j := 0;
+while j < i do j := j + 1;
+s := s + j;
+end
+writeln(s);
+end.
+"""
+
+
+def compile_nested():
+    syntatic = Syntatic(Scanner(NESTED).tokenize())
+    instructions = syntatic.start()
+    return syntatic, instructions, build_blocks(instructions)
+
+
+def test_dominators_and_loops():
+    _, _, blocks = compile_nested()
+    dominators = Dominators(blocks)
+
+    # Blocos: início, teste do for, corpo até o while, teste do while, corpo do while, fim do corpo do for, saída
+    assert [[successor.index for successor in block.successors] for block in blocks] == [[1], [2, 6], [3], [4, 5], [3], [1], []]
+    assert [block.index for block in reverse_postorder(blocks)] == [0, 1, 2, 3, 4, 5, 6]
+    assert [block.index for block in dominators.idom] == [0, 0, 1, 2, 3, 3, 1]
+    assert dominators.dominates(blocks[1], blocks[4])
+    assert not dominators.dominates(blocks[4], blocks[5])
+
+    loops = natural_loops(blocks, dominators)
+
+    assert [(loop.header.index, sorted(loop.blocks)) for loop in loops] == [(1, [1, 2, 3, 4, 5]), (3, [3, 4])]
+    assert [[latch.index for latch in loop.latches] for loop in loops] == [[5], [4]]
+
+
+def test_unreachable_blocks():
+    instructions = [
+        ("JUMP", "L2", None, None),
+        ("LABEL", "L1", None, None),
+        ("ATT", "a", "b", None),
+        ("JUMP", "L1", None, None),
+        ("LABEL", "L2", None, None),
+    ]
+    blocks = build_blocks(instructions)
+    dominators = Dominators(blocks)
+
+    # O laço em L1 nunca é alcançado: não tem dominador nem conta como laço
+    assert dominators.idom[1] is None
+    assert not dominators.dominates(blocks[1], blocks[1])
+    assert natural_loops(blocks, dominators) == []
+
+
+def test_liveness():
+    syntatic, instructions, blocks = compile_nested()
+    variables = {syntatic.intern(name) for name in "ijs"}
+
+    live_in, live_out = liveness(instructions, blocks, variables)
+
+    assert [sorted(live) for live in live_in] == [[], ["i", "s"], ["i", "s"], ["i", "j", "s"], ["i", "j", "s"], ["i", "j", "s"], ["s"]]
+    assert [sorted(live) for live in live_out] == [["i", "s"], ["i", "s"], ["i", "j", "s"], ["i", "j", "s"], ["i", "j", "s"], ["i", "s"], []]
+    # Sem restrição, as temporárias e as variáveis entram juntas
+    assert sorted(liveness(instructions, blocks)[0][1]) == ["i", "s"]
+
+
+def test_reaching_definitions():
+    syntatic, instructions, blocks = compile_nested()
+    variables = {syntatic.intern(name) for name in "ijs"}
+
+    reach_in, reach_out = reaching_definitions(instructions, blocks, variables)
+
+    # No teste do for chegam o j inicial, o j do while e as duas escritas de s e de i
+    assert sorted(reach_in[1]) == [1, 3, 4, 9, 15, 19, 21]
+    assert sorted(reach_in[3]) == [3, 4, 9, 15, 19, 21]
+    assert sorted(reach_out[5]) == [9, 15, 19, 21]
+
+
+def test_solve_with_intersection():
+    _, _, blocks = compile_nested()
+
+    # Blocos que estão em todo caminho até cada bloco: os dominadores
+    every = frozenset(block.index for block in blocks)
+    before, after = solve(
+        blocks,
+        lambda block, value: value | {block.index},
+        meet=lambda values: frozenset.intersection(*values),
+        initial=every,
+    )
+
+    assert [sorted(value) for value in after] == [[0], [0, 1], [0, 1, 2], [0, 1, 2, 3], [0, 1, 2, 3, 4], [0, 1, 2, 3, 5], [0, 1, 6]]
+
+
+def test_ssa_form():
+    _, instructions, blocks = compile_nested()
+
+    assert [sorted(frontier) for frontier in dominance_frontiers(blocks, Dominators(blocks))] == \
+        [[], [1], [1], [1, 3], [3], [1], []]
+
+    form = to_ssa(instructions)
+    origin = form.origin
+
+    # Phis no teste do for (vindas do início e do fim do corpo) e no teste do while
+    assert [sorted((origin[target], sorted(arguments)) for target, arguments in phis.items()) for phis in form.phis] == \
+        [[], [("i", [0, 5]), ("j", [0, 5]), ("s", [0, 5])], [], [("j", [2, 4])], [], [], []]
+
+    # Cada versão é escrita uma única vez, e o while lê o i da phi do for
+    versions = [written(instruction) for code in form.code for instruction in code if written(instruction) is not None]
+    versions += [target for phis in form.phis for target in phis]
+    assert len(versions) == len(set(versions)) == len(origin)
+
+    header_i = next(target for target in form.phis[1] if origin[target] == "i")
+    assert form.code[3][1] == ("LESS", form.code[3][1][1], form.code[3][1][2], header_i)
+
+    # Sem nenhum passo no meio, a volta dá as instruções de antes
+    assert from_ssa(form) == instructions
@@ -0,0 +1,134 @@
+import re
+
+import pytest
+
+from lib.lexical.scanner import Scanner
+from lib.syntatic.syntatic import Syntatic
+from lib.syntatic.incremental import Document
+
+
+PROGRAM = """program Teste;
+var
+  a, b: integer;
+  s: string;
+begin
+  a := 1;
+  { comentario
+    de bloco }
+  b := a + 2;
+  if a > b then
+    begin writeln("maior"); end
+  else
+    begin
+      s := "menor";
+      writeln(s);
+    end
+  while a < 10 do a := a + 1;
+  writeln(a);
+end.
+"""
+
+
+def canonical(instructions):
+    """Renomeia temporárias e labels na ordem em que aparecem"""
+    names = {}
+
+    def rename(match):
+        return names.setdefault(match.group(0), f"#{len(names)}")
+
+    return [tuple(re.sub(r"temp_\d+|L\d+", rename, operand) if isinstance(operand, str) else operand for operand in instruction) for instruction in instructions]
+
+
+def compile_full(text):
+    try:
+        tokens = Scanner(text).tokenize()
+        return tokens, canonical(Syntatic(list(tokens)).start())
+    except Exception as e:
+        return type(e), str(e)
+
+
+def compile_edit(document, first_line, last_line, text):
+    try:
+        document.edit(first_line, last_line, text)
+    except Exception as e:
+        return type(e), str(e)
+
+    return document.tokens, canonical(document.instructions)
+
+
+@pytest.mark.parametrize(
+    "first_line, last_line, text",
+    [
+        (5, 6, "  a := 5 * 3;\n"),
+        (8, 8, "  b := 7;\n  a := b;\n"),
+        (6, 6, "  {\n"),
+        (7, 8, ""),
+        (9, 16, "  writeln(b);\n"),
+        (13, 14, '      s := "{";\n'),
+        (17, 18, "  writeln(a, b); // fim {\n"),
+        (18, 19, "end\n"),
+        (2, 3, "  a, b, c: integer;\n"),
+        (9, 10, "  if a >= b then\n"),
+        (5, 6, "  c := 1;\n"),
+        (16, 17, "  while a < 10 do\n"),
+    ],
+)
+def test_edit_matches_full_compile(first_line, last_line, text):
+    document = Document(PROGRAM)
+    document.compile()
+
+    result = compile_edit(document, first_line, last_line, text)
+
+    assert result == compile_full(document.text)
+
+
+def test_edit_reuses_untouched_statements():
+    document = Document(PROGRAM)
+    document.compile()
+
+    before = []
+    segment = document.head.next
+    while segment is not None:
+        before.append(segment.instructions)
+        segment = segment.next
+
+    document.edit(8, 9, "  b := a - 2;\n")
+
+    after = []
+    segment = document.head.next
+    while segment is not None:
+        after.append(segment.instructions)
+        segment = segment.next
+
+    # O comando anterior é reanalisado, pois a edição poderia estendê-lo (um 'else', por exemplo)
+    assert after[0] == before[0]
+    assert after[1] != before[1]
+    assert all(new is old for new, old in zip(after[2:], before[2:]))
+    assert canonical(document.instructions) == compile_full(document.text)[1]
+
+
+def test_sequence_of_edits_recovers_after_errors():
+    document = Document(PROGRAM)
+    document.compile()
+
+    edits = [
+        (5, 6, "  a := ;\n"),
+        (5, 6, "  a := 2;\n"),
+        (6, 6, "  { aberto\n"),
+        (7, 8, "}\n"),
+        (10, 11, "  x := 1;\n"),
+        (10, 11, "  a := 3;\n"),
+        (0, 1, "program Outro;\n"),
+        (19, 19, "  writeln(a);\n"),
+    ]
+
+    for first_line, last_line, text in edits:
+        assert compile_edit(document, first_line, last_line, text) == compile_full(document.text)
+
+
+def test_edit_invalid_range():
+    document = Document(PROGRAM)
+    document.compile()
+
+    with pytest.raises(ValueError):
+        document.edit(5, 100, "")
@@ -0,0 +1,82 @@
+import pytest
+
+from lib.lexical.lexical import Lexical
+from lib.lexical.scanner import Scanner
+from lib.syntatic.syntatic import Syntatic
+from lib.interpreter.interpreter import Interpreter
+
+
+@pytest.mark.parametrize("filename, expected", [
+    ("./examples/testBreak.pas", "1\n2\n3\n4\nSaiu do loop\n"),
+    ("./examples/testContinue.pas", "1\n2\n4\n5\n"),
+    ("./examples/testFor.pas", "1\n2\n3\nFim do for\n"),
+    ("./examples/aritmetic.pas", "False\n"),
+])
+def test_examples(filename, expected, capsys):
+    syntatic = Syntatic(Lexical(filename).tokenize())
+    instructions = syntatic.start()
+
+    Interpreter(instructions, syntatic.slots()).run()
+    assert capsys.readouterr().out == expected
+
+    # Sem os slots do compilador, na ordem em que as variáveis aparecem
+    Interpreter(instructions).run()
+    assert capsys.readouterr().out == expected
+
+
+def test_slots_from_symbol_table():
+    syntatic = Syntatic(Scanner("program P;\nvar a, b: integer;\nbegin\n  a := 1 + 2;\n  b := a * a;\nend.\n").tokenize())
+    instructions = syntatic.start()
+    slots = syntatic.slots()
+
+    assert slots == {"a": 0, "b": 1, "temp_1": 2, "temp_2": 3}
+
+    interpreter = Interpreter(instructions, slots)
+    interpreter.run()
+
+    assert interpreter.frame[:len(slots)] == [3, 9, 3, 9]
+    assert interpreter.variables == {"a": 3, "b": 9, "temp_1": 3, "temp_2": 9}
+    # Operandos das instruções carregadas são slots, não nomes
+    assert interpreter.code[-1] == ("ATT", 1, 3, None)
+
+
+def test_text_instructions(capsys):
+    instructions = [
+        ("ATT", "a", "'07'", None),
+        ("ATT", "s", '"0x1F"', None),
+        ("ADD", "t", "a", "s"),
+        ("CALL", "write", "t", None),
+        ("CALL", "write", "s", None),
+        ("CALL", "write", '"0x1F"', None),
+        ("CALL", "write", "\\n", None),
+    ]
+
+    Interpreter(instructions).run()
+
+    # Valores lidos de variáveis são reconvertidos; literais escritos direto, não
+    assert capsys.readouterr().out == "38310x1F\n"
+
+
+def test_branch_commands(capsys):
+    instructions = [
+        ("ATT", "i", "'0'", None),
+        ("LABEL", "L1", None, None),
+        ("IF_LESS", "i", "'3'", "L2"),
+        ("CALL", "write", "i", None),
+        ("ADD", "i", "i", "'1'"),
+        ("JUMP", "L1", None, None),
+        ("LABEL", "L2", None, None),
+    ]
+
+    # Segue adiante enquanto a comparação é verdadeira e salta quando é falsa
+    Interpreter(instructions).run()
+    assert capsys.readouterr().out == "012"
+
+
+def test_error_shows_original_instruction(capsys):
+    instructions = [("ATT", "a", "'1'", None), ("IDIV", "b", "a", "'0'")]
+
+    with pytest.raises(ZeroDivisionError):
+        Interpreter(instructions).run()
+
+    assert capsys.readouterr().out == "Erro ao executar ('IDIV', 'b', 'a', \"'0'\"): Divisão por zero\n"
@@ -1,3 +1,4 @@
+import io
 from typing import List
 from lib.lexical.lexical import Lexical, Token, TokenType, StringError, InvalidNumberError
 import pytest
@@ -177,4 +178,36 @@ def test_symbols():
         Token(TokenType.CLOSE_PARENTHESES, ")", 5, 0),
     ]
     
-    tokens(filename, expected)
\ No newline at end of file
+    tokens(filename, expected)
+
+@pytest.mark.parametrize("filename", ["./lib/tests/files/reserved_words.pas", "./lib/tests/files/string.pas", "./examples/TestComplete.pas"])
+def test_in_memory_sources(filename):
+    expected = Lexical(filename).tokenize()
+    text = open(filename, "r").read()
+    data = text.replace("\n", "\r\n").encode("utf-8")
+
+    sources = [
+        lambda: Lexical.from_string(text),
+        lambda: Lexical.from_string(text.replace("\n", "\r\n")),
+        lambda: Lexical.from_bytes(data),
+        lambda: Lexical.from_bytes(text.encode("utf-16"), encoding="utf-16"),
+        lambda: Lexical.from_file(io.StringIO(text)),
+        lambda: Lexical.from_file(io.BytesIO(data)),
+    ]
+
+    for source in sources:
+        assert source().tokenize() == expected
+        assert list(source().token_stream()) == expected
+        assert list(source().iter_tokens(chunk_size=7)) == expected
+        assert source().filename is None
+
+    lexical = Lexical.from_bytes(data)
+    token = None
+    result = []
+
+    while token is None or token.token_type != TokenType.EOF:
+        token = lexical.nextToken()
+        if token is not None:
+            result.append(token)
+
+    assert result[:-1] == expected
@@ -0,0 +1,106 @@
+import pickle
+
+import pytest
+
+from lib.lexical.scanner import Scanner
+from lib.lexical.symbols import Symbol
+from lib.syntatic.syntatic import Syntatic
+from lib.syntatic.operands import Constant, IntegerConstant, RealConstant, StringConstant, constant_for, to_number
+from lib.interpreter.interpreter import Interpreter
+
+
+PROGRAM = """program P;
+var a, b: integer; r: real; s: string;
+begin
+  a := 0x1F + 07;
+  r := 2.5 * 2;
+  s := "x" + "y";
+  for b := 1 to 3 do a := a - b;
+  writeln(s, a, r, 1.5, "!");
+end.
+"""
+
+
+def compile_program(text):
+    return Syntatic(Scanner(text).tokenize()).start()
+
+
+def test_to_number():
+    assert to_number("0x1F") == 31
+    assert to_number("07") == 7
+    assert to_number("2.5") == 2.5
+    assert to_number("-3") == -3
+    # Mesmas conversões do Interpreter, inclusive as que mantêm o texto
+    assert to_number("0.5") == "0.5"
+    assert to_number("abc") == "abc"
+
+
+@pytest.mark.parametrize("constant, text, constant_type, value", [
+    (IntegerConstant("'0x1F'"), "'0x1F'", "integer", 31),
+    (RealConstant("'2.5'"), "'2.5'", "real", 2.5),
+    (StringConstant('"x"'), '"x"', "string", "x"),
+    (RealConstant("0.0"), "0.0", "real", "0.0"),
+    (StringConstant("\n"), "\n", "string", "\n"),
+])
+def test_constant(constant, text, constant_type, value):
+    assert constant == text
+    assert hash(constant) == hash(text)
+    assert constant.type == constant_type
+    assert constant.value == value
+
+    copy = pickle.loads(pickle.dumps(constant))
+    assert type(copy) is type(constant)
+    assert copy == constant and copy.value == constant.value
+
+
+def test_constant_for():
+    assert constant_for(-5) == "'-5'" and type(constant_for(-5)) is IntegerConstant
+    assert constant_for(11.5) == "'11.5'" and type(constant_for(11.5)) is RealConstant
+    assert constant_for("0.5") == '"0.5"' and type(constant_for("0.5")) is StringConstant
+    # Valores que nenhum literal produz em execução
+    assert constant_for(0.5) is None
+    assert constant_for(1e22) is None
+    assert constant_for(None) is None
+
+
+def test_operand_kinds():
+    instructions = compile_program(PROGRAM)
+    operands = [item for instruction in instructions for item in instruction[1:] if item is not None]
+
+    kinds = {type(item) for item in operands if not isinstance(item, Symbol)}
+    assert kinds <= {str, IntegerConstant, RealConstant, StringConstant}
+
+    # Só CALL e os labels continuam como texto
+    for instruction in instructions:
+        for item in instruction[2:]:
+            if item is not None and instruction[0] not in ("LABEL", "JUMP", "IF", "CALL"):
+                assert isinstance(item, (Symbol, Constant))
+
+    temps = {item for item in operands if isinstance(item, Symbol) and item.temp}
+    variables = {item for item in operands if isinstance(item, Symbol) and not item.temp}
+    assert temps and all(name.startswith("temp_") for name in temps)
+    assert variables == {"a", "b", "r", "s"}
+
+
+def test_same_output_as_text_operands(capsys):
+    instructions = compile_program(PROGRAM)
+    text = [tuple(None if item is None else str(item) for item in instruction) for instruction in instructions]
+
+    Interpreter(instructions).run()
+    typed_output = capsys.readouterr().out
+
+    Interpreter(text).run()
+    assert capsys.readouterr().out == typed_output
+    assert typed_output == "xy325.01.5!\n"
+
+
+def test_expression_types_without_parsing():
+    syntatic = Syntatic()
+
+    assert syntatic.get_expression_type(syntatic.number_operand("1.5")[0]) == "real"
+    assert syntatic.get_expression_type(syntatic.number_operand("0x1F")[0]) == "integer"
+    assert syntatic.get_expression_type(syntatic.string_operand('"a"')[0]) == "string"
+    # Texto comum continua aceito
+    assert syntatic.get_expression_type("'1.5'") == "real"
+    assert syntatic.number_operand("7")[0] is syntatic.number_operand("7")[0]
+    assert syntatic.semantic_errors == []
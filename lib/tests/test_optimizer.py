@@ -0,0 +1,554 @@
+import io
+
+import pytest
+
+from benchmarks.programs import arithmetic_program, common_program, generate_program, loop_program, nested_loop_program, summing_program
+from lib.lexical.lexical import Lexical
+from lib.lexical.scanner import Scanner
+from lib.syntatic.syntatic import Syntatic
+from lib.syntatic.operands import IntegerConstant, StringConstant
+from lib.interpreter.interpreter import Interpreter
+from lib.optimizer.cfg import build_blocks
+from lib.optimizer.cse import eliminate_subexpressions
+from lib.optimizer.dse import eliminate_dead_stores
+from lib.optimizer.fold import fold_constants
+from lib.optimizer.induction import reduce_induction
+from lib.optimizer.ir import temps_in, written
+from lib.optimizer.licm import hoist_invariants
+from lib.optimizer.optimizer import optimize
+from lib.optimizer.peephole import peephole
+from lib.optimizer.sccp import propagate_constants
+from lib.optimizer.ssa import from_ssa, to_ssa
+from lib.optimizer.temps import reuse_temps
+
+
+def compile_program(text):
+    syntatic = Syntatic(Scanner(text).tokenize())
+    return syntatic, syntatic.start()
+
+
+def program(body, declarations="a, b, c: integer;"):
+    return f"program P;\nvar {declarations}\nbegin\n{body}\nend.\n"
+
+
+def output(instructions, slots, capsys):
+    Interpreter(instructions, slots).run()
+    return capsys.readouterr().out
+
+
+@pytest.mark.parametrize("filename", [
+    "./examples/testBreak.pas",
+    "./examples/testContinue.pas",
+    "./examples/testFor.pas",
+    "./examples/aritmetic.pas",
+])
+def test_same_output(filename, capsys):
+    syntatic = Syntatic(Lexical(filename).tokenize())
+    instructions = syntatic.start()
+    expected = output(instructions, syntatic.slots(), capsys)
+
+    optimized = optimize(instructions, syntatic.symbol_table)
+
+    assert output(optimized, syntatic.slots(), capsys) == expected
+
+
+def test_loop_program(capsys):
+    syntatic, instructions = compile_program(loop_program(50))
+    expected = output(instructions, syntatic.slots(), capsys)
+
+    optimized = optimize(instructions, syntatic.symbol_table)
+
+    assert output(optimized, syntatic.slots(), capsys) == expected
+    assert len(optimized) < len(instructions)
+
+
+def test_build_blocks():
+    _, instructions = compile_program(program("a := 1;\nwhile a < 3 do a := a + 1;\nb := a;"))
+    blocks = build_blocks(instructions)
+
+    assert [(block.start, block.end) for block in blocks] == [(0, 4), (4, 7), (7, 11), (11, 13)]
+    assert [[successor.index for successor in block.successors] for block in blocks] == [[1], [2, 3], [1], []]
+    assert [[predecessor.index for predecessor in block.predecessors] for block in blocks] == [[], [0, 2], [1], [1]]
+
+
+def test_reuse_temps():
+    syntatic, instructions = compile_program(program("a := (1 + b) * (c - 2) + (b - c);"))
+
+    assert reuse_temps(instructions, syntatic.symbol_table)[3:] == [
+        ("ADD", "temp_1", "'1'", "b"),
+        ("SUB", "temp_2", "c", "'2'"),
+        # O destino fica com o nome de um operando lido pela última vez
+        ("MULT", "temp_2", "temp_1", "temp_2"),
+        ("SUB", "temp_1", "b", "c"),
+        ("ADD", "temp_1", "temp_2", "temp_1"),
+        ("ATT", "a", "temp_1", None),
+    ]
+    assert syntatic.symbol_table == {"a": "integer", "b": "integer", "c": "integer", "temp_1": "integer", "temp_2": "integer"}
+    assert syntatic.slots() == {"a": 0, "b": 1, "c": 2, "temp_1": 3, "temp_2": 4}
+
+
+def test_temps_shared_only_within_type():
+    syntatic, instructions = compile_program(program("if a + 1 > b then r := r * 2.5;\nr := r + 1.5;", "a, b: integer; r: real;"))
+    optimized = reuse_temps(instructions, syntatic.symbol_table)
+
+    assert temps_in(optimized) == {"temp_1", "temp_2", "temp_3"}
+    assert syntatic.symbol_table["temp_1"] == "integer"
+    assert syntatic.symbol_table["temp_2"] == "boolean"
+    assert syntatic.symbol_table["temp_3"] == "real"
+    assert ("ADD", "temp_3", "r", "'1.5'") in optimized
+
+
+def test_temps_live_across_blocks_are_kept(capsys):
+    syntatic = Syntatic()
+    a = syntatic.intern("a")
+    syntatic.add_variable(a, "integer")
+    temps = [syntatic.generate_temp_var() for _ in range(3)]
+    for temp in temps:
+        syntatic.add_variable(temp, "integer")
+
+    instructions = [
+        ("ATT", a, "'1'", None),
+        ("ADD", temps[0], a, "'1'"),
+        ("LESS", temps[1], a, "'2'"),
+        ("IF", temps[1], "L1", "L2"),
+        ("LABEL", "L1", None, None),
+        ("ADD", temps[2], temps[0], "'5'"),
+        ("CALL", "write", temps[2], None),
+        ("LABEL", "L2", None, None),
+        ("CALL", "write", temps[0], None),
+    ]
+    optimized = reuse_temps(instructions, syntatic.symbol_table)
+
+    # temps[0] é lida depois do IF e continua com o próprio nome
+    assert optimized[1] == ("ADD", "temp_1", "a", "'1'")
+    assert optimized[8] == ("CALL", "write", "temp_1", None)
+    # As outras duas são locais a seus blocos e passam a dividir um nome
+    assert optimized[2][1] == optimized[5][1] == "temp_2"
+    assert "temp_3" not in syntatic.symbol_table
+
+    assert output(optimized, None, capsys) == output(instructions, None, capsys) == "72"
+
+
+def test_generated_program():
+    syntatic, instructions = compile_program(generate_program(300))
+    temps_before = len(temps_in(instructions))
+
+    optimized = reuse_temps(instructions, syntatic.symbol_table)
+
+    assert temps_before > 500
+    assert len(temps_in(optimized)) <= 5
+    assert len(syntatic.symbol_table) == 51 + len(temps_in(optimized))
+
+
+def test_fold_literals():
+    _, instructions = compile_program(program("a := 0x10 div 07;\nb := a * 2 + 010;\nc := b mod 5;\nwriteln(c);"))
+
+    assert fold_constants(instructions)[3:] == [
+        ("ATT", "a", "'2'", None),
+        ("ATT", "b", "'12'", None),
+        ("ATT", "c", "'2'", None),
+        ("CALL", "write", "c", None),
+        ("CALL", "write", "\n", None),
+    ]
+
+
+def test_fold_condition_becomes_jump(capsys):
+    syntatic = Syntatic(Lexical("./examples/aritmetic.pas").tokenize())
+    instructions = syntatic.start()
+    folded = fold_constants(instructions)
+
+    assert ("JUMP", "IF_ELSE_L1", None, None) in folded
+    assert not any(instruction[0] in ("EQ", "AND", "IF") for instruction in folded)
+    assert output(folded, syntatic.slots(), capsys) == "False\n"
+
+
+def test_fold_keeps_interpreter_conversions(capsys):
+    syntatic, instructions = compile_program(program("r := 1.0 / 2;\nwriteln(r);", "r: real;"))
+    folded = fold_constants(instructions)
+
+    # 0.5 guardado numa variável vira o texto "0.5" (to_number o lê como octal)
+    assert folded[1] == ("ATT", "r", '"0.5"', None)
+    assert folded[1][2].value == "0.5"
+    assert output(folded, syntatic.slots(), capsys) == output(instructions, syntatic.slots(), capsys) == "0.5\n"
+
+
+def test_fold_leaves_runtime_errors():
+    _, instructions = compile_program(program("a := 5;\nb := a div 0;"))
+
+    assert fold_constants(instructions)[3:] == [
+        ("ATT", "a", "'5'", None),
+        ("IDIV", "temp_1", "a", "'0'"),
+        ("ATT", "b", "temp_1", None),
+    ]
+
+
+def test_fold_only_within_block():
+    _, instructions = compile_program(program("a := 2;\nwhile a < 10 do a := a * 2;\nb := a + 1;"))
+    folded = fold_constants(instructions)
+
+    # O valor de a antes do laço não vale dentro dele nem depois
+    assert folded == instructions
+
+
+def test_fold_arithmetic_program(capsys):
+    syntatic, instructions = compile_program(arithmetic_program(20))
+    expected = output(instructions, syntatic.slots(), capsys)
+
+    optimized = optimize(instructions, syntatic.symbol_table)
+
+    assert output(optimized, syntatic.slots(), capsys) == expected == "soma=140 r=11.5\n"
+    assert len(optimized) < len(instructions)
+    # Com a, b e c conhecidos em todo o laço, o if e todas as temporárias somem
+    assert temps_in(optimized) == set()
+    assert not any(instruction[0] == "IF" for instruction in optimized)
+    assert set(syntatic.symbol_table) == {"a", "b", "c", "x", "y", "i", "soma", "r"} | temps_in(optimized)
+
+
+def test_peephole_loop(capsys):
+    syntatic, instructions = compile_program(loop_program(50))
+    expected = output(instructions, syntatic.slots(), capsys)
+
+    optimized = peephole(instructions)
+
+    # Comparação e IF viram um desvio, e a temporária some das cópias
+    assert ("IF_LEQ", "i", "'50'", "FOR_END_L1") in optimized
+    assert ("IF_LESS", "j", "'3'", "WHILE_END_L3") in optimized
+    assert ("ADD", "i", "i", "1") in optimized
+    assert ("ADD", "j", "j", "'1'") in optimized
+    assert not any(instruction[0] == "IF" for instruction in optimized)
+    assert not any(instruction[0] == "LABEL" and instruction[1].startswith("IF_BODY") for instruction in optimized)
+    assert output(optimized, syntatic.slots(), capsys) == expected
+
+
+def test_peephole_jumps():
+    instructions = [
+        ("JUMP", "A", None, None),
+        ("LABEL", "B", None, None),
+        ("CALL", "write", "x", None),
+        ("LABEL", "A", None, None),
+        ("JUMP", "C", None, None),
+        ("LABEL", "D", None, None),
+        ("LABEL", "C", None, None),
+        ("JUMP", "B", None, None),
+        ("LABEL", "E", None, None),
+    ]
+
+    # A cadeia A -> C -> B vira um salto direto, que sai por ir a um label
+    # logo adiante; os labels sem saltos saem também
+    assert peephole(instructions) == [
+        ("LABEL", "B", None, None),
+        ("CALL", "write", "x", None),
+        ("JUMP", "B", None, None),
+        ("JUMP", "B", None, None),
+    ]
+
+    blocks = build_blocks([("IF_LESS", "a", "b", "L"), ("ATT", "a", "b", None), ("LABEL", "L", None, None)])
+    assert [[successor.index for successor in block.successors] for block in blocks] == [[2, 1], [2], []]
+
+
+def test_peephole_keeps_double_conversion(capsys):
+    syntatic = Syntatic()
+    s = syntatic.intern("s")
+    temps = [syntatic.generate_temp_var() for _ in range(2)]
+    instructions = [
+        ("ADD", temps[0], StringConstant('"1.0e"'), StringConstant('"22"')),
+        ("ATT", s, temps[0], None),
+        ("ADD", temps[1], s, StringConstant('"x"')),
+        ("CALL", "write", temps[1], None),
+    ]
+
+    # "1.0e22" vira 1e+22 na temporária e o texto "1e+22" na cópia: as duas instruções ficam
+    assert peephole(instructions) == instructions
+    assert output(instructions, None, capsys) == "1e+22x"
+
+
+def test_licm_nested_loops(capsys):
+    syntatic, instructions = compile_program(nested_loop_program(3, 4))
+    expected = output(instructions, syntatic.slots(), capsys)
+
+    hoisted = hoist_invariants(instructions)
+    positions = {instruction: i for i, instruction in enumerate(hoisted)}
+    n_times_two = next(instruction for instruction in instructions if instruction[0] == "MULT" and instruction[2] == "n")
+    i_times_three = next(instruction for instruction in instructions if instruction[0] == "MULT" and instruction[2] == "i")
+
+    # n * 2 sai dos dois laços e i * 3 só do while, onde i não muda
+    assert positions[n_times_two] + 1 == positions[("LABEL", "FOR_START_L1", None, None)]
+    assert positions[i_times_three] + 1 == positions[("LABEL", "WHILE_START_L2", None, None)]
+    assert len(hoisted) == len(instructions)
+    assert output(hoisted, syntatic.slots(), capsys) == expected
+    assert output(optimize(instructions, syntatic.symbol_table), syntatic.slots(), capsys) == expected
+
+
+def test_licm_keeps_instructions_that_may_raise(capsys):
+    syntatic, instructions = compile_program(program(
+        "b := 0;\nr := 2.5;\nfor a := 1 to 0 do begin c := a div b; c := c + b; r := r * 2; end\nwriteln(c, r);",
+        "a, b, c: integer; r: real;",
+    ))
+    expected = output(instructions, syntatic.slots(), capsys)
+
+    hoisted = hoist_invariants(instructions)
+
+    # O laço não dá nenhuma volta: a divisão por b (que é zero) não pode sair
+    # dele, nem a conta com c, que o laço escreve; o r é real, e só sabemos
+    # que uma conta não levanta exceção sobre inteiros
+    assert hoisted == instructions
+    assert expected == "02.5\n"
+
+
+def test_licm_needs_preheader():
+    instructions = [
+        ("ATT", "a", "b", None),
+        ("JUMP", "L", None, None),
+        ("CALL", "write", "a", None),
+        ("LABEL", "L", None, None),
+        ("ADD", "temp_1", "b", "'1'"),
+        ("ATT", "a", "temp_1", None),
+        ("JUMP", "L", None, None),
+    ]
+
+    # O laço só é alcançado por um salto: não há onde pôr a soma
+    assert hoist_invariants(instructions) == instructions
+
+
+def test_licm_integer_from_loop_hoisted_into(capsys):
+    syntatic = Syntatic()
+    x, n, m, b = (syntatic.intern(name) for name in "xnmb")
+    temps = [syntatic.generate_temp_var() for _ in range(2)]
+    zero, one = IntegerConstant("'0'"), IntegerConstant("'1'")
+    instructions = [
+        ("ATT", x, one, None),
+        ("ATT", n, zero, None),
+        ("LABEL", "OUTER", None, None),
+        ("IF_LESS", n, IntegerConstant("'2'"), "OUTER_END"),
+        ("ATT", x, StringConstant('"s"'), None),
+        ("ATT", m, zero, None),
+        ("LABEL", "INNER", None, None),
+        ("IF_LESS", m, zero, "INNER_END"),
+        ("ATT", temps[0], x, None),
+        ("LESS", temps[1], temps[0], one),
+        ("ATT", b, temps[1], None),
+        ("ADD", m, m, one),
+        ("JUMP", "INNER", None, None),
+        ("LABEL", "INNER_END", None, None),
+        ("ATT", x, one, None),
+        ("ADD", n, n, one),
+        ("JUMP", "OUTER", None, None),
+        ("LABEL", "OUTER_END", None, None),
+        ("CALL", "write", n, None),
+    ]
+
+    hoisted = hoist_invariants(instructions)
+
+    # A cópia de x sai só do laço interno, em cuja entrada x é uma string: a
+    # comparação com ela não pode ir para antes do laço, que não dá nenhuma volta
+    assert hoisted.index(("ATT", temps[0], x, None)) + 1 == hoisted.index(("LABEL", "INNER", None, None))
+    assert hoisted.index(("LESS", temps[1], temps[0], one)) > hoisted.index(("LABEL", "INNER", None, None))
+    assert output(hoisted, None, capsys) == "2"
+
+
+def before_induction(instructions):
+    return peephole(hoist_invariants(fold_constants(instructions)))
+
+
+def test_closed_form_summing_program(capsys):
+    syntatic, instructions = compile_program(summing_program(100))
+    expected = output(instructions, syntatic.slots(), capsys)
+
+    reduced = reduce_induction(before_induction(instructions), syntatic.symbol_table)
+
+    # O laço some: nenhum salto volta para trás
+    assert not any(instruction[0] == "JUMP" for instruction in reduced)
+    assert expected == "soma=5050 impares=10000 passos=100\n"
+    assert output(reduced, syntatic.slots(), capsys) == expected
+    assert output(optimize(instructions, syntatic.symbol_table), syntatic.slots(), capsys) == expected
+
+
+@pytest.mark.parametrize("body, remaining", [
+    # Contador que desce de 3 em 3, com o teste estrito
+    ("a := 0;\nb := 10;\nwhile b > 1 do begin a := a + b; b := b - 3; end\nwriteln(a, \" \", b);", []),
+    # Nenhuma volta
+    ("a := 0;\nfor b := 5 to 1 do a := a + 1;\nwriteln(a, \" \", b);", []),
+    # Contador à direita do teste, somado antes do acumulador
+    ("a := 0;\nb := 0;\nwhile 7 > b do begin b := b + 2; a := a + b * 3 - c; end\nwriteln(a, \" \", b);", []),
+    # Limite numa variável e passo maior que a distância
+    ("c := 4;\na := 1;\nb := 0;\nwhile b <= c do begin a := a - 2 * b; b := b + 5; end\nwriteln(a, \" \", b);", []),
+    # while dentro de um for, somando a * 3, que sai do while: só o for fica
+    ("c := 0;\nfor a := 1 to 4 do begin b := 1; while b <= 5 do begin c := c + a * 3 - b; b := b + 1; end end\n"
+     "writeln(c);", ["FOR_START_L1"]),
+])
+def test_closed_form_loops(body, remaining, capsys):
+    syntatic, instructions = compile_program(program(body))
+    expected = output(instructions, syntatic.slots(), capsys)
+
+    reduced = reduce_induction(before_induction(instructions), syntatic.symbol_table)
+
+    assert [instruction[1] for instruction in reduced if instruction[0] == "JUMP"] == remaining
+    assert output(reduced, syntatic.slots(), capsys) == expected
+
+
+@pytest.mark.parametrize("body", [
+    # Escrita no corpo
+    "a := 0;\nfor b := 1 to 3 do begin a := a + b; writeln(a); end",
+    # break
+    "a := 0;\nfor b := 1 to 3 do begin a := a + b; if a > 2 then break; end\nwriteln(a);",
+    # Acumulador que soma outro acumulador
+    "a := 0;\nc := 0;\nfor b := 1 to 3 do begin a := a + b; c := c + a; end\nwriteln(c);",
+    # Valor real
+    "r := 0.5;\nfor b := 1 to 3 do r := r + 0.25;\nwriteln(r);",
+    # Contador que se afasta do limite
+    "a := 0;\nb := 5;\nwhile b > 1 do begin a := a + 1; b := b + 1; if a > 3 then break; end\nwriteln(a);",
+])
+def test_closed_form_keeps_other_loops(body, capsys):
+    syntatic, instructions = compile_program(program(body, "a, b, c: integer; r: real;"))
+    expected = output(instructions, syntatic.slots(), capsys)
+
+    before = before_induction(instructions)
+    reduced = reduce_induction(before, syntatic.symbol_table)
+
+    assert [instruction for instruction in reduced if instruction[0] == "JUMP"] == \
+        [instruction for instruction in before if instruction[0] == "JUMP"]
+    assert output(reduced, syntatic.slots(), capsys) == expected
+
+
+def test_strength_reduction(capsys):
+    syntatic, instructions = compile_program(program("c := 0;\nfor a := 1 to 5 do begin c := c + (a * 4 + 1); writeln(c); end"))
+    expected = output(instructions, syntatic.slots(), capsys)
+
+    before = before_induction(instructions)
+    reduced = reduce_induction(before, syntatic.symbol_table)
+
+    # a * 4 + 1 vira uma soma de 4 por volta, começando antes do laço em a * 4 - 3
+    start = reduced.index(("LABEL", "FOR_START_L1", None, None))
+    temp = reduced[start - 1][1]
+    assert reduced[start - 2:start] == [("MULT", temp, "a", "'4'"), ("ADD", temp, temp, "'-3'")]
+    assert ("ADD", temp, temp, "'4'") in reduced[start:]
+    assert not any(instruction[0] == "MULT" for instruction in reduced[start:])
+    assert len(reduced[start:]) == len(before[before.index(("LABEL", "FOR_START_L1", None, None)):]) - 1
+    assert output(reduced, syntatic.slots(), capsys) == expected
+    assert output(optimize(instructions, syntatic.symbol_table), syntatic.slots(), capsys) == expected
+
+
+def test_cse_common_program(capsys):
+    syntatic, instructions = compile_program(common_program(10))
+    expected = output(instructions, syntatic.slots(), capsys)
+
+    before = before_induction(instructions)
+    eliminated = eliminate_subexpressions(before)
+
+    # i + n uma vez só, e a condição composta do segundo if não é refeita
+    assert [instruction[0] for instruction in before].count("ADD") - [instruction[0] for instruction in eliminated].count("ADD") == 2
+    assert [instruction[0] for instruction in eliminated].count("AND") == 1
+    assert [instruction[0] for instruction in eliminated].count("GRET") == 1
+    assert output(eliminated, syntatic.slots(), capsys) == expected
+    assert output(optimize(instructions, syntatic.symbol_table), syntatic.slots(), capsys) == expected
+
+
+@pytest.mark.parametrize("body, recomputed", [
+    # a é escrita entre as duas contas
+    ("c := (a + b) * 2;\na := 1;\nc := c + (a + b) * 2;", 2),
+    # e lida por read
+    ("c := (a + b) * 2;\nread(a);\nc := c + (a + b) * 2;", 2),
+    # A variável que guarda a conta muda
+    ("c := a * b;\nc := c + 1;\nc := c + (a * b + 1);", 2),
+    # Uma temporária guarda a conta até o fim
+    ("c := a * b + 1;\nc := c + (a * b + 1);", 1),
+    # b * a é a mesma conta que a * b
+    ("c := a * b;\nc := c + (b * a + 1);", 1),
+])
+def test_cse_invalidation(body, recomputed, capsys, monkeypatch):
+    syntatic, instructions = compile_program(program(f"read(a);\nread(b);\n{body}\nwriteln(a, \" \", c);"))
+
+    monkeypatch.setattr("sys.stdin", io.StringIO("2\n3\n7\n"))
+    expected = output(instructions, syntatic.slots(), capsys)
+
+    eliminated = eliminate_subexpressions(before_induction(instructions))
+
+    assert sum(instruction[0] in ("ADD", "MULT") and "b" in instruction[2:] for instruction in eliminated) == recomputed
+    monkeypatch.setattr("sys.stdin", io.StringIO("2\n3\n7\n"))
+    assert output(eliminated, syntatic.slots(), capsys) == expected
+
+
+def test_cse_keeps_double_conversion(capsys):
+    syntatic = Syntatic()
+    a, b, c = (syntatic.intern(name) for name in "abc")
+    temp = syntatic.generate_temp_var()
+    instructions = [
+        ("ATT", a, StringConstant('"1.0e"'), None),
+        ("ADD", b, a, StringConstant('"22"')),
+        ("ADD", c, a, StringConstant('"22"')),
+        ("ADD", temp, c, StringConstant('"x"')),
+        ("CALL", "write", temp, None),
+    ]
+
+    # c guarda o real 1e+22, que não soma com "x"; a cópia de b daria o texto "1e+22", e a soma passaria
+    assert eliminate_subexpressions(instructions) == instructions
+    with pytest.raises(TypeError):
+        output(instructions, None, capsys)
+
+
+def through_ssa(instructions, *passes):
+    form = to_ssa(fold_constants(instructions))
+    for ssa_pass in passes:
+        form = ssa_pass(form)
+    return from_ssa(form)
+
+
+def test_sccp_across_blocks(capsys, monkeypatch):
+    body = """read(b);
+a := 5;
+if b > 0 then c := a * 2; else c := 10;
+for i := 1 to 3 do
+begin
+c := c + 0;
+if c <> 10 then writeln("nunca");
+end
+writeln(c, a);"""
+    syntatic, instructions = compile_program(program(body, "a, b, c, i: integer;"))
+
+    monkeypatch.setattr("sys.stdin", io.StringIO("1\n"))
+    expected = output(instructions, syntatic.slots(), capsys)
+
+    propagated = through_ssa(instructions, propagate_constants)
+
+    # c vale 10 pelos dois lados do if e em todas as voltas: o if dentro do laço vira um JUMP
+    assert not any(operand == '"nunca"' for instruction in propagated for operand in instruction)
+    assert ("CALL", "write", "'10'", None) in propagated and ("CALL", "write", "'5'", None) in propagated
+    assert [instruction[0] for instruction in propagated].count("IF") == 2
+    monkeypatch.setattr("sys.stdin", io.StringIO("1\n"))
+    assert output(propagated, syntatic.slots(), capsys) == expected == "105\n"
+
+
+def test_sccp_leaves_runtime_errors():
+    syntatic, instructions = compile_program(program("a := 0;\nif a == 0 then b := 7 div a;\nwriteln(b);"))
+
+    propagated = through_ssa(instructions, propagate_constants, eliminate_dead_stores)
+
+    # O if some, mas a divisão por zero fica para o Interpreter
+    assert not any(instruction[0] == "IF" for instruction in propagated)
+    assert any(instruction[0] == "IDIV" and instruction[2:] == ("'7'", "'0'") for instruction in propagated)
+    with pytest.raises(ZeroDivisionError):
+        Interpreter(propagated, syntatic.slots()).run()
+
+
+def test_dead_stores(capsys, monkeypatch):
+    body = """read(b);
+c := 0;
+for a := 1 to 3 do c := c + a * 2;
+c := b;
+read(a);
+b := b div a;
+writeln(c);"""
+    syntatic, instructions = compile_program(program(body))
+
+    monkeypatch.setattr("sys.stdin", io.StringIO("9\n2\n"))
+    expected = output(instructions, syntatic.slots(), capsys)
+
+    eliminated = through_ssa(instructions, eliminate_dead_stores)
+    stores = [instruction for instruction in eliminated if written(instruction) is not None]
+
+    # A soma em c, que só ela lê, sai com o laço vazio; o read e a divisão por um valor lido ficam
+    assert [instruction[0] for instruction in stores if written(instruction) == "c"] == ["ATT"]
+    assert ("CALL", "read", "a", None) in stores
+    assert any(instruction[0] == "IDIV" for instruction in stores)
+    monkeypatch.setattr("sys.stdin", io.StringIO("9\n2\n"))
+    assert output(eliminated, syntatic.slots(), capsys) == expected == "9\n"
@@ -0,0 +1,205 @@
+import glob
+import random
+
+import pytest
+
+from lib.lexical.lexical import Lexical
+from lib.lexical.scanner import Scanner, ScannerTable
+from lib.lexical.symbols import Symbol, SymbolTable
+from lib.lexical.parallel import find_cut_points, tokenize_parallel
+from lib.lexical.token_stream import TokenStream
+from lib.lexical.token import Token
+from lib.lexical.token_type import TokenType
+from lib.lexical import token_spec
+from lib.lexical.errors import InvalidNumberError
+
+
+def legacy_tokens(filename: str):
+    """Tokens e erro produzidos pelo laço original de nextToken"""
+    lexer = Lexical(filename)
+    result = []
+
+    try:
+        while True:
+            token = lexer.nextToken()
+
+            if token is None:
+                continue
+
+            if token.token_type == TokenType.EOF:
+                break
+
+            result.append(token)
+    except Exception as e:
+        return result, (type(e), str(e))
+
+    return result, None
+
+
+def scanner_tokens(text: str):
+    result = []
+
+    try:
+        for token in Scanner(text).tokens():
+            result.append(token)
+    except Exception as e:
+        return result, (type(e), str(e))
+
+    return result, None
+
+
+@pytest.mark.parametrize("filename", sorted(glob.glob("./lib/tests/files/*.pas") + glob.glob("./examples/*.pas")))
+def test_scanner_matches_lexical(filename):
+    with open(filename, "r") as file_handle:
+        text = file_handle.read()
+
+    assert scanner_tokens(text) == legacy_tokens(filename)
+
+
+def test_scanner_matches_lexical_random(tmp_path):
+    pieces = ["a", "x", "0", "1", "8", "0x", "07", "1.", ".", '"', "\\", "\n", " ", "{", "}", "/", "//", "=", "<", ">", ":", ";", "(", ")", "+", "-", "*", "é", "²", "'", "f", "begin", "?"]
+    rnd = random.Random(0)
+    filename = tmp_path / "random.pas"
+
+    for _ in range(500):
+        text = "".join(rnd.choice(pieces) for _ in range(rnd.randint(0, 20)))
+        filename.write_text(text)
+
+        assert scanner_tokens(text) == legacy_tokens(str(filename)), repr(text)
+
+
+def test_scanner_table_unknown_class():
+    rules = dict(token_spec.RULES)
+    rules["identifier"] = {"letter vowel": ("shift", "identifier"), token_spec.OTHER: ("emit", TokenType.VARIABLE), token_spec.EOF: ("emit", TokenType.VARIABLE)}
+
+    with pytest.raises(ValueError):
+        ScannerTable(rules)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 64])
+@pytest.mark.parametrize("filename", sorted(glob.glob("./lib/tests/files/*.pas") + glob.glob("./examples/*.pas")))
+def test_iter_tokens_matches_tokenize(filename, chunk_size):
+    expected = scanner_tokens(open(filename, "r").read())
+
+    result = []
+    try:
+        for token in Lexical(filename).iter_tokens(chunk_size):
+            result.append(token)
+    except Exception as e:
+        assert expected == (result, (type(e), str(e)))
+        return
+
+    assert expected == (result, None)
+
+
+def test_iter_tokens_block_comment_across_chunks(tmp_path):
+    filename = tmp_path / "comment.pas"
+    filename.write_text("a { um\ncomentario\nlongo } b\n  c")
+
+    result = list(Lexical(str(filename)).iter_tokens(chunk_size=4))
+
+    assert result == [
+        Token(TokenType.VARIABLE, "a", 0, 0),
+        Token(TokenType.VARIABLE, "b", 2, 7),
+        Token(TokenType.VARIABLE, "c", 3, 2),
+    ]
+
+
+@pytest.mark.parametrize("filename", sorted(glob.glob("./lib/tests/files/*.pas") + glob.glob("./examples/*.pas")))
+def test_token_stream_matches_tokenize(filename):
+    try:
+        expected = Lexical(filename).tokenize()
+    except Exception:
+        return
+
+    stream = Lexical(filename).token_stream()
+
+    assert len(stream) == len(expected)
+    assert list(stream) == expected
+    assert [stream.lexeme(i) for i in range(len(stream))] == [token.lexeme for token in expected]
+
+
+@pytest.mark.parametrize("filename", sorted(glob.glob("./lib/tests/files/*.pas") + glob.glob("./examples/*.pas")))
+def test_memory_map_matches_tokenize(filename):
+    expected = scanner_tokens(open(filename, "r").read())
+
+    try:
+        result = (Lexical(filename, memory_map=True).tokenize(), None)
+    except Exception as e:
+        result = (expected[0], (type(e), str(e)))
+
+    assert result == expected
+
+
+def test_memory_map_newlines_and_unicode(tmp_path):
+    filename = tmp_path / "unicode.pas"
+    filename.write_bytes('ação := "olá"; {\r\n}\r\nβ2 := 1.\r x'.encode("utf-8"))
+
+    expected = scanner_tokens(open(filename, "r", encoding="utf-8").read())
+
+    assert scanner_tokens(filename.read_bytes()) == expected
+    assert (Lexical(str(filename), memory_map=True).tokenize(), None) == expected
+    assert list(TokenStream.from_text(filename.read_bytes())) == expected[0]
+
+
+def test_identifiers_are_interned():
+    symbols = SymbolTable()
+    source = "a := b + a; begin b := ação end"
+    tokens = Scanner(source, symbols=symbols).tokenize()
+    identifiers = [token.lexeme for token in tokens if token.token_type == TokenType.VARIABLE]
+
+    assert identifiers == ["a", "b", "a", "b", "ação"]
+    assert all(type(lexeme) is Symbol for lexeme in identifiers)
+    assert identifiers[0] is identifiers[2] and identifiers[1] is identifiers[3]
+    assert [lexeme.id for lexeme in identifiers] == [0, 1, 0, 1, 2]
+    assert symbols.names == ["a", "b", "ação"]
+
+    assert [token.lexeme for token in Scanner(source.encode("utf-8"), symbols=symbols).tokenize()] == [token.lexeme for token in tokens]
+    assert len(symbols) == 3
+
+    stream = TokenStream.from_text(source, symbols)
+    assert list(stream.symbol_ids) == [0, -1, 1, -1, 0, -1, -1, 1, -1, 2, -1]
+    assert stream.lexeme(9) is symbols.names[2]
+
+
+def test_symbol_pickles_as_str():
+    import pickle
+
+    symbol = SymbolTable().intern("abc")
+    restored = pickle.loads(pickle.dumps(symbol))
+
+    assert restored == "abc" and type(restored) is str
+
+
+def stream_result(build):
+    try:
+        stream = build()
+    except Exception as e:
+        return type(e), str(e)
+
+    return list(stream), list(stream.symbol_ids)
+
+
+@pytest.mark.parametrize("filename", sorted(glob.glob("./lib/tests/files/*.pas") + glob.glob("./examples/*.pas")))
+def test_parallel_matches_token_stream(filename):
+    text = open(filename, "r").read()
+
+    expected = stream_result(lambda: TokenStream.from_text(text))
+
+    assert stream_result(lambda: tokenize_parallel(text, workers=3, min_chunk_size=1)) == expected
+    assert stream_result(lambda: tokenize_parallel(text.encode("utf-8"), workers=3, min_chunk_size=1)) == expected
+
+
+def test_parallel_cuts_outside_block_comments():
+    text = 'a := 1;\n{ comentario\n"}\nb := 2; // {\nc := "{";\n{\n\n}\nd := 3;\n'
+    cuts = find_cut_points(text, len(text))
+
+    assert cuts == [0, 8, 24, 37, 47, 52, len(text)]
+    assert stream_result(lambda: tokenize_parallel(text, workers=8, min_chunk_size=1)) == stream_result(lambda: TokenStream.from_text(text))
+
+
+def test_parallel_reports_first_error():
+    text = "a := 1;\nb := 0x;\nc := 2;\nd := 'e';\n"
+
+    with pytest.raises(InvalidNumberError, match="line 1 column 5"):
+        tokenize_parallel(text, workers=4, min_chunk_size=1)
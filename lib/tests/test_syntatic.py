@@ -0,0 +1,203 @@
+import glob
+import sys
+
+import pytest
+
+from lib.lexical.lexical import Lexical, InvalidNumberError
+from lib.lexical.token_stream import TokenStream
+from lib.syntatic.syntatic import Syntatic
+from lib.compiler import compile_source, compile_file
+from lib.syntatic.token_cursor import TokenCursor
+
+
+def parse(tokens):
+    """Instruções geradas ou a exceção levantada pelo Syntatic"""
+    try:
+        return Syntatic(tokens).start()
+    except Exception as e:
+        return type(e), str(e)
+
+
+@pytest.mark.parametrize("filename", sorted(glob.glob("./examples/*.pas")))
+def test_parse_token_stream(filename):
+    assert parse(Lexical(filename).token_stream()) == parse(Lexical(filename).tokenize())
+
+
+@pytest.mark.parametrize("filename", sorted(glob.glob("./examples/*.pas")))
+def test_ir_carries_symbol_ids(filename):
+    lexical = Lexical(filename)
+    syntatic = Syntatic(lexical.tokenize(), lexical.symbols)
+
+    try:
+        instructions = syntatic.start()
+    except Exception:
+        return
+
+    assert instructions == parse(Lexical(filename).tokenize())
+
+    for name, var_type in syntatic.symbol_table.items():
+        assert lexical.symbols.owns(name)
+        assert syntatic.variable_types[name.id] == var_type
+
+    for instruction in instructions:
+        for operand in instruction[1:]:
+            if operand in syntatic.symbol_table:
+                assert lexical.symbols.owns(operand)
+
+
+def compiled(source):
+    try:
+        return compile_source(source)
+    except Exception as e:
+        return type(e), str(e)
+
+
+@pytest.mark.parametrize("filename", sorted(glob.glob("./examples/*.pas")))
+def test_compile_source_in_memory(filename):
+    text = open(filename, "r").read()
+    expected = parse(Lexical(filename).tokenize())
+
+    assert compiled(text) == expected
+    assert compiled(text.encode("utf-8")) == expected
+    assert compiled(text.replace("\n", "\r\n")) == expected
+    assert compiled(text.replace("\n", "\r\n").encode("utf-8")) == expected
+
+
+def sequential(filename):
+    try:
+        lexical = Lexical(filename)
+        return Syntatic(lexical.tokenize(), lexical.symbols).start()
+    except Exception as e:
+        return type(e), str(e)
+
+
+@pytest.mark.parametrize("filename", sorted(glob.glob("./lib/tests/files/*.pas") + glob.glob("./examples/*.pas")))
+def test_compile_file_pipeline(filename):
+    try:
+        result = compile_file(filename)
+    except Exception as e:
+        result = type(e), str(e)
+
+    assert result == sequential(filename)
+
+
+@pytest.mark.parametrize("filename", sorted(glob.glob("./examples/*.pas")))
+def test_parse_small_batches(filename):
+    lexical = Lexical(filename)
+
+    with lexical.token_pipeline(batch_size=1, max_batches=1) as tokens:
+        assert parse(tokens) == sequential(filename)
+
+
+def test_pipeline_lexical_error_has_precedence(tmp_path):
+    filename = tmp_path / "error.pas"
+    filename.write_text("program P;\nvar a: integer;\nbegin\n  a := ;\n" + "  a := 1;\n" * 5000 + "  a := 0x;\nend.\n")
+
+    assert sequential(str(filename))[0] is InvalidNumberError
+    with pytest.raises(InvalidNumberError):
+        compile_file(str(filename))
+
+
+def test_pipeline_close_stops_lexer():
+    lexical = Lexical.from_string("program P; begin " + "writeln(1); " * 100000 + "end.")
+    pipeline = lexical.token_pipeline(batch_size=10, max_batches=2)
+
+    assert next(iter(pipeline)).lexeme == "program"
+    pipeline.close()
+    assert not pipeline.thread.is_alive()
+
+
+@pytest.mark.parametrize("filename", sorted(glob.glob("./examples/*.pas")))
+def test_parse_leaves_tokens_untouched(filename):
+    tokens = Lexical(filename).tokenize()
+    expected = list(tokens)
+
+    assert parse(tokens) == parse(list(expected))
+    assert tokens == expected
+
+
+@pytest.mark.parametrize("build", [list, tuple, iter, lambda tokens: TokenStream.from_text("a := b + 1; c")])
+def test_token_cursor_peek(build):
+    tokens = Lexical.from_string("a := b + 1; c").tokenize()
+    cursor = TokenCursor.over(build(tokens))
+
+    assert cursor.peek() == tokens[0]
+    assert cursor.peek(3) == tokens[2]
+    assert cursor.next() == tokens[0]
+    assert cursor.peek(6) == tokens[6]
+    assert cursor.peek(7) is None
+    assert [cursor.next() for _ in range(3)] == tokens[1:4]
+    assert cursor.remaining() == tokens[4:]
+
+    with pytest.raises(ValueError):
+        cursor.peek(0)
+
+
+def test_long_lists_do_not_recurse():
+    count = 5 * sys.getrecursionlimit()
+    names = [f"v{i}" for i in range(count)]
+    text = "program P;\nvar\n  " + ", ".join(names) + ": integer;\n" + "".join(f"  w{i}: real;\n" for i in range(count)) + "begin\n" + "  v0 := v1 + 1;\n" * count + "end.\n"
+
+    instructions = compile_source(text)
+
+    assert len(instructions) == 2 * count + 2 * count
+    assert instructions[:2] == [("ATT", "v0", "0", None), ("ATT", "v1", "0", None)]
+    assert instructions[count] == ("ATT", "w0", "0.0", None)
+    assert instructions[-2:] == [("ADD", f"temp_{count}", "v1", "'1'"), ("ATT", "v0", f"temp_{count}", None)]
+
+
+def test_trailing_semicolon_without_end():
+    with pytest.raises(Exception, match="Unexpected end of input"):
+        compile_source("program P;\nvar a: integer;\nbegin\n  a := 1;\n  ;")
+
+
+def test_long_expression():
+    terms = 5 * sys.getrecursionlimit()
+    text = "program P;\nvar a: integer;\nbegin\n  a := a" + " + 1" * (terms - 1) + ";\nend.\n"
+
+    instructions = compile_source(text)
+
+    assert len(instructions) == terms + 1
+    assert instructions[1] == ("ADD", "temp_1", "a", "'1'")
+    assert instructions[-2] == ("ADD", f"temp_{terms - 1}", f"temp_{terms - 2}", "'1'")
+    assert instructions[-1] == ("ATT", "a", f"temp_{terms - 1}", None)
+
+
+@pytest.mark.parametrize("else_part, expected", [
+    ("", [("IF", "temp_1", "IF_BODY_L1", "IF_END_L1"), ("LABEL", "IF_BODY_L1", None, None), ("ATT", "a", "'1'", None), ("LABEL", "IF_END_L1", None, None)]),
+    ("else ;", [("IF", "temp_1", "IF_BODY_L1", "IF_END_L1"), ("LABEL", "IF_BODY_L1", None, None), ("ATT", "a", "'1'", None), ("LABEL", "IF_END_L1", None, None)]),
+    ("else a := 2;", [("IF", "temp_1", "IF_BODY_L1", "IF_ELSE_L1"), ("LABEL", "IF_BODY_L1", None, None), ("ATT", "a", "'1'", None), ("JUMP", "IF_END_L1", None, None), ("LABEL", "IF_ELSE_L1", None, None), ("ATT", "a", "'2'", None), ("LABEL", "IF_END_L1", None, None)]),
+])
+def test_if_branch_patched(else_part, expected):
+    instructions = compile_source(f"program P;\nvar a: integer;\nbegin\n  if a > 0 then a := 1; {else_part}\nend.\n")
+
+    assert instructions[1:] == [("GRET", "temp_1", "a", "'0'")] + expected
+
+
+def test_deep_expression_nesting():
+    depth = 5 * sys.getrecursionlimit()
+    text = "program P;\nvar a: integer;\nbegin\n  a := " + "(" * depth + "a + 1" + ")" * depth + ";\n  if " + "not " * depth + "a > 1 then a := 2;\nend.\n"
+
+    instructions = compile_source(text)
+
+    assert instructions[1:3] == [("ADD", "temp_1", "a", "'1'"), ("ATT", "a", "temp_1", None)]
+    assert instructions[3] == ("GRET", "temp_2", "a", "'1'")
+    assert instructions[4] == ("NOT", "temp_3", "temp_2", None)
+    assert instructions[3 + depth] == ("NOT", f"temp_{depth + 2}", f"temp_{depth + 1}", None)
+
+
+@pytest.mark.parametrize("condition, expected", [
+    ("a < b < c", "but got TokenType.OPERATOR_LESS"),
+    ("(a < b < c)", "Expected token type TokenType.CLOSE_PARENTHESES, but got TokenType.OPERATOR_LESS"),
+    ("not a < b < c", "but got TokenType.OPERATOR_LESS"),
+    ("a + not b", "Expected token type TokenType.STRING, but got TokenType.OPERATOR_NOT"),
+])
+def test_expression_syntax_errors(condition, expected):
+    with pytest.raises(Exception, match=expected):
+        compile_source(f"program P;\nvar a, b, c: integer;\nbegin\n  if {condition} then a := 1;\nend.\n")
+
+
+@pytest.mark.parametrize("end", ["a := -", "a := not", "a := (", "a := 1 + +", "if not not", "a := (((-"])
+def test_truncated_expression(end):
+    with pytest.raises(Exception, match="Unexpected end of input"):
+        compile_source(f"program P;\nvar a: integer;\nbegin\n  {end}")
@@ -0,0 +1,146 @@
+import copy
+import glob
+import random
+import sys
+
+import pytest
+
+from benchmarks.programs import generate_program
+from lib.lexical.lexical import Lexical
+from lib.lexical.scanner import Scanner
+from lib.lexical.token_type import TokenType
+from lib.syntatic.grammar import Action, Grammar, ParseTable, END
+from lib.syntatic.syntatic import Syntatic, STMT_START
+from lib.syntatic.table_parser import DEFAULT_TABLE, TableSyntatic
+
+
+EXPRESSION_GRAMMAR = """
+// Gramática de expressões dos livros-texto
+e -> t restoE ;
+restoE -> '+' t #add restoE | & ;
+t -> f restoT ;
+restoT -> '*' f #mult restoT | & ;
+f -> '(' e ')' | VARIABLE ;
+"""
+
+
+def parse(parser_class, tokens):
+    try:
+        return parser_class(tokens).start()
+    except Exception as e:
+        return type(e), str(e)
+
+
+def test_first_and_follow():
+    grammar = Grammar.parse(EXPRESSION_GRAMMAR)
+
+    assert grammar.start == "e"
+    assert grammar.nullable == {"restoE", "restoT"}
+    assert grammar.first["e"] == grammar.first["f"] == {TokenType.OPEN_PARENTHESES, TokenType.VARIABLE}
+    assert grammar.first["restoT"] == {TokenType.OPERATOR_MULTIPLY}
+    assert grammar.follow["e"] == grammar.follow["restoE"] == {END, TokenType.CLOSE_PARENTHESES}
+    assert grammar.follow["t"] == {END, TokenType.CLOSE_PARENTHESES, TokenType.OPERATOR_PLUS}
+    assert grammar.follow["f"] == {END, TokenType.CLOSE_PARENTHESES, TokenType.OPERATOR_PLUS, TokenType.OPERATOR_MULTIPLY}
+    assert grammar.productions["restoE"][0] == (TokenType.OPERATOR_PLUS, "t", Action("add"), "restoE")
+
+
+def test_parse_table():
+    table = ParseTable(Grammar.parse(EXPRESSION_GRAMMAR))
+
+    assert table.rows["restoT"] == {TokenType.OPERATOR_MULTIPLY: 0, TokenType.OPERATOR_PLUS: 1, TokenType.CLOSE_PARENTHESES: 1, END: 1}
+    assert table.alternative("f", TokenType.VARIABLE) == (TokenType.VARIABLE,)
+    # Sem entrada: a alternativa vazia, ou a última
+    assert table.alternative("restoE", TokenType.SEMICOLON) == ()
+    assert table.alternative("f", TokenType.SEMICOLON) == (TokenType.VARIABLE,)
+    assert table.resolved == []
+
+
+@pytest.mark.parametrize("text, message", [
+    ("s -> VARIABLE | VARIABLE ';' ;", "two alternatives starting with"),
+    ("s -> a | & ; a -> & ;", "two empty alternatives"),
+    ("s -> missing ;", "Unknown nonterminal 'missing'"),
+    ("s -> '@' ;", "Unknown terminal"),
+    ("s -> NUMBER ;", "Unknown token type 'NUMBER'"),
+    ("s -> VARIABLE", "Expected ';' in grammar"),
+    ("s -> ; s -> ;", "defined twice"),
+])
+def test_grammar_errors(text, message):
+    with pytest.raises(ValueError, match=message):
+        ParseTable(Grammar.parse(text))
+
+
+def test_pascal_grammar():
+    grammar = DEFAULT_TABLE.grammar
+
+    assert grammar.first["stmt"] == STMT_START
+    # O 'else' pendente e o ';' opcional do bloco ficam com a alternativa que consome o token
+    assert sorted(DEFAULT_TABLE.resolved, key=str) == [("elsePart", TokenType.RESERVED_WORD_ELSE), ("optSemicolon", TokenType.SEMICOLON)]
+
+
+@pytest.mark.parametrize("filename", sorted(glob.glob("./examples/*.pas")))
+def test_same_instructions(filename):
+    try:
+        tokens = Lexical(filename).tokenize()
+    except Exception:
+        return
+
+    assert parse(TableSyntatic, tokens) == parse(Syntatic, tokens)
+
+
+def test_same_instructions_and_errors_on_random_programs():
+    rnd = random.Random(0)
+    tokens = Scanner(generate_program(300, variables=5)).tokenize()
+
+    assert parse(TableSyntatic, tokens) == parse(Syntatic, tokens)
+
+    for _ in range(300):
+        changed = list(tokens)
+        position = rnd.randrange(len(changed))
+
+        if rnd.random() < 0.5:
+            del changed[position]
+        else:
+            changed.insert(position, copy.copy(changed[rnd.randrange(len(changed))]))
+
+        assert parse(TableSyntatic, changed) == parse(Syntatic, changed)
+
+
+def test_reads_from_iterator():
+    tokens = Scanner(generate_program(50)).tokenize()
+
+    assert TableSyntatic(iter(tokens)).start() == Syntatic(tokens).start()
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("a := 1; b := a div 0;", "Variable 'b' not declared"),
+    ("a := \"s\";", "Type mismatch: cannot assign string to integer variable 'a'"),
+    ("a := \"s\" * 2;", "Cannot perform multiplication on string types"),
+    ("break;", "BREAK outside of loop"),
+    ("a := 1 end", "Expected token type TokenType.SEMICOLON, but got TokenType.RESERVED_WORD_END"),
+    ("if a < a < a then ;", "but got TokenType.OPERATOR_LESS"),
+    ("a := ;", "Expected token type TokenType.STRING, but got TokenType.SEMICOLON"),
+])
+def test_same_errors(text, expected):
+    tokens = Scanner(f"program P;\nvar a: integer;\nbegin\n  {text}\nend.\n").tokenize()
+
+    assert parse(TableSyntatic, tokens) == parse(Syntatic, tokens)
+    assert expected in parse(TableSyntatic, tokens)[1]
+
+
+@pytest.mark.parametrize("end", ["a := -", "a := (", "a := 1;", "begin begin a := 1; end", "else else", "writeln(a,"])
+def test_truncated_input(end):
+    tokens = Scanner(f"program P;\nvar a: integer;\nbegin\n  {end}").tokenize()
+
+    with pytest.raises(Exception, match="Unexpected end of input"):
+        TableSyntatic(tokens).start()
+
+
+def test_deep_nesting_uses_explicit_stack():
+    depth = 5 * sys.getrecursionlimit()
+    text = "program P;\nvar a: integer;\nbegin\n" + "begin if a > 0 then " * depth + "a := " + "(" * depth + "a" + ")" * depth + ";" + " end" * depth + "\nend.\n"
+    tokens = Scanner(text).tokenize()
+
+    instructions = TableSyntatic(tokens).start()
+
+    assert instructions[-depth - 1] == ("ATT", "a", "a", None)
+    assert instructions[-1] == ("LABEL", "IF_END_L1", None, None)
@@ -0,0 +1,105 @@
+import glob
+import sys
+
+import pytest
+
+from benchmarks.programs import generate_program
+from lib.lexical.lexical import Lexical
+from lib.lexical.scanner import Scanner
+from lib.syntatic.syntatic import Syntatic
+from lib.syntatic.tree_builder import TreeSyntatic
+from lib.syntatic.codegen import CodeGenerator
+from lib.syntatic.tree import (
+    Number, Variable, Binary, Not, Negate,
+    Declaration, Assign, If, While, For, Break, Read, Write, Program,
+)
+
+
+def compile_with(parser_class, tokens):
+    """Instruções e tabela de símbolos, ou a exceção levantada"""
+    try:
+        syntatic = parser_class(tokens)
+        return syntatic.start(), syntatic.symbol_table
+    except Exception as e:
+        return type(e), str(e)
+
+
+def test_tree():
+    text = """program P;
+var a, b: integer; s: string; r: real;
+begin
+  r := (1.5 + 2) * -b;
+  if not (a < b) then writeln("x", a); else read(s);
+  while a > 0 do begin a := a - 1; break; end
+  for b := 1 to 0x10 do ;
+end.
+"""
+    program = TreeSyntatic(Scanner(text).tokenize()).tree()
+
+    a = Variable("a", "integer")
+    b = Variable("b", "integer")
+
+    assert program == Program(
+        [Declaration(["a", "b"], "integer"), Declaration(["s"], "string"), Declaration(["r"], "real")],
+        [
+            Assign("r", Binary("MULT", Binary("ADD", Number("1.5", "real"), Number("2", "integer"), "real"), Negate(b), "real")),
+            If(Not(Binary("LESS", a, b, "boolean")), [Write('"x"'), Write("a"), Write("\n")], [Read("s")]),
+            While(Binary("GRET", a, Number("0", "integer"), "boolean"), [Assign("a", Binary("SUB", a, Number("1", "integer"), "integer")), Break()]),
+            For(Assign("b", Number("1", "integer")), Number("0x10", "integer"), []),
+        ],
+    )
+    assert program.body[0].value.right.type == "integer"
+
+
+@pytest.mark.parametrize("filename", sorted(glob.glob("./examples/*.pas")))
+def test_same_instructions(filename):
+    try:
+        tokens = Lexical(filename).tokenize()
+    except Exception:
+        return
+
+    assert compile_with(TreeSyntatic, tokens) == compile_with(Syntatic, tokens)
+
+
+def test_same_instructions_on_generated_program():
+    tokens = Scanner(generate_program(500)).tokenize()
+
+    assert compile_with(TreeSyntatic, tokens) == compile_with(Syntatic, tokens)
+
+
+@pytest.mark.parametrize("text", [
+    "a := b;",
+    "a := \"s\";",
+    "a := \"s\" - 1;",
+    "a := 1 + b; c := 2;",
+    "continue;",
+    "a := 1",
+])
+def test_same_errors(text):
+    tokens = Scanner(f"program P;\nvar a: integer;\nbegin\n  {text}\nend.\n").tokenize()
+
+    assert compile_with(TreeSyntatic, tokens) == compile_with(Syntatic, tokens)
+
+
+def test_long_expression():
+    terms = 5 * sys.getrecursionlimit()
+    text = "program P;\nvar a: integer;\nbegin\n  a := a" + " + 1" * (terms - 1) + ";\n  a := " + "-" * terms + "a;\nend.\n"
+    tokens = Scanner(text).tokenize()
+
+    assert compile_with(TreeSyntatic, tokens) == compile_with(Syntatic, tokens)
+
+
+def test_generate_changed_tree():
+    syntatic = TreeSyntatic(Scanner("program P;\nvar a: integer;\nbegin\n  a := 2 * 3 + a;\nend.\n").tokenize())
+    program = syntatic.tree()
+
+    # Um passo sobre a árvore (aqui, dobrar 2 * 3) e a geração de código em seguida
+    assign = program.body[0]
+    assign.value.left = Number("6", "integer")
+
+    assert CodeGenerator(syntatic).generate(program) == [
+        ("ATT", "a", "0", None),
+        ("ADD", "temp_1", "'6'", "a"),
+        ("ATT", "a", "temp_1", None),
+    ]
+    assert syntatic.symbol_table["temp_1"] == "integer"
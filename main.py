@@ -2,6 +2,7 @@ import sys
 from lib.lexical.lexical import Lexical
 from lib.syntatic.syntatic import Syntatic
 from lib.interpreter.interpreter import Interpreter
+from lib.optimizer.optimizer import optimize
 
 
 def main():
@@ -17,8 +18,9 @@ def main():
     for token in tokens:
         lexical.print_token(token)
 
-    syntatic = Syntatic(tokens)
+    syntatic = Syntatic(tokens, lexical.symbols)
     instructions = syntatic.start()
+    instructions = optimize(instructions, syntatic.symbol_table)
 
     print("\n")
 
@@ -26,7 +28,7 @@ def main():
         print(instruction)
 
     print("\nExecutando programa:")
-    interpreter = Interpreter(instructions)
+    interpreter = Interpreter(instructions, syntatic.slots())
     interpreter.run()
 
 